@@ -43,10 +43,16 @@ app.kubernetes.io/managed-by: {{ .Release.Service }}
 {{- end }}
 
 {{/*
-Selector labels
+Selector labels. A `workloads` entry gets its own name and component so the
+primary Deployment, Service and PodDisruptionBudget never select its pods.
 */}}
 {{- define "universal-chart.selectorLabels" -}}
+{{- if .Workload -}}
+app.kubernetes.io/name: {{ printf "%s-%s" (include "universal-chart.name" .) .Workload | trunc 63 | trimSuffix "-" }}
+app.kubernetes.io/component: {{ .Workload }}
+{{- else -}}
 app.kubernetes.io/name: {{ include "universal-chart.name" . }}
+{{- end }}
 app.kubernetes.io/instance: {{ .Release.Name }}
 {{- end }}
 
@@ -76,6 +82,158 @@ values schema.
 {{- end -}}
 {{- end }}
 
+{{/*
+Return the application image pull policy. A digest, including one in a legacy
+`tag@sha256:...` value, names immutable content, so a node that already has it
+can skip the registry; a tag may move and is pulled every time.
+*/}}
+{{- define "universal-chart.imagePullPolicy" -}}
+{{- with .Values.image.pullPolicy -}}
+{{- . -}}
+{{- else -}}
+{{- $pinned := or .Values.image.digest (contains "@sha256:" (.Values.image.tag | default "")) -}}
+{{- ternary "IfNotPresent" "Always" (not (empty $pinned)) -}}
+{{- end -}}
+{{- end }}
+
+{{/*
+Named container resource sizes. They match the CPU and memory of the Bitnami
+charts' `resourcesPreset` values, such as the bundled Redis chart's `micro`.
+*/}}
+{{- define "universal-chart.resources.presets" -}}
+nano:
+  requests: {cpu: 100m, memory: 128Mi}
+  limits: {cpu: 150m, memory: 192Mi}
+micro:
+  requests: {cpu: 250m, memory: 256Mi}
+  limits: {cpu: 375m, memory: 384Mi}
+small:
+  requests: {cpu: 500m, memory: 512Mi}
+  limits: {cpu: 750m, memory: 768Mi}
+medium:
+  requests: {cpu: 500m, memory: 1024Mi}
+  limits: {cpu: 750m, memory: 1536Mi}
+large:
+  requests: {cpu: "1", memory: 2048Mi}
+  limits: {cpu: 1500m, memory: 3072Mi}
+xlarge:
+  requests: {cpu: "1", memory: 3072Mi}
+  limits: {cpu: "3", memory: 6144Mi}
+2xlarge:
+  requests: {cpu: "1", memory: 3072Mi}
+  limits: {cpu: "6", memory: 12288Mi}
+{{- end }}
+
+{{/*
+Return a Kubernetes quantity such as `1500m` or `512Mi` as a plain number of
+base units: cores for CPU and bytes for memory.
+*/}}
+{{- define "universal-chart.quantity" -}}
+{{- $quantity := toString . -}}
+{{- $number := regexFind "^[0-9]+(\\.[0-9]+)?" $quantity -}}
+{{- $factors := dict "" 1 "m" 0.001 "k" 1e3 "M" 1e6 "G" 1e9 "T" 1e12 "Ki" 1024 "Mi" 1048576 "Gi" 1073741824 "Ti" 1099511627776 -}}
+{{- $suffix := trimPrefix $number $quantity -}}
+{{- if or (not $number) (not (hasKey $factors $suffix)) -}}
+{{- fail (printf "%q is not a Kubernetes resource quantity" $quantity) -}}
+{{- end -}}
+{{- mulf $number (get $factors $suffix) -}}
+{{- end }}
+
+{{/*
+Return resources with every request raised to its limit, as YAML, for a
+Guaranteed QoS pod. The static CPU manager only pins containers that request
+whole cores, so a fractional CPU fails the render.
+*/}}
+{{- define "universal-chart.resources.guaranteed" -}}
+{{- $pinned := merge (deepCopy (.resources.limits | default dict)) (.resources.requests | default dict) -}}
+{{- range $resource := list "cpu" "memory" -}}
+{{- if not (get $pinned $resource) -}}
+{{- fail (printf "qos guaranteed needs a %s limit or request in %s" $resource $.field) -}}
+{{- end -}}
+{{- end -}}
+{{- $cores := include "universal-chart.quantity" $pinned.cpu | float64 -}}
+{{- if or (lt $cores 1.0) (ne $cores (floor $cores)) -}}
+{{- fail (printf "qos guaranteed pins whole CPUs, but %s sets cpu %v; use a whole number of cores such as \"%d\"" .field $pinned.cpu (max 1 (ceil $cores | int))) -}}
+{{- end -}}
+{{- toYaml (dict "requests" $pinned "limits" $pinned) -}}
+{{- end }}
+
+{{/*
+Return the application container's resources as YAML: the `resourcesPreset`
+sizes with `resources` merged over them, pinned when `qos` is guaranteed.
+Disk-backed `scratch` volumes are added to the ephemeral-storage request, and
+to the limit only when one is set. Memory-backed ones are tmpfs charged to the memory limit, so they must
+leave room under it.
+*/}}
+{{- define "universal-chart.resources" -}}
+{{- $resources := .Values.resources | default dict -}}
+{{- with .Values.resourcesPreset -}}
+{{- $presets := include "universal-chart.resources.presets" $ | fromYaml -}}
+{{- $resources = include "universal-chart.mergeValues" (dict "base" (get $presets .) "override" $resources) | fromYaml -}}
+{{- end -}}
+{{- $disk := 0.0 -}}
+{{- $memory := 0.0 -}}
+{{- range .Values.scratch -}}
+{{- $size := include "universal-chart.quantity" .sizeLimit | float64 -}}
+{{- if eq .medium "Memory" -}}
+{{- $memory = addf $memory $size -}}
+{{- else -}}
+{{- $disk = addf $disk $size -}}
+{{- end -}}
+{{- end -}}
+{{- if gt $disk 0.0 -}}
+{{- $resources = deepCopy $resources -}}
+{{- /* Logs and the writable layer also count against a limit, so only an explicit one is raised. */ -}}
+{{- range $kind := list "requests" "limits" -}}
+{{- $values := get $resources $kind | default dict -}}
+{{- $own := get $values "ephemeral-storage" -}}
+{{- if or $own (eq $kind "requests") -}}
+{{- $ownBytes := 0.0 -}}
+{{- with $own -}}
+{{- $ownBytes = include "universal-chart.quantity" . | float64 -}}
+{{- end -}}
+{{- $_ := set $values "ephemeral-storage" (printf "%dMi" (divf (addf $ownBytes $disk) 1048576 | ceil | int)) -}}
+{{- $_ := set $resources $kind $values -}}
+{{- end -}}
+{{- end -}}
+{{- end -}}
+{{- if eq .Values.qos "guaranteed" -}}
+{{- $resources = include "universal-chart.resources.guaranteed" (dict "resources" $resources "field" "resources") | fromYaml -}}
+{{- end -}}
+{{- $memoryLimit := dig "limits" "memory" "" $resources -}}
+{{- if and (gt $memory 0.0) $memoryLimit -}}
+{{- if ge $memory (include "universal-chart.quantity" $memoryLimit | float64) -}}
+{{- fail (printf "the memory-backed scratch volumes hold up to %dMi, which fills the %s memory limit in resources; raise the limit to leave room for the application or shrink the volumes" (divf $memory 1048576 | ceil | int) $memoryLimit) -}}
+{{- end -}}
+{{- end -}}
+{{- with $resources -}}
+{{- toYaml . -}}
+{{- end -}}
+{{- end }}
+
+{{/*
+Fail when a utilization target cannot work. Kubernetes measures utilization
+against the container's request, so the resource needs one. Usage also stops
+at the limit, so a target above limit / request would never scale out. Only
+releases that size the container with `resourcesPreset` or `qos` are checked,
+so existing autoscaled releases without resources keep rendering.
+*/}}
+{{- define "universal-chart.autoscaling.checkUtilization" -}}
+{{- if or .root.Values.resourcesPreset .root.Values.qos -}}
+{{- $resources := include "universal-chart.resources" .root | fromYaml -}}
+{{- $request := dig "requests" .resource "" $resources -}}
+{{- if not $request -}}
+{{- fail (printf "%s targets %v%% %s utilization, which is measured against the %s request; set resources.requests.%s or resourcesPreset" .field .utilization .resource .resource .resource) -}}
+{{- end -}}
+{{- with dig "limits" .resource "" $resources -}}
+{{- $ceiling := mulf 100 (divf (include "universal-chart.quantity" .) (include "universal-chart.quantity" $request)) -}}
+{{- if gt (float64 $.utilization) $ceiling -}}
+{{- fail (printf "%s targets %v%% %s utilization, but the %s limit caps it at %.0f%% of the %s request, so the target can never be reached" $.field $.utilization $.resource . $ceiling $request) -}}
+{{- end -}}
+{{- end -}}
+{{- end -}}
+{{- end }}
+
 {{/*
 Render an External metric entry for a HorizontalPodAutoscaler.
 */}}
@@ -104,6 +262,113 @@ Render an External metric entry for a HorizontalPodAutoscaler.
       {{- end }}
 {{- end }}
 
+{{/*
+Named HorizontalPodAutoscaler behavior presets.
+burst: react to spikes within seconds and shed capacity slowly.
+steady: damp both directions for services with smooth, predictable load.
+batch: scale out aggressively for queued work and release it soon after.
+*/}}
+{{- define "universal-chart.hpa.behaviorPresets" -}}
+burst:
+  scaleUp:
+    stabilizationWindowSeconds: 0
+    selectPolicy: Max
+    policies:
+      - type: Percent
+        value: 100
+        periodSeconds: 15
+      - type: Pods
+        value: 4
+        periodSeconds: 15
+  scaleDown:
+    stabilizationWindowSeconds: 600
+    selectPolicy: Min
+    policies:
+      - type: Percent
+        value: 10
+        periodSeconds: 60
+steady:
+  scaleUp:
+    stabilizationWindowSeconds: 60
+    selectPolicy: Max
+    policies:
+      - type: Percent
+        value: 50
+        periodSeconds: 60
+      - type: Pods
+        value: 2
+        periodSeconds: 60
+  scaleDown:
+    stabilizationWindowSeconds: 300
+    selectPolicy: Min
+    policies:
+      - type: Percent
+        value: 20
+        periodSeconds: 60
+batch:
+  scaleUp:
+    stabilizationWindowSeconds: 0
+    selectPolicy: Max
+    policies:
+      - type: Percent
+        value: 200
+        periodSeconds: 15
+      - type: Pods
+        value: 10
+        periodSeconds: 15
+  scaleDown:
+    stabilizationWindowSeconds: 60
+    selectPolicy: Max
+    policies:
+      - type: Percent
+        value: 100
+        periodSeconds: 30
+{{- end }}
+
+{{/*
+Return the HPA behavior: the selected preset with `autoscaling.behavior`
+merged over it.
+*/}}
+{{- define "universal-chart.hpa.behavior" -}}
+{{- $autoscaling := .Values.autoscaling -}}
+{{- $behavior := dict -}}
+{{- with $autoscaling.behaviorPreset -}}
+{{- $presets := include "universal-chart.hpa.behaviorPresets" $ | fromYaml -}}
+{{- $behavior = deepCopy (required (printf "autoscaling.behaviorPreset must be one of burst, steady or batch, got %s" .) (get $presets .)) -}}
+{{- end -}}
+{{- $behavior = mergeOverwrite $behavior (deepCopy ($autoscaling.behavior | default dict)) -}}
+{{- with $behavior -}}
+{{- toYaml . -}}
+{{- end -}}
+{{- end }}
+
+{{/*
+Render a CPU or memory utilization metric for a HorizontalPodAutoscaler. With
+`autoscaling.containerResource` the metric only measures the application
+container, so sidecars don't distort the average.
+*/}}
+{{- define "universal-chart.hpa.resourceMetric" -}}
+{{- $root := .root -}}
+{{- $field := printf "autoscaling.target%sUtilizationPercentage" (ternary "CPU" "Memory" (eq .resource "cpu")) -}}
+{{- include "universal-chart.autoscaling.checkUtilization" (dict "root" $root "resource" .resource "utilization" .utilization "field" $field) -}}
+{{- if $root.Values.autoscaling.containerResource -}}
+- type: ContainerResource
+  containerResource:
+    name: {{ .resource }}
+    container: {{ $root.Chart.Name }}
+    target:
+      type: Utilization
+      averageUtilization: {{ .utilization }}
+{{- else -}}
+- type: Resource
+  resource:
+    name: {{ .resource }}
+    target:
+      type: Utilization
+      averageUtilization: {{ .utilization }}
+{{- end -}}
+{{- end }}
+
 {{/*
 Render a HorizontalPodAutoscaler.
 */}}
@@ -123,33 +388,482 @@ metadata:
   {{- end }}
 spec:
   scaleTargetRef:
-    apiVersion: apps/v1
-    kind: Deployment
-    name: {{ include "universal-chart.fullname" $root }}
+    {{- include "universal-chart.workloadKind" $root | nindent 4 }}
+    name: {{ include "universal-chart.workloadFullname" $root }}
   minReplicas: {{ $root.Values.autoscaling.minReplicas }}
   maxReplicas: {{ $root.Values.autoscaling.maxReplicas }}
-  {{- with $root.Values.autoscaling.behavior }}
+  {{- with include "universal-chart.hpa.behavior" $root }}
   behavior:
-    {{- toYaml . | nindent 4 }}
+    {{- . | nindent 4 }}
   {{- end }}
   metrics:
-    {{- if $root.Values.autoscaling.targetCPUUtilizationPercentage }}
-    - type: Resource
-      resource:
-        name: cpu
-        target:
-          type: Utilization
-          averageUtilization: {{ $root.Values.autoscaling.targetCPUUtilizationPercentage }}
+    {{- with $root.Values.autoscaling.targetCPUUtilizationPercentage }}
+    {{- include "universal-chart.hpa.resourceMetric" (dict "root" $root "resource" "cpu" "utilization" .) | nindent 4 }}
     {{- end }}
-    {{- if $root.Values.autoscaling.targetMemoryUtilizationPercentage }}
-    - type: Resource
-      resource:
-        name: memory
-        target:
-          type: Utilization
-          averageUtilization: {{ $root.Values.autoscaling.targetMemoryUtilizationPercentage }}
+    {{- with $root.Values.autoscaling.targetMemoryUtilizationPercentage }}
+    {{- include "universal-chart.hpa.resourceMetric" (dict "root" $root "resource" "memory" "utilization" .) | nindent 4 }}
     {{- end }}
     {{- range $index, $rule := $rules }}
     {{- include "universal-chart.hpa.externalMetric" (dict "rule" $rule "index" $index) | nindent 4 }}
     {{- end }}
+    {{- range $index, $metric := $root.Values.autoscaling.metrics }}
+    {{- $source := get $metric "containerResource" }}
+    {{- if and $source (eq (dig "target" "type" "" $source) "Utilization") (eq $source.container $root.Chart.Name) }}
+    {{- include "universal-chart.autoscaling.checkUtilization" (dict "root" $root "resource" $source.name "utilization" $source.target.averageUtilization "field" (printf "autoscaling.metrics[%d]" $index)) }}
+    {{- end }}
+    {{- end }}
+    {{- with $root.Values.autoscaling.metrics }}
+    {{- toYaml . | nindent 4 }}
+    {{- end }}
+{{- end }}
+
+{{/*
+Named Deployment rollout profiles.
+fast: surge half the replica set and allow a quarter to be unavailable.
+safe: replace pods one surge batch at a time without losing capacity, and
+require each new pod to stay Ready before it counts as available.
+*/}}
+{{- define "universal-chart.rollout.profiles" -}}
+fast:
+  maxSurge: 50%
+  maxUnavailable: 25%
+  minReadySeconds: 0
+safe:
+  maxSurge: 25%
+  maxUnavailable: 0
+  minReadySeconds: 10
+  progressDeadlineSeconds: 600
+{{- end }}
+
+{{/*
+Return the effective rollout settings as YAML: the selected profile with every
+non-null `rollout` field merged over it.
+*/}}
+{{- define "universal-chart.rollout.settings" -}}
+{{- $rollout := .Values.rollout -}}
+{{- $settings := dict -}}
+{{- with $rollout.profile -}}
+{{- $profiles := include "universal-chart.rollout.profiles" $ | fromYaml -}}
+{{- $settings = deepCopy (required (printf "rollout.profile must be fast or safe, got %s" .) (get $profiles .)) -}}
+{{- end -}}
+{{- range $key := list "maxSurge" "maxUnavailable" "minReadySeconds" "progressDeadlineSeconds" -}}
+{{- $value := get $rollout $key -}}
+{{- if not (kindIs "invalid" $value) -}}
+{{- $_ := set $settings $key $value -}}
+{{- end -}}
+{{- end -}}
+{{- if and (hasKey $settings "maxSurge") (hasKey $settings "maxUnavailable") -}}
+{{- if and (eq (toString $settings.maxSurge) "0" "0%") (eq (toString $settings.maxUnavailable) "0" "0%") -}}
+{{- fail "rollout.maxSurge and rollout.maxUnavailable cannot both be zero" -}}
+{{- end -}}
+{{- end -}}
+{{- with $settings -}}
+{{- toYaml . -}}
+{{- end -}}
+{{- end }}
+
+{{/*
+Return a metricRelabelings rule that drops every series whose metric name
+matches one of the given regular expressions.
+*/}}
+{{- define "universal-chart.serviceMonitor.dropMetrics" -}}
+- sourceLabels:
+    - __name__
+  regex: {{ join "|" . | quote }}
+  action: drop
+{{- end }}
+
+{{/*
+Render the ServiceMonitor endpoints. The first endpoint scrapes the metrics
+Service when alternatePort is set and the main Service otherwise. Entries in
+serviceMonitor.endpoints add more and inherit the top-level scrape settings;
+their drop lists and relabelings are appended to the top-level ones.
+*/}}
+{{- define "universal-chart.serviceMonitor.endpoints" -}}
+{{- $monitor := .Values.serviceMonitor -}}
+{{- $ports := list "http" -}}
+{{- if $monitor.alternatePort -}}
+{{- $ports = append $ports "metrics" -}}
+{{- end -}}
+{{- range .Values.service.extraPorts -}}
+{{- $ports = append $ports .name -}}
+{{- end -}}
+{{- $primary := dict "port" (ternary "metrics" "http" (not (empty $monitor.alternatePort))) -}}
+{{- $scraped := list -}}
+{{- range $index, $endpoint := prepend ($monitor.endpoints | default list) $primary -}}
+{{- if not (has $endpoint.port $ports) -}}
+{{- fail (printf "serviceMonitor.endpoints[%d].port %q is not a Service port; use http, metrics (with alternatePort) or a service.extraPorts name" (sub $index 1) $endpoint.port) -}}
+{{- end -}}
+{{- $settings := dict -}}
+{{- range $key := list "path" "interval" "scrapeTimeout" "honorLabels" -}}
+{{- $value := get $monitor $key -}}
+{{- if hasKey $endpoint $key -}}
+{{- $value = get $endpoint $key -}}
+{{- end -}}
+{{- if not (kindIs "invalid" $value) -}}
+{{- $_ := set $settings $key $value -}}
+{{- end -}}
+{{- end -}}
+{{- $target := printf "%s%s" $endpoint.port (default "" $settings.path) -}}
+{{- if has $target $scraped -}}
+{{- fail (printf "serviceMonitor scrapes port %s path %s more than once, which doubles its samples" $endpoint.port (default "(default)" $settings.path)) -}}
+{{- end -}}
+{{- $scraped = append $scraped $target -}}
+{{- if and (hasKey $settings "interval") (hasKey $settings "scrapeTimeout") -}}
+{{- if gt ($settings.scrapeTimeout | int) ($settings.interval | int) -}}
+{{- fail (printf "serviceMonitor scrapeTimeout (%ds) must not exceed the %ds interval for port %s" ($settings.scrapeTimeout | int) ($settings.interval | int) $endpoint.port) -}}
+{{- end -}}
+{{- end -}}
+{{- $dropMetrics := concat ($monitor.dropMetrics | default list) ($endpoint.dropMetrics | default list) -}}
+{{- $relabelings := concat ($monitor.metricRelabelings | default list) ($endpoint.metricRelabelings | default list) }}
+- port: {{ $endpoint.port }}
+  {{- with $settings.path }}
+  path: {{ . }}
+  {{- end }}
+  {{- with $settings.interval }}
+  interval: {{ printf "%ds" (int .) }}
+  {{- end }}
+  {{- with $settings.scrapeTimeout }}
+  scrapeTimeout: {{ printf "%ds" (int .) }}
+  {{- end }}
+  {{- if $settings.honorLabels }}
+  honorLabels: true
+  {{- end }}
+  {{- if or $dropMetrics $relabelings }}
+  metricRelabelings:
+    {{- with $dropMetrics }}
+    {{- include "universal-chart.serviceMonitor.dropMetrics" . | nindent 4 }}
+    {{- end }}
+    {{- with $relabelings }}
+    {{- toYaml . | nindent 4 }}
+    {{- end }}
+  {{- end }}
+{{- end -}}
+{{- end }}
+
+{{/*
+Named ingress-nginx tuning presets.
+streaming: pass responses and request bodies through unbuffered and keep
+long-lived connections open for an hour.
+api: small buffered responses, a 1m body limit and fail-fast timeouts.
+upload: stream large request bodies to the app instead of spooling them to
+the controller's disk.
+*/}}
+{{- define "universal-chart.ingress.nginxPresets" -}}
+streaming:
+  proxyBuffering: false
+  proxyRequestBuffering: false
+  proxyHttpVersion: "1.1"
+  proxyReadTimeout: 3600
+  proxySendTimeout: 3600
+api:
+  proxyBuffering: true
+  proxyBufferSize: 16k
+  proxyBuffersNumber: 4
+  proxyBodySize: 1m
+  proxyConnectTimeout: 5
+  proxyReadTimeout: 60
+  proxySendTimeout: 60
+upload:
+  proxyBodySize: 100m
+  proxyRequestBuffering: false
+  proxyReadTimeout: 300
+  proxySendTimeout: 300
+{{- end }}
+
+{{/*
+Return the primary Ingress annotations as YAML: ingress.annotations plus the
+annotations rendered from the typed ingress.nginx block. A key set in both
+places fails rendering instead of letting one silently win.
+*/}}
+{{- define "universal-chart.ingress.annotations" -}}
+{{- $annotations := deepCopy (.Values.ingress.annotations | default dict) -}}
+{{- $nginx := .Values.ingress.nginx | default dict -}}
+{{- $settings := dict -}}
+{{- with $nginx.preset -}}
+{{- $presets := include "universal-chart.ingress.nginxPresets" $ | fromYaml -}}
+{{- $settings = deepCopy (required (printf "ingress.nginx.preset must be streaming, api or upload, got %s" .) (get $presets .)) -}}
+{{- end -}}
+{{- range $key, $value := omit $nginx "preset" -}}
+{{- if not (kindIs "invalid" $value) -}}
+{{- $_ := set $settings $key $value -}}
+{{- end -}}
+{{- end -}}
+{{- if $settings -}}
+{{- $ingressClass := coalesce .Values.ingress.className (index $annotations "kubernetes.io/ingress.class") | default "" -}}
+{{- $nginxClasses := .Values.serviceMonitor.blockExternalIngress.ingressClassNames | default (list "" "nginx") -}}
+{{- if not (has $ingressClass $nginxClasses) -}}
+{{- fail (printf "ingress.nginx annotations only apply to ingress-nginx, but ingress class %q is not listed in serviceMonitor.blockExternalIngress.ingressClassNames" $ingressClass) -}}
+{{- end -}}
+{{- if and (hasKey $settings "limitBurstMultiplier") (not (or $settings.limitRps $settings.limitConnections)) -}}
+{{- fail "ingress.nginx.limitBurstMultiplier requires limitRps or limitConnections" -}}
+{{- end -}}
+{{- end -}}
+{{- $names := dict
+  "proxyBuffering" "proxy-buffering"
+  "proxyRequestBuffering" "proxy-request-buffering"
+  "proxyBufferSize" "proxy-buffer-size"
+  "proxyBuffersNumber" "proxy-buffers-number"
+  "proxyBodySize" "proxy-body-size"
+  "proxyConnectTimeout" "proxy-connect-timeout"
+  "proxyReadTimeout" "proxy-read-timeout"
+  "proxySendTimeout" "proxy-send-timeout"
+  "proxyHttpVersion" "proxy-http-version"
+  "upstreamHashBy" "upstream-hash-by"
+  "limitRps" "limit-rps"
+  "limitConnections" "limit-connections"
+  "limitBurstMultiplier" "limit-burst-multiplier"
+-}}
+{{- range $key, $value := $settings -}}
+{{- $annotation := printf "nginx.ingress.kubernetes.io/%s" (get $names $key) -}}
+{{- if hasKey $annotations $annotation -}}
+{{- fail (printf "ingress.annotations sets %s, which ingress.nginx.%s also renders; set it in one place" $annotation $key) -}}
+{{- end -}}
+{{- if kindIs "bool" $value -}}
+{{- $value = ternary "on" "off" $value -}}
+{{- end -}}
+{{- $_ := set $annotations $annotation (toString $value) -}}
+{{- end -}}
+{{- with $annotations -}}
+{{- toYaml . -}}
+{{- end -}}
+{{- end }}
+
+{{/*
+Return the PromQL label matchers that select this release's scrape targets.
+The Prometheus Operator sets `job` to the scraped Service name.
+*/}}
+{{- define "universal-chart.metricsSelector" -}}
+{{- printf "namespace=%q, job=%q" .Release.Namespace (include "universal-chart.metricsJob" .) -}}
+{{- end }}
+
+{{/*
+Return the `job` label of this release's scrape targets.
+*/}}
+{{- define "universal-chart.metricsJob" -}}
+{{- $service := include "universal-chart.fullname" . -}}
+{{- if .Values.serviceMonitor.alternatePort -}}
+{{- $service = printf "%s-metrics" $service -}}
+{{- end -}}
+{{- $service -}}
+{{- end }}
+
+{{/*
+Render the SLO rule group: one error-ratio recording rule per objective and
+window, kept per namespace, then the burn-rate alerts that read them. The alerts follow the Google
+SRE workbook's multi-window, multi-burn-rate scheme: each pairs a long and a
+short window with the burn rate that spends 2% of a 30-day error budget in 1h,
+5% in 6h, 10% in 1d or 10% in 3d.
+*/}}
+{{- define "universal-chart.slo.group" -}}
+{{- $slo := .Values.slo -}}
+{{- $selector := default (include "universal-chart.metricsSelector" .) $slo.selector -}}
+{{- $burnRates := list
+  (dict "long" "1h" "short" "5m" "factor" 14.4 "severity" "page")
+  (dict "long" "6h" "short" "30m" "factor" 6 "severity" "page")
+  (dict "long" "1d" "short" "2h" "factor" 3 "severity" "ticket")
+  (dict "long" "3d" "short" "6h" "factor" 1 "severity" "ticket")
+-}}
+{{- $windows := list "5m" "30m" "1h" "2h" "6h" "1d" "3d" -}}
+{{- $ruleLabels := .Values.prometheusRule.defaultRuleLabels | default dict -}}
+{{- $names := list -}}
+{{- $records := list -}}
+{{- $alerts := list -}}
+{{- range $index, $objective := $slo.objectives -}}
+{{- if has $objective.name $names -}}
+{{- fail (printf "slo.objectives[%d].name %q is already used" $index $objective.name) -}}
+{{- end -}}
+{{- $names = append $names $objective.name -}}
+{{- $matchers := default $selector $objective.selector -}}
+{{- $labels := mergeOverwrite (deepCopy ($objective.labels | default dict)) (dict "slo" $objective.name) -}}
+{{- range $window := $windows -}}
+{{- $expr := "" -}}
+{{- if eq $objective.sli "availability" -}}
+{{- $errors := required (printf "slo.objectives[%d].errorSelector is required for availability SLIs" $index) $objective.errorSelector -}}
+{{- $expr = printf "sum by (namespace) (rate(%s{%s, %s}[%s]))\n/\nsum by (namespace) (rate(%s{%s}[%s]))" $objective.metric $matchers $errors $window $objective.metric $matchers $window -}}
+{{- else -}}
+{{- $threshold := required (printf "slo.objectives[%d].threshold is required for latency SLIs" $index) $objective.threshold -}}
+{{- $expr = printf "1 - (\n  sum by (namespace) (rate(%s_bucket{%s, le=%q}[%s]))\n  /\n  sum by (namespace) (rate(%s_count{%s}[%s]))\n)" $objective.metric $matchers (toString $threshold) $window $objective.metric $matchers $window -}}
+{{- end -}}
+{{- $records = append $records (dict "record" (printf "slo:sli_error:ratio_rate%s" $window) "expr" $expr "labels" $labels) -}}
+{{- end -}}
+{{- if $slo.alerting.enabled -}}
+{{- range $burnRates -}}
+{{- $budget := printf "(%v * (1 - %v / 100))" .factor $objective.objective -}}
+{{- $series := printf "{namespace=%q, slo=%q}" $.Release.Namespace $objective.name -}}
+{{- $expr := printf "slo:sli_error:ratio_rate%s%s > %s\nand\nslo:sli_error:ratio_rate%s%s > %s" .long $series $budget .short $series $budget -}}
+{{- $severity := get $slo.alerting.severities .severity -}}
+{{- $alertLabels := mergeOverwrite (deepCopy $ruleLabels) (deepCopy ($objective.labels | default dict)) (dict "slo" $objective.name "severity" $severity "long" .long "short" .short) -}}
+{{- $annotations := dict "summary" (printf "SLO %s is burning its error budget %vx faster than sustainable" $objective.name .factor) "description" (printf "The %s and %s error ratios for SLO %s are above %v times the %v%% objective's error budget." .long .short $objective.name .factor $objective.objective) -}}
+{{- $alerts = append $alerts (dict "alert" $slo.alerting.name "expr" $expr "labels" $alertLabels "annotations" $annotations) -}}
+{{- end -}}
+{{- end -}}
+{{- end -}}
+{{- $group := dict "name" (printf "%s.slo" (include "universal-chart.fullname" .)) "rules" (concat $records $alerts) -}}
+{{- toYaml (list $group) -}}
+{{- end }}
+
+{{/*
+Render the pre-aggregation rule group. Counters are recorded as summed rates;
+histograms record their summed bucket rates once and derive each quantile from
+that series. Record names follow the Prometheus level:metric:operations form.
+*/}}
+{{- define "universal-chart.preAggregate.group" -}}
+{{- $preAggregate := .Values.preAggregate -}}
+{{- $selector := default (include "universal-chart.metricsSelector" .) $preAggregate.selector -}}
+{{- $window := $preAggregate.window -}}
+{{- $rules := list -}}
+{{- range $preAggregate.rates -}}
+{{- $by := .by | default $preAggregate.by -}}
+{{- $expr := printf "sum by (%s) (rate(%s{%s}[%s]))" (join ", " $by) .metric (default $selector .selector) $window -}}
+{{- $rules = append $rules (dict "record" (printf "%s:%s:rate%s" (join "_" $by) .metric $window) "expr" $expr) -}}
+{{- end -}}
+{{- range $histogram := $preAggregate.histograms -}}
+{{- $by := $histogram.by | default $preAggregate.by -}}
+{{- $buckets := printf "%s:%s_bucket:rate%s" (join "_" $by) $histogram.metric $window -}}
+{{- $expr := printf "sum by (%s, le) (rate(%s_bucket{%s}[%s]))" (join ", " $by) $histogram.metric (default $selector $histogram.selector) $window -}}
+{{- $rules = append $rules (dict "record" $buckets "expr" $expr) -}}
+{{- range $quantile := $histogram.quantiles | default $preAggregate.quantiles -}}
+{{- $percentile := trimPrefix "0." (toString $quantile) -}}
+{{- if eq (len $percentile) 1 -}}
+{{- $percentile = printf "%s0" $percentile -}}
+{{- end -}}
+{{- $record := printf "%s:%s:p%s_rate%s" (join "_" $by) $histogram.metric $percentile $window -}}
+{{- $rules = append $rules (dict "record" $record "expr" (printf "histogram_quantile(%s, %s)" (toString $quantile) $buckets)) -}}
+{{- end -}}
+{{- end -}}
+{{- $group := dict "name" (printf "%s.pre-aggregate" (include "universal-chart.fullname" .)) "rules" $rules -}}
+{{- with $preAggregate.interval -}}
+{{- $_ := set $group "interval" . -}}
+{{- end -}}
+{{- toYaml (list $group) -}}
+{{- end }}
+
+{{/*
+Return the AnalysisTemplate metrics for an Argo Rollout as YAML. Each metric
+reads a recording rule this chart already renders: the p99 of a
+`preAggregate.histograms` entry and the 5m error ratio of an availability
+`slo.objectives` entry. An idle service records NaN, which passes.
+*/}}
+{{- define "universal-chart.argoRollout.metrics" -}}
+{{- $analysis := .Values.argoRollout.analysis -}}
+{{- $preAggregate := .Values.preAggregate -}}
+{{- $metrics := list -}}
+{{- $latency := $analysis.latency -}}
+{{- if $latency.enabled -}}
+{{- $histogram := dict -}}
+{{- if $preAggregate.enabled -}}
+{{- range $preAggregate.histograms -}}
+{{- if and (not $histogram) (or (not $latency.histogram) (eq .metric $latency.histogram)) -}}
+{{- $histogram = . -}}
+{{- end -}}
+{{- end -}}
+{{- end -}}
+{{- if not $histogram -}}
+{{- fail (printf "argoRollout.analysis.latency reads a p99 recording rule; enable preAggregate with a histogram%s, or set argoRollout.analysis.latency.enabled to false" (ternary (printf " for %s" $latency.histogram) "" (not (empty $latency.histogram)))) -}}
+{{- end -}}
+{{- $quantiles := $histogram.quantiles | default $preAggregate.quantiles -}}
+{{- if not (has "0.99" ($quantiles | toStrings)) -}}
+{{- fail (printf "argoRollout.analysis.latency reads the p99 of %s; add \"0.99\" to its quantiles" $histogram.metric) -}}
+{{- end -}}
+{{- $by := $histogram.by | default $preAggregate.by -}}
+{{- $matchers := list -}}
+{{- if has "namespace" $by -}}
+{{- $matchers = append $matchers (printf "namespace=%q" .Release.Namespace) -}}
+{{- end -}}
+{{- if has "job" $by -}}
+{{- $matchers = append $matchers (printf "job=%q" (include "universal-chart.metricsJob" .)) -}}
+{{- end -}}
+{{- $query := printf "max(%s:%s:p99_rate%s{%s})" (join "_" $by) $histogram.metric $preAggregate.window (join ", " $matchers) -}}
+{{- $metrics = append $metrics (dict "name" "p99-latency" "query" $query "max" $latency.maxSeconds) -}}
+{{- end -}}
+{{- $errorRate := $analysis.errorRate -}}
+{{- if $errorRate.enabled -}}
+{{- $objective := dict -}}
+{{- if .Values.slo.enabled -}}
+{{- range .Values.slo.objectives -}}
+{{- if and (not $objective) (eq .sli "availability") (or (not $errorRate.slo) (eq .name $errorRate.slo)) -}}
+{{- $objective = . -}}
+{{- end -}}
+{{- end -}}
+{{- end -}}
+{{- if not $objective -}}
+{{- fail (printf "argoRollout.analysis.errorRate reads an SLO error ratio; enable slo with an availability objective%s, or set argoRollout.analysis.errorRate.enabled to false" (ternary (printf " named %s" $errorRate.slo) "" (not (empty $errorRate.slo)))) -}}
+{{- end -}}
+{{- $query := printf "max(slo:sli_error:ratio_rate5m{namespace=%q, slo=%q})" .Release.Namespace $objective.name -}}
+{{- $metrics = append $metrics (dict "name" "error-rate" "query" $query "max" $errorRate.maxRatio) -}}
+{{- end -}}
+{{- if not $metrics -}}
+{{- fail "argoRollout.analysis needs latency or errorRate enabled" -}}
+{{- end -}}
+{{- $rendered := list -}}
+{{- range $metrics -}}
+{{- $provider := dict "prometheus" (dict "address" $analysis.prometheusAddress "query" .query) -}}
+{{- $rendered = append $rendered (dict "name" .name "interval" $analysis.interval "failureLimit" $analysis.failureLimit "successCondition" (printf "isNaN(result[0]) || result[0] <= %v" .max) "provider" $provider) -}}
+{{- end -}}
+{{- toYaml $rendered -}}
+{{- end }}
+
+{{/*
+Render a KEDA ScaledObject. KEDA creates and owns the HorizontalPodAutoscaler
+for the target, so the chart never renders both for one Deployment.
+*/}}
+{{- define "universal-chart.scaledObject" -}}
+{{- $root := .root -}}
+{{- $name := .name -}}
+{{- $keda := $root.Values.autoscaling.keda -}}
+{{- if $root.Values.autoscaling.enabled }}
+{{- fail "autoscaling.enabled and autoscaling.keda.enabled are mutually exclusive; KEDA manages its own HorizontalPodAutoscaler" }}
+{{- end }}
+{{- if not $keda.triggers }}
+{{- fail "autoscaling.keda.triggers must contain at least one trigger" }}
+{{- end }}
+{{- range $index, $trigger := $keda.triggers }}
+{{- if and (has $trigger.type (list "cpu" "memory")) (eq ($trigger.metricType | default "Utilization") "Utilization") (eq (dig "metadata" "containerName" $root.Chart.Name $trigger) $root.Chart.Name) }}
+{{- include "universal-chart.autoscaling.checkUtilization" (dict "root" $root "resource" $trigger.type "utilization" (dig "metadata" "value" "0" $trigger) "field" (printf "autoscaling.keda.triggers[%d]" $index)) }}
+{{- end }}
+{{- end }}
+{{- if gt ($keda.minReplicaCount | int) ($keda.maxReplicaCount | int) }}
+{{- fail (printf "autoscaling.keda.minReplicaCount (%v) must not exceed maxReplicaCount (%v)" $keda.minReplicaCount $keda.maxReplicaCount) }}
+{{- end }}
+{{- if and (not (kindIs "invalid" $keda.idleReplicaCount)) (ge ($keda.idleReplicaCount | int) ($keda.minReplicaCount | int)) }}
+{{- fail (printf "autoscaling.keda.idleReplicaCount (%v) must be less than minReplicaCount (%v)" $keda.idleReplicaCount $keda.minReplicaCount) }}
+{{- end }}
+apiVersion: keda.sh/v1alpha1
+kind: ScaledObject
+metadata:
+  name: {{ $name | quote }}
+  labels:
+    {{- include "universal-chart.labels" $root | nindent 4 }}
+  {{- with $keda.annotations }}
+  annotations:
+    {{- toYaml . | nindent 4 }}
+  {{- end }}
+spec:
+  scaleTargetRef:
+    {{- include "universal-chart.workloadKind" $root | nindent 4 }}
+    name: {{ include "universal-chart.workloadFullname" $root }}
+  pollingInterval: {{ $keda.pollingInterval }}
+  cooldownPeriod: {{ $keda.cooldownPeriod }}
+  {{- if not (kindIs "invalid" $keda.idleReplicaCount) }}
+  idleReplicaCount: {{ $keda.idleReplicaCount }}
+  {{- end }}
+  minReplicaCount: {{ $keda.minReplicaCount }}
+  maxReplicaCount: {{ $keda.maxReplicaCount }}
+  {{- with $keda.fallback }}
+  fallback:
+    failureThreshold: {{ required "autoscaling.keda.fallback.failureThreshold is required when fallback is set" .failureThreshold }}
+    replicas: {{ required "autoscaling.keda.fallback.replicas is required when fallback is set" .replicas }}
+  {{- end }}
+  {{- if or $keda.restoreToOriginalReplicaCount $keda.behavior }}
+  advanced:
+    restoreToOriginalReplicaCount: {{ $keda.restoreToOriginalReplicaCount }}
+    {{- with $keda.behavior }}
+    horizontalPodAutoscalerConfig:
+      behavior:
+        {{- toYaml . | nindent 8 }}
+    {{- end }}
+  {{- end }}
+  triggers:
+    {{- toYaml $keda.triggers | nindent 4 }}
 {{- end }}
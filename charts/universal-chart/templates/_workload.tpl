@@ -0,0 +1,955 @@
+{{/*
+Return the name of a workload's objects: the release fullname for the
+primary Deployment, or the fullname suffixed with the `workloads` key.
+*/}}
+{{- define "universal-chart.workloadFullname" -}}
+{{- $fullname := include "universal-chart.fullname" . -}}
+{{- with .Workload -}}
+{{- printf "%s-%s" $fullname . | trunc 63 | trimSuffix "-" -}}
+{{- else -}}
+{{- $fullname -}}
+{{- end -}}
+{{- end }}
+
+{{/*
+Merge `override` over `base` and return the result as YAML. Maps merge key by
+key; any other value, including null and false, replaces the base value.
+*/}}
+{{- define "universal-chart.mergeValues" -}}
+{{- $merged := deepCopy .base -}}
+{{- range $key, $value := .override -}}
+{{- $current := get $merged $key -}}
+{{- if and (kindIs "map" $value) (kindIs "map" $current) -}}
+{{- $_ := set $merged $key (include "universal-chart.mergeValues" (dict "base" $current "override" $value) | fromYaml) -}}
+{{- else -}}
+{{- $_ := set $merged $key $value -}}
+{{- end -}}
+{{- end -}}
+{{- toYaml $merged -}}
+{{- end }}
+
+{{/*
+Return the values for one `workloads` entry as YAML: the release values with
+the entry merged over them. `command` and `args` become container properties.
+*/}}
+{{- define "universal-chart.workload.values" -}}
+{{- $override := omit .workload "enabled" "command" "args" -}}
+{{- $container := pick .workload "command" "args" -}}
+{{- if $container -}}
+{{- $_ := set $override "extraContainerProps" (merge $container (get $override "extraContainerProps" | default dict)) -}}
+{{- end -}}
+{{- $base := omit .root.Values "workloads" -}}
+{{- include "universal-chart.mergeValues" (dict "base" $base "override" $override) -}}
+{{- end }}
+
+{{/*
+Return the apiVersion and kind of the controller selected by `workloadKind`,
+for use in manifests and in references such as an HPA's scaleTargetRef.
+*/}}
+{{- define "universal-chart.workloadKind" -}}
+{{- if eq .Values.workloadKind "Rollout" -}}
+apiVersion: argoproj.io/v1alpha1
+kind: Rollout
+{{- else -}}
+apiVersion: apps/v1
+kind: {{ .Values.workloadKind }}
+{{- end -}}
+{{- end }}
+
+{{/*
+Return the name of a StatefulSet's headless Service.
+*/}}
+{{- define "universal-chart.headlessServiceName" -}}
+{{- printf "%s-headless" (include "universal-chart.workloadFullname" .) | trunc 63 | trimSuffix "-" -}}
+{{- end }}
+
+{{/*
+Render the headless Service that gives each StatefulSet pod a stable DNS
+name. It carries the service.kubernetes.io/headless label so the
+ServiceMonitor does not scrape the pods through it a second time.
+*/}}
+{{- define "universal-chart.headlessService" -}}
+apiVersion: v1
+kind: Service
+metadata:
+  name: {{ include "universal-chart.headlessServiceName" . }}
+  labels:
+    {{- include "universal-chart.labels" . | nindent 4 }}
+    service.kubernetes.io/headless: ""
+spec:
+  clusterIP: None
+  publishNotReadyAddresses: {{ .Values.statefulSet.publishNotReadyAddresses }}
+  ports:
+    - port: {{ .Values.service.port }}
+      targetPort: http
+      protocol: TCP
+      name: http
+    {{- range .Values.service.extraPorts }}
+    - port: {{ .port }}
+      targetPort: {{ default .port .targetPort }}
+      protocol: {{ default "TCP" .protocol }}
+      name: {{ .name }}
+    {{- end }}
+  selector:
+    {{- include "universal-chart.selectorLabels" . | nindent 4 }}
+{{- end }}
+
+{{/*
+Render the application's environment variables as a YAML list: the Redis
+connection settings and `extraEnvVars`. Reads can go to the replicas Service,
+or to every node behind Sentinel, as hinted by REDIS_READ_FROM.
+*/}}
+{{- define "universal-chart.env" -}}
+# placeholder var so we can always make an env list
+- name: REDIS_ENABLED
+  value: {{ .Values.redis.enabled | quote }}
+{{- if .Values.redis.enabled }}
+{{- $redis := .Values.redis }}
+{{- $fullname := include "common.names.fullname" .Subcharts.redis }}
+{{- $sentinel := dig "sentinel" "enabled" false $redis }}
+{{- $replicaHost := "" }}
+{{- $replicaPort := "" }}
+{{- if $sentinel }}
+{{- $replicaHost = $fullname }}
+{{- $replicaPort = dig "sentinel" "service" "ports" "redis" 6379 $redis }}
+{{- else if eq (dig "architecture" "replication" $redis) "replication" }}
+{{- $replicaHost = printf "%s-replicas" $fullname }}
+{{- $replicaPort = dig "replica" "service" "ports" "redis" 6379 $redis }}
+{{- end }}
+{{- $readFrom := $redis.readFrom | default (ternary "replicaPreferred" "master" (not (empty $replicaHost))) }}
+{{- if and (ne $readFrom "master") (empty $replicaHost) }}
+{{- fail (printf "redis.readFrom %s needs replicas, but redis.architecture is standalone; use master or the replication architecture" $readFrom) }}
+{{- end }}
+- name: REDIS_USERNAME
+  value: default # oddly hard-coded in chart
+- name: REDIS_PASSWORD
+  valueFrom:
+    secretKeyRef:
+      name: {{ template "redis.secretName" .Subcharts.redis }}
+      key: {{ template "redis.secretPasswordKey" .Subcharts.redis }}
+{{- /* Behind Sentinel the master moves between nodes; only the optional master Service follows it. */}}
+{{- if or (not $sentinel) (dig "sentinel" "masterService" "enabled" false $redis) }}
+- name: REDIS_PORT
+  #value: {{ .Values.redis.master.service.ports.redis }}
+  value: {{ .Values.redis.master.containerPorts.redis | quote }}
+- name: REDIS_HOST
+  value: {{ printf "%s-master" $fullname }}
+{{- end }}
+- name: REDIS_TLS
+  value: {{ .Values.redis.tls.enabled | quote }}
+{{- with $replicaHost }}
+- name: REDIS_REPLICA_HOST
+  value: {{ . }}
+- name: REDIS_REPLICA_PORT
+  value: {{ $replicaPort | quote }}
+{{- end }}
+{{- if $sentinel }}
+- name: REDIS_SENTINEL_HOST
+  value: {{ $fullname }}
+- name: REDIS_SENTINEL_PORT
+  value: {{ dig "sentinel" "service" "ports" "sentinel" 26379 $redis | quote }}
+- name: REDIS_SENTINEL_MASTER_SET
+  value: {{ dig "sentinel" "masterSet" "mymaster" $redis | quote }}
+{{- end }}
+- name: REDIS_READ_FROM
+  value: {{ $readFrom | quote }}
+{{- end }}
+{{- with .Values.pooler }}
+{{- if .enabled }}
+{{- range $name := list .hostEnvVar .portEnvVar }}
+{{- if hasKey ($.Values.extraEnvVars | default dict) $name }}
+{{- fail (printf "pooler sets %s to reach the database through the pooler; remove it from extraEnvVars" $name) }}
+{{- end }}
+{{- end }}
+{{- /* Jobs run without the sidecar, and init containers skip it unless pooler.initContainers is set, so they connect to the upstream database directly. */}}
+{{- $host := "127.0.0.1" }}
+{{- $port := .port }}
+{{- if or $.Job $.PoolerBypass }}
+{{- $host = .upstream.host }}
+{{- $port = .upstream.port }}
+{{- end }}
+{{- if $host }}
+- name: {{ .hostEnvVar }}
+  value: {{ $host | quote }}
+- name: {{ .portEnvVar }}
+  value: {{ $port | quote }}
+{{- end }}
+{{- end }}
+{{- end }}
+{{- range $k, $v := .Values.extraEnvVars }}
+- name: {{ $k }}
+  {{- if kindIs "map" $v }}
+  {{- toYaml $v | nindent 2 }}
+  {{- else }}
+  value: {{ $v | quote }}
+  {{- end }}
+{{- end }}
+{{- end }}
+
+{{/*
+Render the application's envFrom sources as a YAML list: the AWS secret,
+`extraEnvSecrets` and `extraEnvConfigmaps`. Empty when there are none.
+*/}}
+{{- define "universal-chart.envFrom" -}}
+{{- if .Values.awsEnvSecrets.externalSecret.secretPath }}
+- secretRef:
+    name: {{ .Values.awsEnvSecrets.env_secret_name }}
+{{- end }}
+{{- range .Values.extraEnvSecrets }}
+- secretRef:
+    name: {{ . }}
+{{- end }}
+{{- range .Values.extraEnvConfigmaps }}
+- configMapRef:
+    name: {{ . }}
+{{- end }}
+{{- end }}
+
+{{/*
+Return the `scratch` emptyDir volumes and their mounts as YAML with `volumes`
+and `volumeMounts` lists, for the workload and job pods.
+*/}}
+{{- define "universal-chart.scratch" -}}
+{{- $volumes := list -}}
+{{- $volumeMounts := list -}}
+{{- $names := list -}}
+{{- range .Values.volumes -}}
+{{- $names = append $names .name -}}
+{{- end -}}
+{{- $paths := list -}}
+{{- range .Values.volumeMounts -}}
+{{- $paths = append $paths .mountPath -}}
+{{- end -}}
+{{- range $index, $volume := .Values.scratch -}}
+{{- if has $volume.name $names -}}
+{{- fail (printf "scratch[%d].name %q is also the name of a pod volume; rename one of them" $index $volume.name) -}}
+{{- end -}}
+{{- if has $volume.mountPath $paths -}}
+{{- fail (printf "scratch[%d].mountPath %s is already mounted by volumeMounts; remove one of them" $index $volume.mountPath) -}}
+{{- end -}}
+{{- $names = append $names $volume.name -}}
+{{- $paths = append $paths $volume.mountPath -}}
+{{- $emptyDir := dict "sizeLimit" $volume.sizeLimit -}}
+{{- if eq $volume.medium "Memory" -}}
+{{- $_ := set $emptyDir "medium" "Memory" -}}
+{{- end -}}
+{{- $volumes = append $volumes (dict "name" $volume.name "emptyDir" $emptyDir) -}}
+{{- $volumeMounts = append $volumeMounts (dict "name" $volume.name "mountPath" $volume.mountPath) -}}
+{{- end -}}
+{{- toYaml (dict "volumes" $volumes "volumeMounts" $volumeMounts) -}}
+{{- end }}
+
+{{/*
+Render the pod's dnsPolicy and dnsConfig from `dns`. The `aws` preset lowers
+ndots so names such as AWS endpoints are looked up as given before the
+cluster search domains are tried. Custom nameservers switch the policy to
+None with the cluster's search domains, so a node-local DNS cache answers
+every query.
+*/}}
+{{- define "universal-chart.dns" -}}
+{{- $dns := .Values.dns -}}
+{{- $ndots := $dns.ndots -}}
+{{- $presetOptions := list -}}
+{{- if eq $dns.preset "aws" -}}
+{{- if kindIs "invalid" $ndots -}}
+{{- $ndots = 2 -}}
+{{- end -}}
+{{- $presetOptions = list (dict "name" "single-request-reopen") (dict "name" "timeout" "value" "2") (dict "name" "attempts" "value" "3") -}}
+{{- end -}}
+{{- $userOptions := $dns.options | default list -}}
+{{- $names := list -}}
+{{- range $userOptions -}}
+{{- if eq .name "ndots" -}}
+{{- fail "set dns.ndots instead of an ndots entry in dns.options" -}}
+{{- end -}}
+{{- $names = append $names .name -}}
+{{- end -}}
+{{- $options := list -}}
+{{- if not (kindIs "invalid" $ndots) -}}
+{{- $options = append $options (dict "name" "ndots" "value" (toString $ndots)) -}}
+{{- end -}}
+{{- range $presetOptions -}}
+{{- if not (has .name $names) -}}
+{{- $options = append $options . -}}
+{{- end -}}
+{{- end -}}
+{{- $options = concat $options $userOptions -}}
+{{- $nameservers := $dns.nameservers | default list -}}
+{{- $searches := $dns.searches | default list -}}
+{{- $policy := $dns.policy -}}
+{{- if and $nameservers (not $policy) -}}
+{{- $policy = "None" -}}
+{{- end -}}
+{{- if eq (toString $policy) "None" -}}
+{{- if not $nameservers -}}
+{{- fail "dns.policy None leaves the pod without a resolver; set dns.nameservers" -}}
+{{- end -}}
+{{- if not $searches -}}
+{{- $searches = list (printf "%s.svc.%s" .Release.Namespace $dns.clusterDomain) (printf "svc.%s" $dns.clusterDomain) $dns.clusterDomain -}}
+{{- end -}}
+{{- end -}}
+{{- with $policy }}
+dnsPolicy: {{ . }}
+{{- end }}
+{{- if or $nameservers $searches $options }}
+dnsConfig:
+  {{- with $nameservers }}
+  nameservers:
+    {{- toYaml . | nindent 4 }}
+  {{- end }}
+  {{- with $searches }}
+  searches:
+    {{- toYaml . | nindent 4 }}
+  {{- end }}
+  {{- with $options }}
+  options:
+    {{- toYaml . | nindent 4 }}
+  {{- end }}
+{{- end }}
+{{- end }}
+
+{{/*
+Return the name of a workload's pooler ConfigMap.
+*/}}
+{{- define "universal-chart.pooler.configMapName" -}}
+{{- printf "%s-pooler" (include "universal-chart.workloadFullname" .) | trunc 63 | trimSuffix "-" -}}
+{{- end }}
+
+{{/*
+Return the pooler's configuration file: `pooler.config` when set, otherwise a
+pgbouncer.ini that listens on `pooler.port` and forwards to
+`pooler.upstream`, with `pooler.settings` merged over the generated settings.
+*/}}
+{{- define "universal-chart.pooler.config" -}}
+{{- $pooler := .Values.pooler -}}
+{{- if $pooler.config -}}
+{{- $pooler.config -}}
+{{- else -}}
+{{- $upstream := $pooler.upstream -}}
+{{- if not $upstream.host -}}
+{{- fail "pooler.upstream.host is required unless pooler.config provides the whole configuration file" -}}
+{{- end -}}
+{{- $settings := dict "listen_addr" "0.0.0.0" "listen_port" $pooler.port "unix_socket_dir" "" "pool_mode" $pooler.poolMode "default_pool_size" $pooler.defaultPoolSize "max_client_conn" $pooler.maxClientConn -}}
+{{- with $pooler.maxDbConnections -}}
+{{- $_ := set $settings "max_db_connections" . -}}
+{{- end -}}
+{{- if $pooler.authSecret -}}
+{{- $_ := set $settings "auth_file" "/etc/pooler-auth/userlist.txt" -}}
+{{- end -}}
+{{- $settings = merge (deepCopy ($pooler.settings | default dict)) $settings -}}
+[databases]
+{{ $upstream.database | default "*" }} = host={{ $upstream.host }} port={{ $upstream.port }}{{ with $upstream.database }} dbname={{ . }}{{ end }}
+[pgbouncer]
+{{- range $key, $value := $settings }}
+{{ $key }} ={{ with toString $value }} {{ . }}{{ end }}
+{{- end }}
+{{- end -}}
+{{- end }}
+
+{{/*
+Render the ConfigMap holding a workload's pooler configuration file.
+*/}}
+{{- define "universal-chart.pooler.configMap" -}}
+apiVersion: v1
+kind: ConfigMap
+metadata:
+  name: {{ include "universal-chart.pooler.configMapName" . }}
+  labels:
+    {{- include "universal-chart.labels" . | nindent 4 }}
+data:
+  {{ .Values.pooler.configFile }}: |
+    {{- include "universal-chart.pooler.config" . | nindent 4 }}
+{{- end }}
+
+{{/*
+Render the pooler as a YAML list holding one native sidecar: an init
+container with restartPolicy Always. It starts before the init containers
+and the application, and stops after the application has drained.
+*/}}
+{{- define "universal-chart.pooler.container" -}}
+{{- $pooler := .Values.pooler }}
+{{- $resources := $pooler.resources }}
+{{- if and $resources (eq .Values.qos "guaranteed") }}
+{{- $resources = include "universal-chart.resources.guaranteed" (dict "resources" $resources "field" "pooler.resources") | fromYaml }}
+{{- end -}}
+- name: pooler
+  image: {{ $pooler.image | quote }}
+  imagePullPolicy: IfNotPresent
+  restartPolicy: Always
+  command:
+    {{- toYaml $pooler.command | nindent 4 }}
+  ports:
+    - name: pooler
+      containerPort: {{ $pooler.port }}
+      protocol: TCP
+  {{- range $probe := list "startupProbe" "livenessProbe" "readinessProbe" }}
+  {{- with get $pooler $probe }}
+  {{ $probe }}:
+    {{- toYaml . | nindent 4 }}
+  {{- end }}
+  {{- end }}
+  {{- with $resources }}
+  resources:
+    {{- toYaml . | nindent 4 }}
+  {{- end }}
+  {{- with $pooler.securityContext }}
+  securityContext:
+    {{- toYaml . | nindent 4 }}
+  {{- end }}
+  volumeMounts:
+    - name: pooler-config
+      mountPath: /etc/pooler
+      readOnly: true
+    {{- if $pooler.authSecret }}
+    - name: pooler-auth
+      mountPath: /etc/pooler-auth
+      readOnly: true
+    {{- end }}
+{{- end }}
+
+{{/*
+Render the Deployment, Argo Rollout, StatefulSet or DaemonSet for the primary
+workload or a `workloads` entry.
+*/}}
+{{- define "universal-chart.workload" -}}
+{{ include "universal-chart.workloadKind" . }}
+{{- $kind := .Values.workloadKind }}
+{{- $autoscaled := or .Values.autoscaling.enabled .Values.autoscaling.keda.enabled }}
+{{- if and (eq $kind "DaemonSet") $autoscaled }}
+{{- fail "workloadKind DaemonSet runs one pod per matching node, so autoscaling and autoscaling.keda cannot scale it; disable both" }}
+{{- end }}
+{{- $scratch := include "universal-chart.scratch" . | fromYaml }}
+{{- $volumes := concat (.Values.volumes | default list) $scratch.volumes }}
+{{- $volumeMounts := concat (.Values.volumeMounts | default list) $scratch.volumeMounts }}
+{{- $claims := list }}
+{{- if eq $kind "StatefulSet" }}
+{{- $claims = .Values.statefulSet.volumeClaimTemplates | default list }}
+{{- $volumeNames := list }}
+{{- range $volumes }}
+{{- $volumeNames = append $volumeNames .name }}
+{{- end }}
+{{- range $index, $claim := $claims }}
+{{- if has $claim.name $volumeNames }}
+{{- fail (printf "statefulSet.volumeClaimTemplates[%d].name %q is also the name of a pod volume; rename one of them" $index $claim.name) }}
+{{- end }}
+{{- $volumeMounts = append $volumeMounts (dict "name" $claim.name "mountPath" $claim.mountPath) }}
+{{- end }}
+{{- end }}
+{{- $podAnnotations := deepCopy (.Values.podAnnotations | default dict) }}
+{{- if .Values.pooler.enabled }}
+{{- range $volumes }}
+{{- if has .name (list "pooler-config" "pooler-auth") }}
+{{- fail (printf "volume name %q is reserved for the pooler sidecar; rename the volume" .name) }}
+{{- end }}
+{{- end }}
+{{- $volumes = append $volumes (dict "name" "pooler-config" "configMap" (dict "name" (include "universal-chart.pooler.configMapName" .))) }}
+{{- with .Values.pooler.authSecret }}
+{{- $volumes = append $volumes (dict "name" "pooler-auth" "secret" (dict "secretName" .)) }}
+{{- end }}
+{{- /* The pooler reads its configuration once, so roll the pods when it changes. */}}
+{{- $_ := set $podAnnotations "checksum/pooler-config" (include "universal-chart.pooler.config" . | sha256sum) }}
+{{- end }}
+{{- $initContainers := .Values.initContainers | default list }}
+{{- if not (and $initContainers (get (first $initContainers) "image")) }}
+{{- $initContainers = list }}
+{{- end }}
+{{- $deploymentAnnotations := deepCopy (.Values.deployment.annotations | default dict) }}
+{{- $reloadAnnotation := "reloader.stakater.com/auto" }}
+{{- if and .Values.reloader.enabled (not (hasKey $deploymentAnnotations $reloadAnnotation)) }}
+{{- $_ := set $deploymentAnnotations $reloadAnnotation "true" }}
+{{- end }}
+{{- $resources := include "universal-chart.resources" . | fromYaml }}
+{{- $gracePeriod := .Values.terminationGracePeriodSeconds }}
+{{- $shutdown := .Values.gracefulShutdown }}
+{{- if $shutdown.enabled }}
+{{- $shutdownSeconds := add $shutdown.preStopSeconds $shutdown.drainSeconds }}
+{{- if gt ($shutdownSeconds | int) 900 }}
+{{- fail (printf "gracefulShutdown.preStopSeconds plus drainSeconds is %d, above the 900 second terminationGracePeriodSeconds limit" $shutdownSeconds) }}
+{{- end }}
+{{- if kindIs "invalid" $gracePeriod }}
+{{- $gracePeriod = $shutdownSeconds }}
+{{- else if lt ($gracePeriod | int) ($shutdownSeconds | int) }}
+{{- fail (printf "terminationGracePeriodSeconds (%v) must cover gracefulShutdown.preStopSeconds (%v) plus drainSeconds (%v); raise it to at least %d or leave it null to size it automatically" $gracePeriod $shutdown.preStopSeconds $shutdown.drainSeconds $shutdownSeconds) }}
+{{- end }}
+{{- if hasKey (.Values.extraContainerProps | default dict) "lifecycle" }}
+{{- fail "gracefulShutdown renders the container lifecycle; remove lifecycle from extraContainerProps" }}
+{{- end }}
+{{- end }}
+metadata:
+  name: {{ include "universal-chart.workloadFullname" . }}
+  labels:
+    {{- include "universal-chart.labels" . | nindent 4 }}
+  {{- with $deploymentAnnotations }}
+  annotations:
+    {{- toYaml . | nindent 4 }}
+  {{- end }}
+spec:
+  {{- if not (or $autoscaled (eq $kind "DaemonSet")) }}
+  replicas: {{ .Values.replicaCount }}
+  {{- end }}
+  revisionHistoryLimit: {{ .Values.revisionHistoryLimit }}
+  {{- $settings := include "universal-chart.rollout.settings" . | fromYaml }}
+  {{- if eq $kind "StatefulSet" }}
+  {{- if or (hasKey $settings "maxSurge") (hasKey $settings "maxUnavailable") }}
+  {{- fail "a StatefulSet replaces its pods one at a time, so rollout.maxSurge and rollout.maxUnavailable do not apply; unset them and the rollout profile" }}
+  {{- end }}
+  serviceName: {{ include "universal-chart.headlessServiceName" . }}
+  podManagementPolicy: {{ .Values.statefulSet.podManagementPolicy }}
+  {{- with .Values.statefulSet.persistentVolumeClaimRetentionPolicy }}
+  persistentVolumeClaimRetentionPolicy:
+    {{- toYaml . | nindent 4 }}
+  {{- end }}
+  {{- else if eq $kind "Rollout" }}
+  strategy:
+    canary:
+      {{- if hasKey $settings "maxSurge" }}
+      maxSurge: {{ $settings.maxSurge | toYaml }}
+      {{- end }}
+      {{- if hasKey $settings "maxUnavailable" }}
+      maxUnavailable: {{ $settings.maxUnavailable | toYaml }}
+      {{- end }}
+      {{- $analysis := .Values.argoRollout.analysis }}
+      {{- if and $analysis.enabled (not .Workload) }}
+      analysis:
+        templates:
+          - templateName: {{ include "universal-chart.fullname" . }}
+        startingStep: {{ $analysis.startingStep }}
+      {{- end }}
+      steps:
+        {{- toYaml .Values.argoRollout.steps | nindent 8 }}
+  {{- else if or (hasKey $settings "maxSurge") (hasKey $settings "maxUnavailable") }}
+  {{ ternary "updateStrategy" "strategy" (eq $kind "DaemonSet") }}:
+    type: RollingUpdate
+    rollingUpdate:
+      {{- if hasKey $settings "maxSurge" }}
+      maxSurge: {{ $settings.maxSurge | toYaml }}
+      {{- end }}
+      {{- if hasKey $settings "maxUnavailable" }}
+      maxUnavailable: {{ $settings.maxUnavailable | toYaml }}
+      {{- end }}
+  {{- end }}
+  {{- if hasKey $settings "minReadySeconds" }}
+  minReadySeconds: {{ $settings.minReadySeconds }}
+  {{- end }}
+  {{- if and (hasKey $settings "progressDeadlineSeconds") (has $kind (list "Deployment" "Rollout")) }}
+  progressDeadlineSeconds: {{ $settings.progressDeadlineSeconds }}
+  {{- end }}
+  selector:
+    matchLabels:
+      {{- include "universal-chart.selectorLabels" . | nindent 6 }}
+  {{- with $claims }}
+  volumeClaimTemplates:
+    {{- range . }}
+    - metadata:
+        name: {{ .name }}
+      spec:
+        accessModes:
+          {{- toYaml (.accessModes | default (list "ReadWriteOnce")) | nindent 10 }}
+        {{- with .storageClassName }}
+        storageClassName: {{ . }}
+        {{- end }}
+        resources:
+          requests:
+            storage: {{ .size }}
+    {{- end }}
+  {{- end }}
+  template:
+    metadata:
+      {{- with $podAnnotations }}
+      annotations:
+        {{- toYaml . | nindent 8 }}
+      {{- end }}
+      labels:
+        {{- include "universal-chart.labels" . | nindent 8 }}
+        {{- with .Values.podLabels }}
+        {{- toYaml . | nindent 8 }}
+        {{- end }}
+    spec:
+      {{- with .Values.imagePullSecrets }}
+      imagePullSecrets:
+        {{- toYaml . | nindent 8 }}
+      {{- end }}
+      serviceAccountName: {{ include "universal-chart.serviceAccountName" . }}
+      {{- with include "universal-chart.dns" . | trim }}
+      {{- . | nindent 6 }}
+      {{- end }}
+      {{- if not (kindIs "invalid" $gracePeriod) }}
+      terminationGracePeriodSeconds: {{ $gracePeriod }}
+      {{- end }}
+      {{- with .Values.podSecurityContext }}
+      securityContext:
+        {{- toYaml . | nindent 8 }}
+      {{- end }}
+      containers:
+        - name: {{ .Chart.Name }}
+          env: &containerenv
+            {{- include "universal-chart.env" . | nindent 12 }}
+          {{- with include "universal-chart.envFrom" . | trim }}
+          envFrom:
+            {{- . | nindent 12 }}
+          {{- end }}
+          {{- with .Values.securityContext }}
+          securityContext:
+            {{- toYaml . | nindent 12 }}
+          {{- end }}
+          image: {{ include "universal-chart.image" . | quote }}
+          imagePullPolicy: {{ include "universal-chart.imagePullPolicy" . }}
+          ports:
+            - name: http
+              containerPort: {{ .Values.service.port }}
+              protocol: TCP
+            {{- range .Values.extraContainerPorts }}
+            - name: {{ .name }}
+              containerPort: {{ .containerPort }}
+              protocol: {{ .protocol | default "TCP" }}
+            {{- end }}
+          {{- with .Values.startupProbe }}
+          startupProbe:
+            {{- toYaml . | nindent 12 }}
+          {{- end }}
+          {{- with .Values.livenessProbe }}
+          livenessProbe:
+            {{- toYaml . | nindent 12 }}
+          {{- end }}
+          {{- with .Values.readinessProbe }}
+          readinessProbe:
+            {{- toYaml . | nindent 12 }}
+          {{- end }}
+          {{- with $resources }}
+          resources:
+            {{- toYaml . | nindent 12 }}
+          {{- end }}
+          {{- with $volumeMounts }}
+          volumeMounts:
+            {{- toYaml . | nindent 12 }}
+          {{- end }}
+          {{- if and $shutdown.enabled (gt ($shutdown.preStopSeconds | int) 0) }}
+          lifecycle:
+            preStop:
+              {{- if eq $shutdown.preStopAction "exec" }}
+              exec:
+                command: ["sleep", {{ $shutdown.preStopSeconds | quote }}]
+              {{- else }}
+              sleep:
+                seconds: {{ $shutdown.preStopSeconds }}
+              {{- end }}
+          {{- end }}
+          {{- with .Values.extraContainerProps }}
+          {{- toYaml . | nindent 10 }}
+          {{- end }}
+
+      {{- if or .Values.pooler.enabled $initContainers }}
+      initContainers:
+        {{- if .Values.pooler.enabled }}
+        {{- include "universal-chart.pooler.container" . | nindent 8 }}
+        {{- end }}
+        {{- range $i, $init := $initContainers }}
+        - name: init-{{ $.Chart.Name }}-{{ $i }}
+          image: {{ $init.image }}
+          {{- with $init.command }}
+          command:
+            {{- range . }}
+            - {{ . }}
+            {{- end }}
+          {{- end }}
+          {{- with $volumeMounts }}
+          volumeMounts:
+            {{- toYaml . | nindent 12 }}
+          {{- end }}
+          {{- if and $.Values.pooler.enabled (not $.Values.pooler.initContainers) }}
+          {{- $initScope := dict "Values" $.Values "Workload" $.Workload "PoolerBypass" true "Release" $.Release "Chart" $.Chart "Capabilities" $.Capabilities "Template" $.Template "Files" $.Files "Subcharts" $.Subcharts }}
+          env:
+            {{- include "universal-chart.env" $initScope | nindent 12 }}
+          {{- else }}
+          env: *containerenv
+          {{- end }}
+          {{- with include "universal-chart.envFrom" $ | trim }}
+          envFrom:
+            {{- . | nindent 12 }}
+          {{- end }}
+          {{- with $.Values.securityContext }}
+          securityContext:
+            {{- toYaml . | nindent 12 }}
+          {{- end }}
+          {{- $initProps := $init.extraContainerProps | default dict }}
+          {{- $initResources := get $initProps "resources" }}
+          {{- if $initResources }}
+          {{- if eq $.Values.qos "guaranteed" }}
+          {{- $initResources = include "universal-chart.resources.guaranteed" (dict "resources" $initResources "field" (printf "initContainers[%d].extraContainerProps.resources" $i)) | fromYaml }}
+          {{- end }}
+          {{- else if or $.Values.resourcesPreset $.Values.qos }}
+          {{- $initResources = $resources }}
+          {{- end }}
+          {{- with $initResources }}
+          resources:
+            {{- toYaml . | nindent 12 }}
+          {{- end }}
+          {{- with omit $initProps "resources" }}
+          {{- toYaml . | nindent 10 }}
+          {{- end }}
+        {{- end }}
+      {{- end }}
+
+      {{- with $volumes }}
+      volumes:
+        {{- toYaml . | nindent 8 }}
+      {{- end }}
+      {{- with .Values.nodeSelector }}
+      nodeSelector:
+        {{- toYaml . | nindent 8 }}
+      {{- end }}
+      {{- with .Values.affinity }}
+      affinity:
+        {{- toYaml . | nindent 8 }}
+      {{- end }}
+      {{- $selectorLabels := include "universal-chart.selectorLabels" . | fromYaml }}
+      {{- $defaultLabelSelector := dict "matchLabels" $selectorLabels }}
+      {{- $topologySpreadConstraints := list }}
+      {{- $topologyKeys := list }}
+      {{- $availabilityTopologyKeys := list "topology.kubernetes.io/zone" "kubernetes.io/hostname" }}
+      {{- /* A DaemonSet already places one pod per node; generated spread rules could only strand pods on uneven zones. */}}
+      {{- $perNode := eq $kind "DaemonSet" }}
+      {{- $availability := and .Values.availability.enabled (not $perNode) }}
+      {{- if $availability }}
+      {{- $whenUnsatisfiable := ternary "DoNotSchedule" "ScheduleAnyway" (eq .Values.availability.mode "strict") }}
+      {{- range $availabilityTopologyKeys }}
+      {{- $topologySpreadConstraints = append $topologySpreadConstraints (dict "maxSkew" 1 "topologyKey" . "whenUnsatisfiable" $whenUnsatisfiable "labelSelector" $defaultLabelSelector) }}
+      {{- $topologyKeys = append $topologyKeys . }}
+      {{- end }}
+      {{- end }}
+      {{- range .Values.topologySpreadConstraints }}
+      {{- $constraint := . }}
+      {{- if not (hasKey $constraint "labelSelector") }}
+      {{- $constraint = merge (dict "labelSelector" $defaultLabelSelector) $constraint }}
+      {{- end }}
+      {{- if not (and $availability (has $constraint.topologyKey $availabilityTopologyKeys)) }}
+      {{- $topologySpreadConstraints = append $topologySpreadConstraints $constraint }}
+      {{- $topologyKeys = append $topologyKeys $constraint.topologyKey }}
+      {{- end }}
+      {{- end }}
+      {{- if and .Values.spread_azs (not $perNode) (not (has "topology.kubernetes.io/zone" $topologyKeys)) }}
+      {{- $topologySpreadConstraints = append $topologySpreadConstraints (dict "maxSkew" 1 "topologyKey" "topology.kubernetes.io/zone" "whenUnsatisfiable" "ScheduleAnyway" "labelSelector" $defaultLabelSelector) }}
+      {{- $topologyKeys = append $topologyKeys "topology.kubernetes.io/zone" }}
+      {{- end }}
+      {{- if and .Values.spread_spot (not $perNode) (not (has "karpenter.sh/capacity-type" $topologyKeys)) }}
+      {{- $topologySpreadConstraints = append $topologySpreadConstraints (dict "maxSkew" 1 "topologyKey" "karpenter.sh/capacity-type" "whenUnsatisfiable" "ScheduleAnyway" "labelSelector" $defaultLabelSelector) }}
+      {{- end }}
+      {{- with $topologySpreadConstraints }}
+      topologySpreadConstraints:
+        {{- toYaml . | nindent 8 }}
+      {{- end }}
+      {{- with .Values.tolerations }}
+      tolerations:
+        {{- toYaml . | nindent 8 }}
+      {{- end }}
+{{- end }}
+
+{{/*
+Render the HorizontalPodAutoscaler for a workload when it has metrics.
+*/}}
+{{- define "universal-chart.horizontalPodAutoscaler" -}}
+{{- if .Values.autoscaling.enabled }}
+{{- $fullname := include "universal-chart.workloadFullname" . }}
+{{- $hpaRules := default list .Values.autoscaling.hpaScalingRules }}
+{{- $hasHpa := or .Values.autoscaling.targetCPUUtilizationPercentage .Values.autoscaling.targetMemoryUtilizationPercentage (gt (len $hpaRules) 0) .Values.autoscaling.metrics }}
+{{- if $hasHpa }}
+{{- include "universal-chart.hpa" (dict "root" . "name" $fullname "rules" $hpaRules) }}
+{{- end }}
+{{- end }}
+{{- end }}
+
+{{/*
+Render the PodDisruptionBudget for a workload when it is enabled.
+*/}}
+{{- define "universal-chart.podDisruptionBudget" -}}
+{{- if .Values.podDisruptionBudget.enabled }}
+{{- $pdb := .Values.podDisruptionBudget }}
+{{- $hasMinAvailable := not (kindIs "invalid" $pdb.minAvailable) }}
+{{- $hasMaxUnavailable := not (kindIs "invalid" $pdb.maxUnavailable) }}
+{{- if eq $hasMinAvailable $hasMaxUnavailable }}
+{{- fail "podDisruptionBudget: set exactly one of minAvailable or maxUnavailable" }}
+{{- end }}
+{{- /* A DaemonSet's pod count follows its nodes, so there is no replica count to check the budget against. */}}
+{{- if ne .Values.workloadKind "DaemonSet" }}
+{{- $replicas := .Values.replicaCount | int }}
+{{- if .Values.autoscaling.enabled }}
+{{- $replicas = .Values.autoscaling.minReplicas | int }}
+{{- else if .Values.autoscaling.keda.enabled }}
+{{- /* A Deployment scaled to zero has no pods to evict, so budget for one. */}}
+{{- $replicas = max 1 (.Values.autoscaling.keda.minReplicaCount | int) }}
+{{- end }}
+{{- $allowedDisruptions := 0 }}
+{{- if $hasMinAvailable }}
+{{- $minimumPods := $pdb.minAvailable | int }}
+{{- if kindIs "string" $pdb.minAvailable }}
+{{- $percentage := trimSuffix "%" $pdb.minAvailable | int }}
+{{- if gt $percentage 100 }}
+{{- fail (printf "podDisruptionBudget.minAvailable must be between 0%% and 100%%, got %s" $pdb.minAvailable) }}
+{{- end }}
+{{- $minimumPods = div (add (mul $percentage $replicas) 99) 100 }}
+{{- end }}
+{{- if gt $minimumPods $replicas }}
+{{- fail (printf "podDisruptionBudget.minAvailable (%v) requires %d healthy pods, but the effective replica minimum is %d" $pdb.minAvailable $minimumPods $replicas) }}
+{{- end }}
+{{- if and (eq $minimumPods $replicas) (not $pdb.allowZeroDisruptions) }}
+{{- fail (printf "podDisruptionBudget.minAvailable (%v) allows no voluntary disruptions with an effective replica minimum of %d; set podDisruptionBudget.allowZeroDisruptions=true only when blocking every eviction is intentional" $pdb.minAvailable $replicas) }}
+{{- end }}
+{{- $allowedDisruptions = sub $replicas $minimumPods }}
+{{- else }}
+{{- $maximumPods := $pdb.maxUnavailable | int }}
+{{- if kindIs "string" $pdb.maxUnavailable }}
+{{- $percentage := trimSuffix "%" $pdb.maxUnavailable | int }}
+{{- if gt $percentage 100 }}
+{{- fail (printf "podDisruptionBudget.maxUnavailable must be between 0%% and 100%%, got %s" $pdb.maxUnavailable) }}
+{{- end }}
+{{- $maximumPods = div (add (mul $percentage $replicas) 99) 100 }}
+{{- end }}
+{{- if and (eq $maximumPods 0) (not $pdb.allowZeroDisruptions) }}
+{{- fail (printf "podDisruptionBudget.maxUnavailable (%v) allows no voluntary disruptions; set podDisruptionBudget.allowZeroDisruptions=true only when blocking every eviction is intentional" $pdb.maxUnavailable) }}
+{{- end }}
+{{- $allowedDisruptions = $maximumPods }}
+{{- end }}
+{{- $rollout := include "universal-chart.rollout.settings" . | fromYaml }}
+{{- if hasKey $rollout "maxUnavailable" }}
+{{- /* Deployments round a percentage maxUnavailable down. */}}
+{{- $rolloutUnavailable := $rollout.maxUnavailable | int }}
+{{- if kindIs "string" $rollout.maxUnavailable }}
+{{- $rolloutUnavailable = div (mul (trimSuffix "%" $rollout.maxUnavailable | int) $replicas) 100 }}
+{{- end }}
+{{- if gt $rolloutUnavailable $allowedDisruptions }}
+{{- fail (printf "rollout.maxUnavailable (%v) takes %d pods out of service during a rollout, but the PodDisruptionBudget allows only %d unavailable with an effective replica minimum of %d; lower rollout.maxUnavailable or use the safe profile" $rollout.maxUnavailable $rolloutUnavailable $allowedDisruptions $replicas) }}
+{{- end }}
+{{- end }}
+{{- end }}
+apiVersion: policy/v1
+kind: PodDisruptionBudget
+metadata:
+  name: {{ include "universal-chart.workloadFullname" . }}
+  labels:
+    {{- include "universal-chart.labels" . | nindent 4 }}
+  {{- with $pdb.annotations }}
+  annotations:
+    {{- toYaml . | nindent 4 }}
+  {{- end }}
+spec:
+  {{- if $hasMaxUnavailable }}
+  maxUnavailable: {{ $pdb.maxUnavailable | toYaml }}
+  {{- else }}
+  minAvailable: {{ $pdb.minAvailable | toYaml }}
+  {{- end }}
+  {{- with $pdb.unhealthyPodEvictionPolicy }}
+  unhealthyPodEvictionPolicy: {{ . }}
+  {{- end }}
+  selector:
+    matchLabels:
+      {{- include "universal-chart.selectorLabels" . | nindent 6 }}
+{{- end }}
+{{- end }}
+
+{{/*
+Render the Job spec for a `jobs` entry, passed as `.Job` in a workload scope
+named after the entry. The pod runs the release image with the application's
+environment, secrets, volumes and service account.
+*/}}
+{{- define "universal-chart.job.spec" -}}
+{{- $job := .Job }}
+{{- $field := printf "jobs.%s" .Workload }}
+{{- $restartPolicy := $job.restartPolicy | default "Never" }}
+{{- $indexed := eq (toString $job.completionMode) "Indexed" }}
+{{- if and $indexed (kindIs "invalid" $job.completions) }}
+{{- fail (printf "%s.completionMode Indexed gives each pod an index below completions; set %s.completions" $field $field) }}
+{{- end }}
+{{- if not (kindIs "invalid" $job.backoffLimitPerIndex) }}
+{{- if not $indexed }}
+{{- fail (printf "%s.backoffLimitPerIndex requires completionMode Indexed" $field) }}
+{{- end }}
+{{- if ne $restartPolicy "Never" }}
+{{- fail (printf "%s.backoffLimitPerIndex requires restartPolicy Never, because failed pods must be replaced to be counted per index" $field) }}
+{{- end }}
+{{- else if not (kindIs "invalid" $job.maxFailedIndexes) }}
+{{- fail (printf "%s.maxFailedIndexes requires backoffLimitPerIndex" $field) }}
+{{- end }}
+{{- range $key := list "parallelism" "completions" "completionMode" "backoffLimit" "backoffLimitPerIndex" "maxFailedIndexes" "activeDeadlineSeconds" "ttlSecondsAfterFinished" }}
+{{- if and (hasKey $job $key) (not (kindIs "invalid" (get $job $key))) }}
+{{ $key }}: {{ get $job $key }}
+{{- end }}
+{{- end }}
+{{- $resources := $job.resources }}
+{{- if not $resources }}
+{{- $resources = include "universal-chart.resources" . | fromYaml }}
+{{- else if eq .Values.qos "guaranteed" }}
+{{- $resources = include "universal-chart.resources.guaranteed" (dict "resources" $resources "field" (printf "%s.resources" $field)) | fromYaml }}
+{{- end }}
+{{- $scratch := include "universal-chart.scratch" . | fromYaml }}
+template:
+  metadata:
+    {{- with merge dict ($job.podAnnotations | default dict) (.Values.podAnnotations | default dict) }}
+    annotations:
+      {{- toYaml . | nindent 6 }}
+    {{- end }}
+    labels:
+      {{- include "universal-chart.labels" . | nindent 6 }}
+      {{- with .Values.podLabels }}
+      {{- toYaml . | nindent 6 }}
+      {{- end }}
+  spec:
+    restartPolicy: {{ $restartPolicy }}
+    {{- with .Values.imagePullSecrets }}
+    imagePullSecrets:
+      {{- toYaml . | nindent 6 }}
+    {{- end }}
+    serviceAccountName: {{ include "universal-chart.serviceAccountName" . }}
+    {{- with include "universal-chart.dns" . | trim }}
+    {{- . | nindent 4 }}
+    {{- end }}
+    {{- with .Values.podSecurityContext }}
+    securityContext:
+      {{- toYaml . | nindent 6 }}
+    {{- end }}
+    containers:
+      - name: {{ .Workload }}
+        image: {{ include "universal-chart.image" . | quote }}
+        imagePullPolicy: {{ include "universal-chart.imagePullPolicy" . }}
+        {{- with $job.command }}
+        command:
+          {{- toYaml . | nindent 10 }}
+        {{- end }}
+        {{- with $job.args }}
+        args:
+          {{- toYaml . | nindent 10 }}
+        {{- end }}
+        env:
+          {{- include "universal-chart.env" . | nindent 10 }}
+        {{- with include "universal-chart.envFrom" . | trim }}
+        envFrom:
+          {{- . | nindent 10 }}
+        {{- end }}
+        {{- with .Values.securityContext }}
+        securityContext:
+          {{- toYaml . | nindent 10 }}
+        {{- end }}
+        {{- with $resources }}
+        resources:
+          {{- toYaml . | nindent 10 }}
+        {{- end }}
+        {{- with concat (.Values.volumeMounts | default list) $scratch.volumeMounts }}
+        volumeMounts:
+          {{- toYaml . | nindent 10 }}
+        {{- end }}
+    {{- with concat (.Values.volumes | default list) $scratch.volumes }}
+    volumes:
+      {{- toYaml . | nindent 6 }}
+    {{- end }}
+    {{- with .Values.nodeSelector }}
+    nodeSelector:
+      {{- toYaml . | nindent 6 }}
+    {{- end }}
+    {{- with .Values.affinity }}
+    affinity:
+      {{- toYaml . | nindent 6 }}
+    {{- end }}
+    {{- with .Values.tolerations }}
+    tolerations:
+      {{- toYaml . | nindent 6 }}
+    {{- end }}
+{{- end }}
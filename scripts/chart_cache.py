@@ -0,0 +1,96 @@
+"""Content-addressed helpers shared by the chart tooling scripts.
+
+Every cached result is stored under the SHA-256 digest of the inputs that
+produced it, so identical inputs at different git revisions or in different
+runs share one entry and never need to be recomputed.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import Iterable
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_CACHE_ROOT = REPO_ROOT / ".cache"
+
+
+def digest_bytes(data: bytes) -> str:
+    """Return the hex SHA-256 digest of ``data``."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def digest_file(path: Path) -> str:
+    """Return the hex SHA-256 digest of one file's contents."""
+    return digest_bytes(path.read_bytes())
+
+
+def digest_tree(root: Path) -> str:
+    """Return a digest covering every file path and content under ``root``.
+
+    Symlinks are hashed by their link text rather than followed, which keeps
+    ``linter_values.yaml`` from pulling fixture contents into a chart digest.
+    """
+    hasher = hashlib.sha256()
+    for path in sorted(root.rglob("*")):
+        relative = path.relative_to(root).as_posix()
+        if path.is_symlink():
+            hasher.update(f"L {relative}\0{os.readlink(path)}\0".encode())
+        elif path.is_file():
+            hasher.update(f"F {relative}\0".encode())
+            hasher.update(digest_file(path).encode())
+    return hasher.hexdigest()
+
+
+def combine_digests(parts: Iterable[str]) -> str:
+    """Return one digest for an ordered sequence of digest or text parts."""
+    hasher = hashlib.sha256()
+    for part in parts:
+        hasher.update(part.encode())
+        hasher.update(b"\0")
+    return hasher.hexdigest()
+
+
+def helm_version(helm_binary: str) -> str:
+    """Return the Helm client version string used in cache keys."""
+    result = subprocess.run(
+        [helm_binary, "version", "--short"],
+        check=False,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    return result.stdout.strip() or "unknown"
+
+
+class DigestCache:
+    """Store text results under the digest of their inputs."""
+
+    def __init__(self, root: Path) -> None:
+        """Create a cache rooted at ``root``; the directory is made lazily."""
+        self.root = root
+
+    def path_for(self, key: str) -> Path:
+        """Return the file that holds the entry for ``key``."""
+        return self.root / key[:2] / key
+
+    def get(self, key: str) -> str | None:
+        """Return the cached text for ``key``, or ``None`` on a miss."""
+        path = self.path_for(key)
+        if not path.is_file():
+            return None
+        return path.read_text()
+
+    def put(self, key: str, text: str) -> None:
+        """Store ``text`` for ``key`` atomically."""
+        path = self.path_for(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            "w", dir=path.parent, delete=False, suffix=".tmp"
+        ) as handle:
+            handle.write(text)
+            temp_path = Path(handle.name)
+        os.replace(temp_path, path)
@@ -4,7 +4,8 @@
 For each chart in charts/, this verifies that:
 * tests/fixtures/<chart>/ exists, and
 * for every YAML file whose name contains '-values' and does not end
-  with '.golden.yaml', there is a sibling '<name>.golden.yaml'.
+  with '.golden.yaml', there is a sibling '<name>.golden.yaml' or a
+  '<name>.golden.index' into the golden store whose documents all exist.
 """
 
 from __future__ import annotations
@@ -12,6 +13,8 @@ from __future__ import annotations
 import sys
 from pathlib import Path
 
+from golden_store import GoldenStore, index_path, read_index
+
 
 def main() -> int:
     """Check that every *-values*.yaml fixture has a matching golden file."""
@@ -20,6 +23,7 @@ def main() -> int:
     fixtures_root = repo_root / "tests" / "fixtures"
 
     errors: list[str] = []
+    store = GoldenStore()
 
     for chart_dir in sorted(charts_dir.iterdir()):
         if not chart_dir.is_dir():
@@ -46,7 +50,19 @@ def main() -> int:
 
             base = yaml_file.with_suffix("")  # drop .yaml
             golden = base.with_suffix(".golden.yaml")
-            if not golden.is_file():
+            index = index_path(golden)
+            if index.is_file() and not golden.is_file():
+                missing = [
+                    digest
+                    for digest in read_index(index)
+                    if not store.objects.path_for(digest).is_file()
+                ]
+                if missing:
+                    errors.append(
+                        f"Golden store is missing {len(missing)} document(s) "
+                        f"referenced by {index}"
+                    )
+            elif not golden.is_file():
                 errors.append(
                     "Missing golden file for fixture: "
                     f"{yaml_file} (expected {golden})"
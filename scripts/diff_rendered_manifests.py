@@ -0,0 +1,535 @@
+#!/usr/bin/env python3
+"""Report how a change alters the rendered manifests of modified charts.
+
+Chart reviews usually read template diffs, which hide what Kubernetes will
+actually receive. This script checks out the base ref and HEAD into temporary
+git worktrees, renders every fixture values file of every changed chart at
+both revisions concurrently, and writes a per-resource structural diff as
+Markdown suitable for a pull request comment.
+
+Renders are cached under the digest of the chart directory, values file, and
+Helm version, so a fixture whose inputs are identical at both revisions is only
+rendered once, and unchanged inputs are never re-rendered across runs.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable
+from urllib.parse import urlparse
+
+import yaml
+from chart_cache import (
+    DEFAULT_CACHE_ROOT,
+    DigestCache,
+    combine_digests,
+    digest_file,
+    digest_tree,
+    helm_version,
+)
+from check_chart_version_bump import git_diff_names, group_changes_by_chart
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+CHARTS_ROOT = Path("charts")
+FIXTURES_ROOT = Path("tests") / "fixtures"
+DEFAULT_MAX_CHANGES = 20
+MAX_VALUE_WIDTH = 60
+
+
+@dataclass(frozen=True)
+class RenderJob:
+    """One fixture render at one revision."""
+
+    revision: str
+    chart: str
+    chart_dir: Path
+    values_file: Path
+    key: str
+
+
+@dataclass(frozen=True)
+class RenderResult:
+    """The output of a render, or the error Helm reported."""
+
+    manifest: str | None
+    error: str | None = None
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line arguments for the rendered manifest diff."""
+    parser = argparse.ArgumentParser(
+        description=(
+            "Render the fixtures of charts changed since the given git ref "
+            "at both revisions and report per-resource differences."
+        )
+    )
+    parser.add_argument(
+        "base_ref",
+        nargs="?",
+        default="origin/main",
+        help=(
+            "Git ref to diff against. Defaults to origin/main when not "
+            "provided."
+        ),
+    )
+    parser.add_argument(
+        "--chart",
+        action="append",
+        dest="charts",
+        default=None,
+        help=(
+            "Chart to compare even if git reports no changes. Specify "
+            "multiple times for more than one chart."
+        ),
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=None,
+        help="Write the Markdown report here instead of stdout.",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=DEFAULT_CACHE_ROOT / "renders",
+        help="Directory for cached renders keyed by input digest.",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of concurrent Helm renders.",
+    )
+    parser.add_argument(
+        "--max-changes",
+        type=int,
+        default=DEFAULT_MAX_CHANGES,
+        help="Maximum field changes listed per resource.",
+    )
+    parser.add_argument(
+        "--skip-helm-network",
+        action="store_true",
+        help="Do not run `helm dependency build` in either tree.",
+    )
+    return parser.parse_args()
+
+
+def changed_charts(base_ref: str) -> list[str]:
+    """Return charts whose templates or fixtures changed since ``base_ref``."""
+    roots = [CHARTS_ROOT, FIXTURES_ROOT]
+    grouped = group_changes_by_chart(git_diff_names(base_ref, roots), roots)
+    return sorted({chart for _, chart in grouped})
+
+
+def add_worktree(ref: str, path: Path) -> None:
+    """Check out ``ref`` into a detached worktree at ``path``."""
+    subprocess.run(
+        ["git", "worktree", "add", "--detach", str(path), ref],
+        cwd=REPO_ROOT,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+
+
+def remove_worktree(path: Path) -> None:
+    """Remove a worktree created by :func:`add_worktree`."""
+    subprocess.run(
+        ["git", "worktree", "remove", "--force", str(path)],
+        cwd=REPO_ROOT,
+        check=False,
+        capture_output=True,
+        text=True,
+    )
+
+
+def iter_fixtures(tree_root: Path, chart: str) -> dict[str, Path]:
+    """Return fixture values files for ``chart`` keyed by file name."""
+    fixture_dir = tree_root / FIXTURES_ROOT / chart
+    if not fixture_dir.is_dir():
+        return {}
+    return {
+        values_file.name: values_file
+        for values_file in sorted(fixture_dir.glob("*-values.yaml"))
+    }
+
+
+def known_repositories(helm_binary: str) -> dict[str, str]:
+    """Return the configured Helm repositories as a URL to name mapping."""
+    result = subprocess.run(
+        [helm_binary, "repo", "list", "--output", "json"],
+        check=False,
+        capture_output=True,
+        text=True,
+    )
+    # `helm repo list` exits non-zero when no repositories are configured.
+    if result.returncode != 0:
+        return {}
+    return {
+        entry["url"]: entry["name"]
+        for entry in json.loads(result.stdout or "[]")
+        if entry.get("url") and entry.get("name")
+    }
+
+
+def repository_name(url: str, taken: Iterable[str]) -> str:
+    """Return an unused ``auto-<name>`` repository name for ``url``."""
+    parsed = urlparse(url)
+    parts = [part for part in parsed.path.split("/") if part]
+    base = f"auto-{(parts[-1] if parts else parsed.netloc).split('.')[0]}"
+    taken = set(taken)
+    name, n = base, 1
+    while name in taken:
+        n += 1
+        name = f"{base}-{n}"
+    return name
+
+
+def add_dependency_repositories(
+    helm_binary: str, dependencies: list[dict[str, Any]], known: dict[str, str]
+) -> None:
+    """Run ``helm repo add`` for dependency repositories not yet configured.
+
+    ``helm dependency build`` only resolves charts from configured
+    repositories, so a clean runner needs them added first. ``known`` is
+    updated with the repositories that were added.
+    """
+    for dependency in dependencies:
+        url = dependency.get("repository") or ""
+        if not url.startswith(("http://", "https://")) or url in known:
+            continue
+        name = repository_name(url, known.values())
+        result = subprocess.run(
+            [helm_binary, "repo", "add", name, url],
+            check=False,
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            raise RuntimeError(
+                f"helm repo add {name} {url} failed: "
+                f"{result.stderr.strip() or 'unknown error'}"
+            )
+        known[url] = name
+
+
+def build_dependencies(
+    helm_binary: str, chart_dir: Path, known: dict[str, str]
+) -> None:
+    """Run ``helm dependency build`` for charts that declare dependencies."""
+    chart_yaml = chart_dir / "Chart.yaml"
+    data = yaml.safe_load(chart_yaml.read_text()) or {}
+    if not data.get("dependencies"):
+        return
+    add_dependency_repositories(helm_binary, data["dependencies"], known)
+    result = subprocess.run(
+        [helm_binary, "dependency", "build", str(chart_dir)],
+        check=False,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(
+            f"helm dependency build {chart_dir} failed: "
+            f"{result.stderr.strip() or 'unknown error'}"
+        )
+
+
+def render(helm_binary: str, job: RenderJob) -> RenderResult:
+    """Render one fixture the same way the golden files are generated."""
+    command = [
+        helm_binary,
+        "template",
+        job.chart,
+        str(job.chart_dir),
+        "--values",
+        str(job.values_file),
+    ]
+    result = subprocess.run(
+        command,
+        check=False,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    if result.returncode != 0:
+        return RenderResult(None, result.stderr.strip() or "unknown error")
+    return RenderResult(result.stdout)
+
+
+def render_all(
+    helm_binary: str,
+    jobs: Iterable[RenderJob],
+    cache: DigestCache,
+    workers: int,
+) -> dict[str, RenderResult]:
+    """Render each distinct input digest once, reusing cached output."""
+    results: dict[str, RenderResult] = {}
+    pending: dict[str, RenderJob] = {}
+    for job in jobs:
+        if job.key in results or job.key in pending:
+            continue
+        cached = cache.get(job.key)
+        if cached is not None:
+            results[job.key] = RenderResult(cached)
+        else:
+            pending[job.key] = job
+
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+        rendered = executor.map(
+            lambda job: render(helm_binary, job), pending.values()
+        )
+        for key, result in zip(pending, rendered):
+            if result.manifest is not None:
+                cache.put(key, result.manifest)
+            results[key] = result
+    return results
+
+
+def index_resources(manifest: str) -> dict[str, dict[str, Any]]:
+    """Return rendered documents keyed by ``Kind/[namespace/]name``."""
+    resources: dict[str, dict[str, Any]] = {}
+    for document in yaml.safe_load_all(manifest):
+        if not isinstance(document, dict) or "kind" not in document:
+            continue
+        metadata = document.get("metadata") or {}
+        parts = (
+            document["kind"],
+            metadata.get("namespace"),
+            metadata.get("name"),
+        )
+        resources["/".join(str(part) for part in parts if part)] = document
+    return resources
+
+
+def _format_value(value: Any) -> str:
+    """Return a short inline rendering of a manifest value."""
+    text = json.dumps(value, sort_keys=True, default=str)
+    if len(text) > MAX_VALUE_WIDTH:
+        text = text[: MAX_VALUE_WIDTH - 1] + "…"
+    return f"`{text}`"
+
+
+def _keyed_items(items: list[Any]) -> dict[str, Any] | None:
+    """Key list items by ``name`` when every item has a unique one."""
+    names = [
+        item.get("name") if isinstance(item, dict) else None for item in items
+    ]
+    if None in names or len(set(names)) != len(names):
+        return None
+    return {f"name={name}": item for name, item in zip(names, items)}
+
+
+def diff_documents(base: Any, head: Any, path: str = "") -> list[str]:
+    """Return human-readable field changes between two manifest values."""
+    if isinstance(base, dict) and isinstance(head, dict):
+        changes: list[str] = []
+        for key in sorted(set(base) | set(head), key=str):
+            child = f"{path}.{key}" if path else str(key)
+            if key not in base:
+                changes.append(f"`{child}`: added {_format_value(head[key])}")
+            elif key not in head:
+                changes.append(f"`{child}`: removed {_format_value(base[key])}")
+            else:
+                changes.extend(diff_documents(base[key], head[key], child))
+        return changes
+
+    if isinstance(base, list) and isinstance(head, list):
+        base_items = _keyed_items(base)
+        head_items = _keyed_items(head)
+        if base_items is None or head_items is None:
+            base_items = {str(index): item for index, item in enumerate(base)}
+            head_items = {str(index): item for index, item in enumerate(head)}
+        changes = []
+        removed = [key for key in base_items if key not in head_items]
+        for key in [*head_items, *removed]:
+            child = f"{path}[{key}]"
+            if key not in base_items:
+                changes.append(
+                    f"`{child}`: added {_format_value(head_items[key])}"
+                )
+            elif key not in head_items:
+                changes.append(
+                    f"`{child}`: removed {_format_value(base_items[key])}"
+                )
+            else:
+                changes.extend(
+                    diff_documents(base_items[key], head_items[key], child)
+                )
+        return changes
+
+    if base != head:
+        return [f"`{path}`: {_format_value(base)} → {_format_value(head)}"]
+    return []
+
+
+def diff_fixture(
+    base: RenderResult | None,
+    head: RenderResult | None,
+    max_changes: int,
+) -> list[str]:
+    """Return Markdown bullet lines describing one fixture's changes."""
+    if head is not None and head.error is not None:
+        return [f"- :x: head render failed: `{head.error}`"]
+    if base is not None and base.error is not None:
+        note = f"- base render failed; listing every resource: `{base.error}`"
+        base = None
+    else:
+        note = ""
+
+    base_resources = index_resources(base.manifest or "") if base else {}
+    head_resources = index_resources(head.manifest or "") if head else {}
+    lines = [note] if note else []
+    for name in sorted(set(base_resources) | set(head_resources)):
+        if name not in base_resources:
+            lines.append(f"- added `{name}`")
+            continue
+        if name not in head_resources:
+            lines.append(f"- removed `{name}`")
+            continue
+        changes = diff_documents(base_resources[name], head_resources[name])
+        if not changes:
+            continue
+        lines.append(f"- changed `{name}`")
+        lines.extend(f"  - {change}" for change in changes[:max_changes])
+        if len(changes) > max_changes:
+            lines.append(f"  - … and {len(changes) - max_changes} more")
+    return lines
+
+
+def format_report(
+    base_ref: str,
+    sections: dict[str, dict[str, list[str]]],
+    unchanged: dict[str, int],
+) -> str:
+    """Assemble the Markdown report from per-chart fixture sections."""
+    lines = ["## Rendered manifest diff", ""]
+    if not sections and not unchanged:
+        lines.append("No chart changes detected.")
+        return "\n".join(lines) + "\n"
+
+    lines.append(f"Compared against `{base_ref}`.")
+    for chart in sorted(set(sections) | set(unchanged)):
+        lines.extend(["", f"### {chart}", ""])
+        for fixture, fixture_lines in sorted(sections.get(chart, {}).items()):
+            lines.append(f"**{fixture}**")
+            lines.append("")
+            lines.extend(fixture_lines)
+            lines.append("")
+        count = unchanged.get(chart, 0)
+        if count:
+            lines.append(f"_{count} fixture(s) render identically._")
+    return "\n".join(lines).rstrip() + "\n"
+
+
+def collect_jobs(
+    helm_binary: str,
+    trees: dict[str, Path],
+    charts: list[str],
+    build_deps: bool,
+) -> dict[tuple[str, str], dict[str, RenderJob]]:
+    """Return render jobs keyed by (revision, chart) and fixture name."""
+    version = helm_version(helm_binary)
+    repositories = known_repositories(helm_binary) if build_deps else {}
+    fixtures: dict[tuple[str, str], dict[str, RenderJob]] = {}
+    for revision, tree_root in trees.items():
+        for chart in charts:
+            chart_dir = tree_root / CHARTS_ROOT / chart
+            if not (chart_dir / "Chart.yaml").is_file():
+                continue
+            if build_deps:
+                build_dependencies(helm_binary, chart_dir, repositories)
+            chart_digest = digest_tree(chart_dir)
+            for name, values_file in iter_fixtures(tree_root, chart).items():
+                key = combine_digests(
+                    [version, chart, chart_digest, digest_file(values_file)]
+                )
+                fixtures.setdefault((revision, chart), {})[name] = RenderJob(
+                    revision, chart, chart_dir, values_file, key
+                )
+    return fixtures
+
+
+def main() -> int:
+    """Render changed charts at both revisions and report the differences."""
+    args = parse_args()
+    helm_binary = shutil.which("helm")
+    if helm_binary is None:
+        print(
+            "Error: Helm must be installed and available in PATH",
+            file=sys.stderr,
+        )
+        return 1
+
+    charts = sorted(set(changed_charts(args.base_ref)) | set(args.charts or ()))
+    cache = DigestCache(args.cache_dir)
+
+    with tempfile.TemporaryDirectory(prefix="manifest-diff-") as temp_dir:
+        # Render HEAD from its own worktree too, so the rendered head matches
+        # the commits changed_charts() compared, not uncommitted edits.
+        trees = {
+            "base": Path(temp_dir) / "base",
+            "head": Path(temp_dir) / "head",
+        }
+        try:
+            add_worktree(args.base_ref, trees["base"])
+            add_worktree("HEAD", trees["head"])
+            fixtures = collect_jobs(
+                helm_binary,
+                trees,
+                charts,
+                build_deps=not args.skip_helm_network,
+            )
+            results = render_all(
+                helm_binary,
+                (job for jobs in fixtures.values() for job in jobs.values()),
+                cache,
+                args.jobs,
+            )
+        finally:
+            for tree_root in trees.values():
+                remove_worktree(tree_root)
+
+    sections: dict[str, dict[str, list[str]]] = {}
+    unchanged: dict[str, int] = {}
+    head_failed = False
+    for chart in charts:
+        base_jobs = fixtures.get(("base", chart), {})
+        head_jobs = fixtures.get(("head", chart), {})
+        for name in sorted(set(base_jobs) | set(head_jobs)):
+            base_job = base_jobs.get(name)
+            head_job = head_jobs.get(name)
+            if base_job and head_job and base_job.key == head_job.key:
+                unchanged[chart] = unchanged.get(chart, 0) + 1
+                continue
+            base_result = results[base_job.key] if base_job else None
+            head_result = results[head_job.key] if head_job else None
+            if head_result is not None and head_result.error is not None:
+                head_failed = True
+            lines = diff_fixture(base_result, head_result, args.max_changes)
+            if head_job is None:
+                lines.insert(0, "- fixture removed")
+            if lines:
+                sections.setdefault(chart, {})[name] = lines
+            else:
+                unchanged[chart] = unchanged.get(chart, 0) + 1
+
+    report = format_report(args.base_ref, sections, unchanged)
+    if args.output:
+        args.output.write_text(report)
+    else:
+        sys.stdout.write(report)
+    return 1 if head_failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+"""Content-addressed storage for golden manifests.
+
+A stored golden replaces ``<name>-values.golden.yaml`` with a small
+``<name>-values.golden.index`` file that lists, in order, the digest of every
+rendered document. Each document is written once to ``tests/golden-store``
+under its digest, so resources shared by many fixtures are kept only once.
+Joining the listed documents reproduces the original golden file exactly.
+"""
+
+from __future__ import annotations
+
+import re
+from pathlib import Path
+from typing import Iterable
+
+from chart_cache import DigestCache, digest_bytes
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+FIXTURES_ROOT = REPO_ROOT / "tests" / "fixtures"
+STORE_ROOT = REPO_ROOT / "tests" / "golden-store"
+GOLDEN_SUFFIX = ".golden.yaml"
+INDEX_SUFFIX = ".golden.index"
+
+_DOCUMENT_START = re.compile(r"^(?=---$)", re.MULTILINE)
+
+
+def split_documents(text: str) -> list[str]:
+    """Split rendered output into documents that join back to ``text``."""
+    return [part for part in _DOCUMENT_START.split(text) if part]
+
+
+def document_digests(text: str) -> list[str]:
+    """Return the ordered document digests for rendered output."""
+    return [digest_bytes(part.encode()) for part in split_documents(text)]
+
+
+def index_path(golden_file: Path) -> Path:
+    """Return the store index that stands in for ``golden_file``."""
+    return golden_file.with_name(
+        golden_file.name.removesuffix(GOLDEN_SUFFIX) + INDEX_SUFFIX
+    )
+
+
+def read_index(path: Path) -> list[str]:
+    """Return the digests listed in a store index."""
+    return [line for line in path.read_text().splitlines() if line]
+
+
+def iter_indexes(fixtures_root: Path = FIXTURES_ROOT) -> list[Path]:
+    """Return every store index under the fixtures directory."""
+    return sorted(fixtures_root.glob(f"*/*{INDEX_SUFFIX}"))
+
+
+class GoldenStore:
+    """Read and write golden manifests as deduplicated documents."""
+
+    def __init__(self, root: Path | None = None) -> None:
+        """Create a store rooted at ``root`` or the repository store."""
+        self.objects = DigestCache(root or STORE_ROOT)
+
+    def write(self, golden_file: Path, text: str) -> None:
+        """Store ``text`` for ``golden_file`` and write its index."""
+        digests: list[str] = []
+        for document in split_documents(text):
+            digest = digest_bytes(document.encode())
+            if self.objects.get(digest) is None:
+                self.objects.put(digest, document)
+            digests.append(digest)
+        index_path(golden_file).write_text("".join(f"{d}\n" for d in digests))
+
+    def read(self, digests: Iterable[str]) -> str:
+        """Return the golden text assembled from ``digests``."""
+        documents: list[str] = []
+        for digest in digests:
+            document = self.objects.get(digest)
+            if document is None:
+                raise FileNotFoundError(
+                    f"Golden store object {digest} is missing from "
+                    f"{self.objects.root}"
+                )
+            documents.append(document)
+        return "".join(documents)
+
+    def prune(self, referenced: set[str]) -> list[Path]:
+        """Delete stored documents that no index references."""
+        removed: list[Path] = []
+        if not self.objects.root.is_dir():
+            return removed
+        for path in sorted(self.objects.root.glob("*/*")):
+            if path.is_file() and path.name not in referenced:
+                path.unlink()
+                removed.append(path)
+        for directory in self.objects.root.iterdir():
+            if directory.is_dir() and not any(directory.iterdir()):
+                directory.rmdir()
+        return removed
+
+
+def golden_exists(golden_file: Path) -> bool:
+    """Return whether ``golden_file`` exists as a file or a store index."""
+    return golden_file.is_file() or index_path(golden_file).is_file()
+
+
+def load_golden(golden_file: Path, store: GoldenStore | None = None) -> str:
+    """Return golden text from the plain file or from the store."""
+    if golden_file.is_file():
+        return golden_file.read_text()
+    return (store or GoldenStore()).read(read_index(index_path(golden_file)))
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""Run ``helm lint`` for every chart and lint values file in parallel.
+
+Charts are discovered the same way the pytest suite discovers them (every
+``charts/<chart>`` directory with a ``Chart.yaml``). Each chart is linted with
+its ``linter_values.yaml`` and with every ``tests/fixtures/<chart>`` values
+file. Lint runs are spread across a worker pool, and results are cached under
+the digest of the chart directory, values file, and Helm version, so only
+charts or values that changed since the last run are linted again.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Iterable
+
+from chart_cache import (
+    DEFAULT_CACHE_ROOT,
+    DigestCache,
+    combine_digests,
+    digest_file,
+    digest_tree,
+    helm_version,
+)
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+CHARTS_DIR = REPO_ROOT / "charts"
+FIXTURES_ROOT = REPO_ROOT / "tests" / "fixtures"
+LINTER_VALUES = "linter_values.yaml"
+
+
+@dataclass(frozen=True)
+class LintTarget:
+    """One chart and values file combination to lint."""
+
+    chart: str
+    chart_dir: Path
+    values_file: Path
+    key: str
+
+
+@dataclass(frozen=True)
+class LintResult:
+    """The outcome of linting one target."""
+
+    chart: str
+    values_file: str
+    ok: bool
+    output: str
+    cached: bool = False
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line arguments for the lint driver."""
+    parser = argparse.ArgumentParser(
+        description=(
+            "Lint every chart with its linter values and fixture values "
+            "files using a worker pool."
+        )
+    )
+    parser.add_argument(
+        "--chart",
+        action="append",
+        dest="charts",
+        default=None,
+        help="Lint only this chart. Specify multiple times for more charts.",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of concurrent `helm lint` processes.",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=DEFAULT_CACHE_ROOT / "lint",
+        help="Directory for cached lint results keyed by input digest.",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Lint every target even when a cached result exists.",
+    )
+    parser.add_argument(
+        "--format",
+        choices=("text", "json"),
+        default="text",
+        help="Output format for the aggregated results.",
+    )
+    return parser.parse_args()
+
+
+def iter_charts() -> list[Path]:
+    """Return chart directories that contain a Chart.yaml file."""
+    if not CHARTS_DIR.is_dir():
+        return []
+    return sorted(
+        chart_dir
+        for chart_dir in CHARTS_DIR.iterdir()
+        if (chart_dir / "Chart.yaml").is_file()
+    )
+
+
+def iter_values_files(chart_dir: Path) -> list[Path]:
+    """Return the linter values file and every fixture values file.
+
+    ``linter_values.yaml`` usually links to ``minimal-values.yaml``, so files
+    with identical contents are only linted once.
+    """
+    candidates = [chart_dir / LINTER_VALUES]
+    fixture_dir = FIXTURES_ROOT / chart_dir.name
+    if fixture_dir.is_dir():
+        candidates.extend(sorted(fixture_dir.glob("*-values.yaml")))
+
+    values_files: list[Path] = []
+    seen: set[str] = set()
+    for candidate in candidates:
+        if not candidate.is_file():
+            continue
+        digest = digest_file(candidate)
+        if digest in seen:
+            continue
+        seen.add(digest)
+        values_files.append(candidate)
+    return values_files
+
+
+def collect_targets(charts: Iterable[Path], version: str) -> list[LintTarget]:
+    """Return lint targets keyed by chart, values, and Helm digests."""
+    targets: list[LintTarget] = []
+    for chart_dir in charts:
+        chart_digest = digest_tree(chart_dir)
+        for values_file in iter_values_files(chart_dir):
+            values_digest = digest_file(values_file)
+            key = combine_digests(
+                [version, chart_dir.name, chart_digest, values_digest]
+            )
+            targets.append(
+                LintTarget(chart_dir.name, chart_dir, values_file, key)
+            )
+    return targets
+
+
+def _display_path(path: Path) -> str:
+    """Return ``path`` relative to the repository when possible."""
+    try:
+        return path.relative_to(REPO_ROOT).as_posix()
+    except ValueError:
+        return path.as_posix()
+
+
+def lint(helm_binary: str, target: LintTarget) -> LintResult:
+    """Run ``helm lint`` for one target."""
+    result = subprocess.run(
+        [
+            helm_binary,
+            "lint",
+            str(target.chart_dir),
+            "--values",
+            str(target.values_file),
+        ],
+        check=False,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+    )
+    return LintResult(
+        chart=target.chart,
+        values_file=_display_path(target.values_file),
+        ok=result.returncode == 0,
+        output=result.stdout.strip(),
+    )
+
+
+def lint_all(
+    helm_binary: str,
+    targets: list[LintTarget],
+    cache: DigestCache | None,
+    workers: int,
+) -> list[LintResult]:
+    """Lint uncached targets concurrently and return results in order."""
+    results: dict[str, LintResult] = {}
+    pending: list[LintTarget] = []
+    for target in targets:
+        cached = cache.get(target.key) if cache else None
+        if cached is None:
+            pending.append(target)
+            continue
+        data = json.loads(cached)
+        results[target.key] = LintResult(
+            chart=target.chart,
+            values_file=_display_path(target.values_file),
+            ok=data["ok"],
+            output=data["output"],
+            cached=True,
+        )
+
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+        linted = executor.map(lambda target: lint(helm_binary, target), pending)
+        for target, result in zip(pending, linted):
+            if cache:
+                cache.put(
+                    target.key,
+                    json.dumps({"ok": result.ok, "output": result.output}),
+                )
+            results[target.key] = result
+    return [results[target.key] for target in targets]
+
+
+def format_text(results: list[LintResult]) -> str:
+    """Return a human-readable summary of lint results."""
+    lines: list[str] = []
+    for result in results:
+        status = "ok" if result.ok else "FAILED"
+        suffix = " (cached)" if result.cached else ""
+        lines.append(f"{status}: {result.chart} {result.values_file}{suffix}")
+        if not result.ok:
+            lines.extend(f"    {line}" for line in result.output.splitlines())
+    failed = sum(not result.ok for result in results)
+    cached = sum(result.cached for result in results)
+    lines.append(
+        f"{len(results)} target(s) linted, {failed} failed, "
+        f"{cached} from cache."
+    )
+    return "\n".join(lines) + "\n"
+
+
+def main() -> int:
+    """Lint the requested charts and report aggregated results."""
+    args = parse_args()
+    helm_binary = shutil.which("helm")
+    if helm_binary is None:
+        print(
+            "Error: Helm must be installed and available in PATH",
+            file=sys.stderr,
+        )
+        return 1
+
+    charts = iter_charts()
+    if args.charts:
+        charts = [chart for chart in charts if chart.name in args.charts]
+    targets = collect_targets(charts, helm_version(helm_binary))
+    cache = None if args.no_cache else DigestCache(args.cache_dir)
+    results = lint_all(helm_binary, targets, cache, args.jobs)
+
+    if args.format == "json":
+        payload = [asdict(result) for result in results]
+        sys.stdout.write(json.dumps(payload, indent=2) + "\n")
+    else:
+        sys.stdout.write(format_text(results))
+    return 0 if all(result.ok for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
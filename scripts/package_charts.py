@@ -0,0 +1,466 @@
+#!/usr/bin/env python3
+"""Package charts in parallel and merge them into a Helm repository index.
+
+The ``package`` command runs ``helm package`` for the selected charts across a
+worker pool, hashes each archive once, and optionally merges the new entries
+into an existing ``index.yaml``. The ``index`` command merges already packaged
+archives. Existing index entries are never rewritten, so publishing a version
+only touches that chart's entry list, and a directory on disk works as a
+complete chart repository for local testing.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tarfile
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterable
+
+import yaml
+from chart_cache import digest_file
+from check_chart_version_bump import git_diff_names, group_changes_by_chart
+from packaging.version import InvalidVersion, Version
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+CHARTS_ROOT = Path("charts")
+DEFAULT_URL_TEMPLATE = "{filename}"
+
+
+@dataclass(frozen=True)
+class ChartPackage:
+    """A packaged chart archive and the metadata stored in the index."""
+
+    path: Path
+    digest: str
+    metadata: dict[str, Any]
+
+    @property
+    def name(self) -> str:
+        """Return the chart name."""
+        return str(self.metadata["name"])
+
+    @property
+    def version(self) -> str:
+        """Return the chart version."""
+        return str(self.metadata["version"])
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line arguments for the packaging pipeline."""
+    parser = argparse.ArgumentParser(
+        description=(
+            "Package charts in parallel and merge them into a Helm "
+            "repository index.yaml incrementally."
+        )
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    package = commands.add_parser(
+        "package", help="Package charts and optionally update an index."
+    )
+    package.add_argument(
+        "charts",
+        nargs="*",
+        help="Charts to package. Defaults to every chart under charts/.",
+    )
+    package.add_argument(
+        "--since",
+        metavar="REF",
+        help="Package only charts changed since this git ref.",
+    )
+    package.add_argument(
+        "--destination",
+        type=Path,
+        required=True,
+        help="Directory that receives the packaged .tgz archives.",
+    )
+    package.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of concurrent `helm package` processes.",
+    )
+
+    index = commands.add_parser(
+        "index", help="Merge packaged archives into an index."
+    )
+    index.add_argument(
+        "packages", nargs="+", type=Path, help="Chart archives to index."
+    )
+
+    for command in (package, index):
+        command.add_argument(
+            "--index",
+            dest="index_file",
+            type=Path,
+            required=command is index,
+            help="index.yaml to create or update with the new entries.",
+        )
+        command.add_argument(
+            "--url",
+            default=DEFAULT_URL_TEMPLATE,
+            help=(
+                "Download URL template for each entry. Supports {name}, "
+                "{version}, and {filename}; the default is a URL relative to "
+                "the index."
+            ),
+        )
+    return parser.parse_args()
+
+
+def select_charts(names: list[str], since: str | None) -> list[Path]:
+    """Return chart directories to package, optionally limited to changes."""
+    charts_dir = REPO_ROOT / CHARTS_ROOT
+    charts = sorted(
+        chart_dir
+        for chart_dir in charts_dir.iterdir()
+        if (chart_dir / "Chart.yaml").is_file()
+    )
+    if names:
+        unknown = set(names) - {chart.name for chart in charts}
+        if unknown:
+            raise ValueError(f"Unknown chart(s): {', '.join(sorted(unknown))}")
+        charts = [chart for chart in charts if chart.name in names]
+    if since:
+        grouped = group_changes_by_chart(
+            git_diff_names(since, [CHARTS_ROOT]), [CHARTS_ROOT]
+        )
+        changed = {chart for _, chart in grouped}
+        charts = [chart for chart in charts if chart.name in changed]
+    return charts
+
+
+def read_archive_metadata(path: Path) -> dict[str, Any]:
+    """Return the Chart.yaml metadata stored inside a chart archive."""
+    with tarfile.open(path, "r:gz") as archive:
+        for member in archive.getmembers():
+            parts = Path(member.name).parts
+            if len(parts) == 2 and parts[1] == "Chart.yaml":
+                handle = archive.extractfile(member)
+                if handle is not None:
+                    return yaml.safe_load(handle.read()) or {}
+    raise ValueError(f"{path} does not contain a top-level Chart.yaml")
+
+
+def load_package(path: Path) -> ChartPackage:
+    """Hash an archive and read its metadata."""
+    return ChartPackage(path, digest_file(path), read_archive_metadata(path))
+
+
+def package_chart(
+    helm_binary: str, chart_dir: Path, destination: Path
+) -> ChartPackage:
+    """Run ``helm package`` for one chart and return the archive."""
+    chart = yaml.safe_load((chart_dir / "Chart.yaml").read_text()) or {}
+    command = [
+        helm_binary,
+        "package",
+        str(chart_dir),
+        "--destination",
+        str(destination),
+    ]
+    if chart.get("dependencies"):
+        command.append("--dependency-update")
+    result = subprocess.run(
+        command, check=False, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(
+            f"helm package {chart_dir} failed: "
+            f"{result.stderr.strip() or 'unknown error'}"
+        )
+    archive = destination / f"{chart['name']}-{chart['version']}.tgz"
+    return load_package(archive)
+
+
+def package_charts(
+    helm_binary: str,
+    charts: list[Path],
+    destination: Path,
+    workers: int,
+) -> list[ChartPackage]:
+    """Package ``charts`` concurrently into ``destination``."""
+    destination.mkdir(parents=True, exist_ok=True)
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+        return list(
+            executor.map(
+                lambda chart: package_chart(helm_binary, chart, destination),
+                charts,
+            )
+        )
+
+
+def load_index_text(text: str) -> dict[str, Any]:
+    """Parse a repository index, filling in the required top-level keys."""
+    index = yaml.safe_load(text) or {}
+    index.setdefault("apiVersion", "v1")
+    if index.get("entries") is None:
+        index["entries"] = {}
+    return index
+
+
+def load_index(path: Path | None) -> dict[str, Any]:
+    """Return the repository index at ``path``, or an empty index."""
+    if path is None or not path.is_file():
+        return {"apiVersion": "v1", "entries": {}}
+    return load_index_text(path.read_text(encoding="utf-8"))
+
+
+def published_versions(index: dict[str, Any]) -> set[tuple[str, str]]:
+    """Return the ``(name, version)`` pairs already in ``index``."""
+    return {
+        (str(name), str(entry.get("version")))
+        for name, entries in index["entries"].items()
+        for entry in entries or []
+    }
+
+
+def _version_key(entry: dict[str, Any]) -> tuple[int, Version | str]:
+    """Sort valid SemVer versions first, newest first, like Helm does."""
+    version = str(entry.get("version", ""))
+    try:
+        return (1, Version(version))
+    except InvalidVersion:
+        return (0, version)
+
+
+def index_entry(
+    package: ChartPackage, url_template: str, created: str
+) -> dict[str, Any]:
+    """Return the index entry for one packaged chart."""
+    url = url_template.format(
+        name=package.name,
+        version=package.version,
+        filename=package.path.name,
+    )
+    return {
+        **package.metadata,
+        "created": created,
+        "digest": package.digest,
+        "urls": [url],
+    }
+
+
+def merge_packages(
+    index: dict[str, Any],
+    packages: Iterable[ChartPackage],
+    url_template: str,
+) -> list[ChartPackage]:
+    """Add ``packages`` to ``index`` without touching existing entries.
+
+    Re-adding a published version with the same digest is a no-op; a different
+    digest raises ``ValueError`` because published versions are immutable.
+    Returns the packages that were added.
+    """
+    created = datetime.now(timezone.utc).isoformat()
+    added: list[ChartPackage] = []
+    for package in packages:
+        entries = index["entries"].setdefault(package.name, [])
+        existing = next(
+            (e for e in entries if str(e.get("version")) == package.version),
+            None,
+        )
+        if existing is not None:
+            if existing.get("digest") != package.digest:
+                raise ValueError(
+                    f"{package.name} {package.version} is already published "
+                    "with a different digest; bump the chart version"
+                )
+            continue
+        entry = index_entry(package, url_template, created)
+        position = next(
+            (
+                i
+                for i, current in enumerate(entries)
+                if _version_key(current) < _version_key(entry)
+            ),
+            len(entries),
+        )
+        entries.insert(position, entry)
+        added.append(package)
+    if added:
+        index["generated"] = created
+    return added
+
+
+def dump_index(index: dict[str, Any]) -> str:
+    """Return ``index`` as YAML without wrapping or escaping any value."""
+    return yaml.safe_dump(
+        index, sort_keys=False, width=float("inf"), allow_unicode=True
+    )
+
+
+def _indent(line: str) -> int:
+    """Return the number of leading spaces on ``line``."""
+    return len(line) - len(line.lstrip(" "))
+
+
+def _insert_entry(
+    lines: list[str], name: str, position: int, entry: dict[str, Any]
+) -> list[str] | None:
+    """Return ``lines`` with ``entry`` spliced in as ``name``'s item.
+
+    ``position`` is the entry's place in the chart's version list. Returns
+    ``None`` when ``lines`` is not a block-style index this can edit.
+    """
+    start = next(
+        (i for i, line in enumerate(lines) if line.rstrip() == "entries:"),
+        None,
+    )
+    if start is None:
+        return None
+    end = next(
+        (
+            i
+            for i in range(start + 1, len(lines))
+            if lines[i].strip() and _indent(lines[i]) == 0
+        ),
+        len(lines),
+    )
+    keys = [
+        i
+        for i in range(start + 1, end)
+        if lines[i].strip()
+        and not lines[i].lstrip().startswith("- ")
+        and _indent(lines[i]) == _indent(lines[start + 1])
+    ]
+    if not keys:
+        return None
+    key_indent = _indent(lines[keys[0]])
+    # Helm writes the version lists without indenting them under the chart.
+    item_indent = _indent(lines[keys[0] + 1])
+    item = yaml.safe_dump(
+        [entry], width=float("inf"), allow_unicode=True
+    ).splitlines(keepends=True)
+    item = [" " * item_indent + line for line in item]
+
+    key = next((i for i in keys if lines[i].strip() == f"{name}:"), None)
+    if key is None:
+        block = [" " * key_indent + f"{name}:\n", *item]
+        before = next(
+            (i for i in keys if lines[i].strip().rstrip(":") > name), end
+        )
+        return lines[:before] + block + lines[before:]
+
+    block_end = next((i for i in keys if i > key), end)
+    items = [
+        i
+        for i in range(key + 1, block_end)
+        if _indent(lines[i]) == item_indent
+        and lines[i].lstrip().startswith("- ")
+    ]
+    at = items[position] if position < len(items) else block_end
+    return lines[:at] + item + lines[at:]
+
+
+def merge_index_text(original: str, index: dict[str, Any]) -> str:
+    """Return ``original`` with the entries of ``index`` it lacks spliced in.
+
+    Untouched entries keep their exact bytes, including Helm's quoting and
+    long lines, so publishing a version only adds its own lines and updates
+    ``generated``. Falls back to :func:`dump_index` for indexes that are not
+    in Helm's block style.
+    """
+    published = published_versions(load_index_text(original))
+    lines: list[str] | None = original.splitlines(keepends=True)
+    for name, entries in index["entries"].items():
+        for position, entry in enumerate(entries):
+            if (str(name), str(entry.get("version"))) in published:
+                continue
+            lines = _insert_entry(lines, str(name), position, entry)
+            if lines is None:
+                return dump_index(index)
+    text = "".join(lines)
+    if "generated" in index:
+        generated = f'generated: "{index["generated"]}"'
+        text, count = re.subn(
+            r"^generated:.*$", generated, text, flags=re.MULTILINE
+        )
+        if not count:
+            text = text.rstrip("\n") + f"\n{generated}\n"
+    return text
+
+
+def write_index(index: dict[str, Any], path: Path) -> None:
+    """Write ``index`` to ``path`` atomically, changing only new entries."""
+    if path.is_file():
+        text = merge_index_text(path.read_text(encoding="utf-8"), index)
+    else:
+        text = dump_index(index)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(
+        "w", dir=path.parent, delete=False, suffix=".tmp", encoding="utf-8"
+    ) as handle:
+        handle.write(text)
+        temp_path = Path(handle.name)
+    os.replace(temp_path, path)
+
+
+def update_index(
+    index_file: Path, packages: list[ChartPackage], url_template: str
+) -> None:
+    """Merge ``packages`` into ``index_file`` and report what changed."""
+    index = load_index(index_file)
+    added = merge_packages(index, packages, url_template)
+    if not added:
+        print(f"{index_file} is already up to date.")
+        return
+    write_index(index, index_file)
+    for package in added:
+        print(f"Indexed {package.name} {package.version} in {index_file}")
+
+
+def main() -> int:
+    """Package and index charts as requested."""
+    args = parse_args()
+    try:
+        if args.command == "index":
+            packages = [load_package(path) for path in args.packages]
+            update_index(args.index_file, packages, args.url)
+            return 0
+
+        helm_binary = shutil.which("helm")
+        if helm_binary is None:
+            print(
+                "Error: Helm must be installed and available in PATH",
+                file=sys.stderr,
+            )
+            return 1
+
+        charts = select_charts(args.charts, args.since)
+        if args.index_file is not None:
+            published = published_versions(load_index(args.index_file))
+            for chart_dir in list(charts):
+                chart = yaml.safe_load((chart_dir / "Chart.yaml").read_text())
+                key = (str(chart["name"]), str(chart["version"]))
+                if key in published:
+                    print(f"Skipping {key[0]} {key[1]}; already indexed.")
+                    charts.remove(chart_dir)
+        if not charts:
+            print("No charts to package.")
+            return 0
+
+        packages = package_charts(
+            helm_binary, charts, args.destination, args.jobs
+        )
+        for package in packages:
+            print(f"Packaged {package.path} ({package.digest})")
+        if args.index_file is not None:
+            update_index(args.index_file, packages, args.url)
+    except (RuntimeError, ValueError) as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,18 +1,55 @@
 #!/usr/bin/env python3
-"""Regenerate golden manifests for every chart fixture directory."""
+"""Regenerate golden manifests for every chart fixture directory.
+
+Each fixture keeps its current golden format: a plain ``.golden.yaml`` file
+or a ``.golden.index`` into the deduplicated golden store. Pass ``--store`` to
+move every golden into the store, or ``--export`` to turn stored goldens back
+into plain files without rendering anything.
+"""
 
 from __future__ import annotations
 
+import argparse
 import shutil
 import subprocess
 import sys
 from pathlib import Path
 
+from golden_store import (
+    GOLDEN_SUFFIX,
+    INDEX_SUFFIX,
+    GoldenStore,
+    document_digests,
+    index_path,
+    iter_indexes,
+    load_golden,
+    read_index,
+)
+
 REPO_ROOT = Path(__file__).resolve().parents[1]
 CHARTS_DIR = REPO_ROOT / "charts"
 FIXTURES_ROOT = REPO_ROOT / "tests" / "fixtures"
 
 
+def parse_args() -> argparse.Namespace:
+    """Parse command-line arguments for golden regeneration."""
+    parser = argparse.ArgumentParser(
+        description="Regenerate golden manifests for every chart fixture."
+    )
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--store",
+        action="store_true",
+        help="Write every golden into the deduplicated golden store.",
+    )
+    mode.add_argument(
+        "--export",
+        action="store_true",
+        help="Export stored goldens back to plain .golden.yaml files.",
+    )
+    return parser.parse_args()
+
+
 def iter_fixture_values() -> list[tuple[str, Path, Path]]:
     """Yield (chart_name, chart_dir, values_file) tuples for every fixture."""
 
@@ -29,7 +66,31 @@ def iter_fixture_values() -> list[tuple[str, Path, Path]]:
     return fixtures
 
 
-def regenerate_all() -> None:
+def prune_store(store: GoldenStore) -> None:
+    """Remove stored documents that no fixture index references."""
+
+    referenced = {
+        digest for index in iter_indexes() for digest in read_index(index)
+    }
+    for path in store.prune(referenced):
+        print(f"Pruned {path.relative_to(REPO_ROOT)}")
+
+
+def export_all() -> None:
+    """Write every stored golden back to a plain golden file."""
+
+    store = GoldenStore()
+    for index in iter_indexes():
+        golden_file = index.with_name(
+            index.name.removesuffix(INDEX_SUFFIX) + GOLDEN_SUFFIX
+        )
+        golden_file.write_text(load_golden(golden_file, store))
+        index.unlink()
+        print(f"Exported {golden_file.relative_to(REPO_ROOT)}")
+    prune_store(store)
+
+
+def regenerate_all(use_store: bool = False) -> None:
     """Render every fixture values file into its golden manifest."""
 
     helm_binary = shutil.which("helm")
@@ -42,8 +103,10 @@ def regenerate_all() -> None:
             f"No fixture values files were found in {FIXTURES_ROOT}"
         )
 
+    store = GoldenStore()
     for chart_name, chart_dir, values_file in fixtures:
         golden_file = values_file.with_suffix(".golden.yaml")
+        stored = use_store or index_path(golden_file).is_file()
         command = [
             helm_binary,
             "template",
@@ -64,6 +127,20 @@ def regenerate_all() -> None:
             error = result.stderr.strip() or "unknown error"
             raise RuntimeError(f"{joined} failed: {error}")
         rel_path = golden_file.relative_to(REPO_ROOT)
+        if stored:
+            index = index_path(golden_file)
+            if (
+                not golden_file.exists()
+                and index.is_file()
+                and read_index(index) == document_digests(result.stdout)
+            ):
+                print(f"Skipped {rel_path}: unchanged")
+                continue
+            store.write(golden_file, result.stdout)
+            if golden_file.exists():
+                golden_file.unlink()
+            print(f"Stored {rel_path}")
+            continue
         if golden_file.exists():
             existing_contents = golden_file.read_text()
             if existing_contents == result.stdout:
@@ -72,11 +149,16 @@ def regenerate_all() -> None:
 
         golden_file.write_text(result.stdout)
         print(f"Updated {rel_path}")
+    prune_store(store)
 
 
 if __name__ == "__main__":
+    args = parse_args()
     try:
-        regenerate_all()
+        if args.export:
+            export_all()
+        else:
+            regenerate_all(use_store=args.store)
     except Exception as exc:  # pragma: no cover - invoked as a script
         print(f"Error: {exc}", file=sys.stderr)
         sys.exit(1)
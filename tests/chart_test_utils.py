@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import importlib.util
+import sys
 import tempfile
 from dataclasses import dataclass
 from pathlib import Path
@@ -15,6 +17,17 @@ if TYPE_CHECKING:  # pragma: no cover - import only for typing
 REPO_ROOT = Path(__file__).resolve().parents[1]
 CHARTS_DIR = REPO_ROOT / "charts"
 FIXTURES_ROOT = REPO_ROOT / "tests" / "fixtures"
+SCRIPTS_DIR = REPO_ROOT / "scripts"
+
+sys.path.insert(0, str(SCRIPTS_DIR))
+_GOLDEN_STORE_SPEC = importlib.util.spec_from_file_location(
+    "golden_store", SCRIPTS_DIR / "golden_store.py"
+)
+assert _GOLDEN_STORE_SPEC is not None
+assert _GOLDEN_STORE_SPEC.loader is not None
+golden_store = importlib.util.module_from_spec(_GOLDEN_STORE_SPEC)
+sys.modules[_GOLDEN_STORE_SPEC.name] = golden_store
+_GOLDEN_STORE_SPEC.loader.exec_module(golden_store)
 
 
 @dataclass(frozen=True)
@@ -123,11 +136,28 @@ def render_chart(
             temp_values_file.unlink(missing_ok=True)
 
 
+def golden_exists(golden_file: Path) -> bool:
+    """Return whether a golden exists as a plain file or a store index."""
+
+    return golden_store.golden_exists(golden_file)
+
+
 def assert_matches_golden(rendered: str, golden_file: Path) -> None:
-    """Compare rendered output to a stored golden manifest."""
+    """Compare rendered output to a stored golden manifest.
+
+    Goldens kept in the golden store are compared by document digest first,
+    so matching renders never read the stored documents.
+    """
 
-    expected = golden_file.read_text()
-    assert rendered.strip() + "\n" == expected
+    actual = rendered.strip() + "\n"
+    index = golden_store.index_path(golden_file)
+    if not golden_file.exists() and index.is_file():
+        if golden_store.document_digests(actual) == golden_store.read_index(
+            index
+        ):
+            return
+    expected = golden_store.load_golden(golden_file)
+    assert actual == expected
 
 
 def load_manifests(rendered: str) -> list[dict[str, Any]]:
@@ -156,6 +186,7 @@ def get_primary_container(manifests: list[dict[str, Any]]) -> dict[str, Any]:
 __all__ = [
     "ChartContext",
     "assert_matches_golden",
+    "golden_exists",
     "get_manifest",
     "get_primary_container",
     "load_manifests",
@@ -38,6 +38,31 @@ def pytest_addoption(parser: pytest.Parser) -> None:
             "(no repo add/update or dependency build)."
         ),
     )
+    parser.addoption(
+        "--render-budgets",
+        action="store_true",
+        default=False,
+        help=(
+            "Time repeated renders of every fixture and fail when one "
+            "exceeds its budget in tests/render_budgets.yaml."
+        ),
+    )
+    parser.addoption(
+        "--record-render-budgets",
+        action="store_true",
+        default=False,
+        help=(
+            "Time every fixture like --render-budgets, but write each "
+            "measured median plus headroom to tests/render_budgets.yaml "
+            "instead of checking it."
+        ),
+    )
+    parser.addoption(
+        "--render-budget-runs",
+        type=int,
+        default=None,
+        help="Override the number of timed renders per fixture.",
+    )
 
 
 def _iter_charts_with_manifests() -> Iterable[Path]:
@@ -6,7 +6,12 @@ from pathlib import Path
 
 import pytest
 
-from .chart_test_utils import ChartContext, assert_matches_golden, render_chart
+from .chart_test_utils import (
+    ChartContext,
+    assert_matches_golden,
+    golden_exists,
+    render_chart,
+)
 
 CHART = ChartContext("ack-documentdb-provider")
 
@@ -18,7 +23,7 @@ def discover_golden_pairs() -> list[tuple[Path, Path]]:
     fixtures_dir = CHART.fixtures_dir
     for values_file in sorted(fixtures_dir.glob("*-values.yaml")):
         golden_file = values_file.with_suffix(".golden.yaml")
-        if golden_file.exists():
+        if golden_exists(golden_file):
             pairs.append((values_file, golden_file))
     return pairs
 
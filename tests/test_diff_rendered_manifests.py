@@ -0,0 +1,178 @@
+"""Tests for the rendered manifest diff report."""
+
+from __future__ import annotations
+
+import importlib.util
+import subprocess
+import sys
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "scripts"
+MODULE_PATH = SCRIPTS_DIR / "diff_rendered_manifests.py"
+sys.path.insert(0, str(SCRIPTS_DIR))
+SPEC = importlib.util.spec_from_file_location(
+    "diff_rendered_manifests", MODULE_PATH
+)
+assert SPEC is not None
+assert SPEC.loader is not None
+MODULE = importlib.util.module_from_spec(SPEC)
+sys.modules[SPEC.name] = MODULE
+SPEC.loader.exec_module(MODULE)
+
+BASE_MANIFEST = """\
+---
+apiVersion: v1
+kind: Service
+metadata:
+  name: app
+spec:
+  ports:
+    - name: http
+      port: 3000
+---
+apiVersion: apps/v1
+kind: Deployment
+metadata:
+  name: app
+spec:
+  replicas: 1
+  template:
+    spec:
+      containers:
+        - name: app
+          env:
+            - name: A
+              value: "1"
+            - name: B
+              value: "2"
+"""
+
+HEAD_MANIFEST = """\
+---
+apiVersion: apps/v1
+kind: Deployment
+metadata:
+  name: app
+spec:
+  template:
+    spec:
+      containers:
+        - name: app
+          env:
+            - name: NEW
+              value: "0"
+            - name: A
+              value: "1"
+            - name: B
+              value: "3"
+---
+apiVersion: policy/v1
+kind: PodDisruptionBudget
+metadata:
+  name: app
+"""
+
+
+def test_diff_documents_matches_named_list_items() -> None:
+    """Inserted env vars should not shift every later entry."""
+
+    base = MODULE.index_resources(BASE_MANIFEST)["Deployment/app"]
+    head = MODULE.index_resources(HEAD_MANIFEST)["Deployment/app"]
+
+    changes = MODULE.diff_documents(base, head)
+
+    prefix = "spec.template.spec.containers[name=app].env"
+    assert changes == [
+        "`spec.replicas`: removed `1`",
+        f'`{prefix}[name=NEW]`: added `{{"name": "NEW", "value": "0"}}`',
+        f'`{prefix}[name=B].value`: `"2"` → `"3"`',
+    ]
+
+
+def test_diff_fixture_lists_added_removed_and_changed_resources() -> None:
+    """Report resource-level additions and removals alongside field edits."""
+
+    lines = MODULE.diff_fixture(
+        MODULE.RenderResult(BASE_MANIFEST),
+        MODULE.RenderResult(HEAD_MANIFEST),
+        max_changes=1,
+    )
+
+    assert lines == [
+        "- changed `Deployment/app`",
+        "  - `spec.replicas`: removed `1`",
+        "  - … and 2 more",
+        "- added `PodDisruptionBudget/app`",
+        "- removed `Service/app`",
+    ]
+
+
+def test_diff_fixture_reports_head_render_failures() -> None:
+    """A fixture that no longer renders should be flagged, not diffed."""
+
+    lines = MODULE.diff_fixture(
+        MODULE.RenderResult(BASE_MANIFEST),
+        MODULE.RenderResult(None, "execution error"),
+        max_changes=5,
+    )
+
+    assert lines == ["- :x: head render failed: `execution error`"]
+
+
+def test_render_all_renders_each_digest_once(tmp_path, monkeypatch) -> None:
+    """Identical inputs at both revisions share one render and cache entry."""
+
+    calls: list[str] = []
+
+    def fake_render(helm_binary: str, job) -> object:
+        calls.append(job.revision)
+        return MODULE.RenderResult(f"rendered {job.key}\n")
+
+    monkeypatch.setattr(MODULE, "render", fake_render)
+    cache = MODULE.DigestCache(tmp_path)
+    values_file = tmp_path / "minimal-values.yaml"
+    jobs = [
+        MODULE.RenderJob("base", "app", tmp_path, values_file, "a" * 64),
+        MODULE.RenderJob("head", "app", tmp_path, values_file, "a" * 64),
+        MODULE.RenderJob("head", "app", tmp_path, values_file, "b" * 64),
+    ]
+
+    first = MODULE.render_all("helm", jobs, cache, workers=2)
+    second = MODULE.render_all("helm", jobs, cache, workers=2)
+
+    assert sorted(calls) == ["base", "head"]
+    assert first == second
+    assert cache.get("a" * 64) == f"rendered {'a' * 64}\n"
+
+
+def test_dependency_repositories_are_added_once(monkeypatch) -> None:
+    """A clean runner gets each missing dependency repository added."""
+
+    commands: list[list[str]] = []
+
+    def fake_run(command: list[str], **kwargs) -> object:
+        commands.append(command)
+        return subprocess.CompletedProcess(command, 0, "", "")
+
+    monkeypatch.setattr(MODULE.subprocess, "run", fake_run)
+    known = {"https://example.test/charts": "auto-bitnami"}
+    dependencies = [
+        {"name": "redis", "repository": "https://charts.bitnami.com/bitnami"},
+        {"name": "common", "repository": "https://example.test/charts"},
+        {"name": "local", "repository": "file://../local"},
+        {"name": "oci", "repository": "oci://registry.example.test/charts"},
+    ]
+
+    MODULE.add_dependency_repositories("helm", dependencies, known)
+    MODULE.add_dependency_repositories("helm", dependencies, known)
+
+    assert commands == [
+        [
+            "helm",
+            "repo",
+            "add",
+            "auto-bitnami-2",
+            "https://charts.bitnami.com/bitnami",
+        ]
+    ]
+    assert known["https://charts.bitnami.com/bitnami"] == "auto-bitnami-2"
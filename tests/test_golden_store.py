@@ -0,0 +1,73 @@
+"""Tests for the deduplicated golden manifest store."""
+
+from __future__ import annotations
+
+import pytest
+
+from . import chart_test_utils
+from .chart_test_utils import assert_matches_golden, golden_exists
+
+golden_store = chart_test_utils.golden_store
+
+FIRST = """\
+---
+# Source: app/templates/service.yaml
+kind: Service
+metadata:
+  name: app
+---
+# Source: app/templates/deployment.yaml
+kind: Deployment
+spec:
+  replicas: 1
+"""
+
+SECOND = """\
+---
+# Source: app/templates/service.yaml
+kind: Service
+metadata:
+  name: app
+---
+# Source: app/templates/deployment.yaml
+kind: Deployment
+spec:
+  replicas: 3
+"""
+
+
+def test_store_keeps_shared_documents_once(tmp_path) -> None:
+    """Fixtures that share a document reference a single stored copy."""
+
+    store = golden_store.GoldenStore(tmp_path / "store")
+    first = tmp_path / "a-values.golden.yaml"
+    second = tmp_path / "b-values.golden.yaml"
+
+    store.write(first, FIRST)
+    store.write(second, SECOND)
+
+    first_index = golden_store.read_index(golden_store.index_path(first))
+    second_index = golden_store.read_index(golden_store.index_path(second))
+    assert first_index[0] == second_index[0]
+    assert len(list((tmp_path / "store").glob("*/*"))) == 3
+    assert golden_store.load_golden(first, store) == FIRST
+    assert golden_store.load_golden(second, store) == SECOND
+
+    removed = store.prune(set(first_index))
+    assert [path.name for path in removed] == [second_index[1]]
+
+
+def test_assert_matches_golden_reads_store_indexes(
+    tmp_path, monkeypatch
+) -> None:
+    """Stored goldens compare like plain golden files."""
+
+    monkeypatch.setattr(golden_store, "STORE_ROOT", tmp_path / "store")
+    golden_file = tmp_path / "app-values.golden.yaml"
+    golden_store.GoldenStore().write(golden_file, FIRST)
+
+    assert not golden_file.exists()
+    assert golden_exists(golden_file)
+    assert_matches_golden(FIRST + "\n", golden_file)
+    with pytest.raises(AssertionError):
+        assert_matches_golden(SECOND, golden_file)
@@ -0,0 +1,85 @@
+"""Tests for the parallel helm lint driver."""
+
+from __future__ import annotations
+
+import importlib.util
+import sys
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "scripts"
+MODULE_PATH = SCRIPTS_DIR / "lint_charts.py"
+sys.path.insert(0, str(SCRIPTS_DIR))
+SPEC = importlib.util.spec_from_file_location("lint_charts", MODULE_PATH)
+assert SPEC is not None
+assert SPEC.loader is not None
+MODULE = importlib.util.module_from_spec(SPEC)
+sys.modules[SPEC.name] = MODULE
+SPEC.loader.exec_module(MODULE)
+
+
+def _make_chart(root: Path, name: str) -> Path:
+    chart_dir = root / "charts" / name
+    fixture_dir = root / "tests" / "fixtures" / name
+    chart_dir.mkdir(parents=True)
+    fixture_dir.mkdir(parents=True)
+    (chart_dir / "Chart.yaml").write_text(f"name: {name}\n")
+    (fixture_dir / "minimal-values.yaml").write_text("replicas: 1\n")
+    (fixture_dir / "hpa-values.yaml").write_text("hpa: true\n")
+    (chart_dir / "linter_values.yaml").symlink_to(
+        f"../../tests/fixtures/{name}/minimal-values.yaml"
+    )
+    return chart_dir
+
+
+def test_collect_targets_lints_linter_and_fixture_values_once(
+    tmp_path, monkeypatch
+) -> None:
+    """The linter_values symlink should not duplicate minimal-values."""
+
+    monkeypatch.setattr(MODULE, "CHARTS_DIR", tmp_path / "charts")
+    monkeypatch.setattr(
+        MODULE, "FIXTURES_ROOT", tmp_path / "tests" / "fixtures"
+    )
+    _make_chart(tmp_path, "app")
+    (tmp_path / "charts" / "not-a-chart").mkdir()
+
+    targets = MODULE.collect_targets(MODULE.iter_charts(), "v4.1.1")
+
+    assert [(t.chart, t.values_file.name) for t in targets] == [
+        ("app", "linter_values.yaml"),
+        ("app", "hpa-values.yaml"),
+    ]
+    assert len({target.key for target in targets}) == 2
+
+
+def test_lint_all_reuses_cached_results(tmp_path, monkeypatch) -> None:
+    """Unchanged targets are answered from the cache on the next run."""
+
+    monkeypatch.setattr(MODULE, "CHARTS_DIR", tmp_path / "charts")
+    monkeypatch.setattr(
+        MODULE, "FIXTURES_ROOT", tmp_path / "tests" / "fixtures"
+    )
+    _make_chart(tmp_path, "app")
+    calls: list[str] = []
+
+    def fake_lint(helm_binary: str, target) -> object:
+        calls.append(target.values_file.name)
+        ok = target.values_file.name != "hpa-values.yaml"
+        return MODULE.LintResult(
+            target.chart, target.values_file.name, ok, "lint output"
+        )
+
+    monkeypatch.setattr(MODULE, "lint", fake_lint)
+    cache = MODULE.DigestCache(tmp_path / "cache")
+    targets = MODULE.collect_targets(MODULE.iter_charts(), "v4.1.1")
+
+    first = MODULE.lint_all("helm", targets, cache, workers=2)
+    second = MODULE.lint_all("helm", targets, cache, workers=2)
+
+    assert sorted(calls) == ["hpa-values.yaml", "linter_values.yaml"]
+    assert [result.ok for result in first] == [True, False]
+    assert [result.ok for result in second] == [True, False]
+    assert all(result.cached for result in second)
+    summary = MODULE.format_text(second)
+    assert "    lint output" in summary
+    assert summary.endswith("2 target(s) linted, 1 failed, 2 from cache.\n")
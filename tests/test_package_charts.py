@@ -0,0 +1,208 @@
+"""Tests for the incremental chart packaging and index builder."""
+
+from __future__ import annotations
+
+import difflib
+import importlib.util
+import io
+import sys
+import tarfile
+from pathlib import Path
+
+import pytest
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "scripts"
+MODULE_PATH = SCRIPTS_DIR / "package_charts.py"
+sys.path.insert(0, str(SCRIPTS_DIR))
+SPEC = importlib.util.spec_from_file_location("package_charts", MODULE_PATH)
+assert SPEC is not None
+assert SPEC.loader is not None
+MODULE = importlib.util.module_from_spec(SPEC)
+sys.modules[SPEC.name] = MODULE
+SPEC.loader.exec_module(MODULE)
+
+
+def _archive(directory: Path, name: str, version: str, body: str = "") -> Path:
+    path = directory / f"{name}-{version}.tgz"
+    chart_yaml = (
+        f"apiVersion: v2\nname: {name}\nversion: {version}\n{body}"
+    ).encode()
+    with tarfile.open(path, "w:gz") as archive:
+        info = tarfile.TarInfo(f"{name}/Chart.yaml")
+        info.size = len(chart_yaml)
+        archive.addfile(info, io.BytesIO(chart_yaml))
+    return path
+
+
+def test_update_index_merges_new_versions_incrementally(tmp_path) -> None:
+    """Existing entries stay untouched while new versions sort newest first."""
+
+    index_file = tmp_path / "index.yaml"
+    first = MODULE.load_package(_archive(tmp_path, "app", "1.0.0"))
+    MODULE.update_index(index_file, [first], MODULE.DEFAULT_URL_TEMPLATE)
+    original = MODULE.load_index(index_file)["entries"]["app"][0]
+
+    packages = [
+        MODULE.load_package(_archive(tmp_path, "app", "1.10.0")),
+        MODULE.load_package(_archive(tmp_path, "app", "1.2.0")),
+        MODULE.load_package(_archive(tmp_path, "other", "0.1.0")),
+    ]
+    MODULE.update_index(
+        index_file,
+        packages,
+        "https://example.test/{name}-{version}/{filename}",
+    )
+
+    index = MODULE.load_index(index_file)
+    entries = index["entries"]["app"]
+    assert [entry["version"] for entry in entries] == [
+        "1.10.0",
+        "1.2.0",
+        "1.0.0",
+    ]
+    assert entries[-1] == original
+    assert entries[0]["digest"] == packages[0].digest
+    assert entries[0]["urls"] == [
+        "https://example.test/app-1.10.0/app-1.10.0.tgz"
+    ]
+    assert index["entries"]["other"][0]["urls"] == [
+        "https://example.test/other-0.1.0/other-0.1.0.tgz"
+    ]
+
+
+def test_merge_packages_rejects_republished_versions(tmp_path) -> None:
+    """Same-digest re-adds are no-ops; different contents are rejected."""
+
+    index = MODULE.load_index(None)
+    package = MODULE.load_package(_archive(tmp_path, "app", "1.0.0"))
+    MODULE.merge_packages(index, [package], MODULE.DEFAULT_URL_TEMPLATE)
+
+    assert (
+        MODULE.merge_packages(index, [package], MODULE.DEFAULT_URL_TEMPLATE)
+        == []
+    )
+
+    changed_dir = tmp_path / "changed"
+    changed_dir.mkdir()
+    changed = MODULE.load_package(
+        _archive(changed_dir, "app", "1.0.0", "description: changed\n")
+    )
+    with pytest.raises(ValueError, match="already published"):
+        MODULE.merge_packages(index, [changed], MODULE.DEFAULT_URL_TEMPLATE)
+
+
+def test_update_index_only_adds_lines(tmp_path) -> None:
+    """Existing key order survives, so the index diff is just the new entry."""
+
+    index_file = tmp_path / "index.yaml"
+    original = (
+        "apiVersion: v1\n"
+        "entries:\n"
+        "  zeta:\n"
+        "  - version: 2.0.0\n"
+        "    name: zeta\n"
+        "    urls:\n"
+        "    - zeta-2.0.0.tgz\n"
+        "    digest: abc\n"
+        "  - version: 1.0.0\n"
+        "    name: zeta\n"
+        "    urls:\n"
+        "    - zeta-1.0.0.tgz\n"
+        "    digest: def\n"
+        "generated: '2020-01-01T00:00:00+00:00'\n"
+    )
+    index_file.write_text(original)
+
+    package = MODULE.load_package(_archive(tmp_path, "zeta", "1.5.0"))
+    MODULE.update_index(index_file, [package], MODULE.DEFAULT_URL_TEMPLATE)
+
+    removed = [
+        line[2:]
+        for line in difflib.ndiff(
+            original.splitlines(), index_file.read_text().splitlines()
+        )
+        if line.startswith("- ")
+    ]
+    assert removed == ["generated: '2020-01-01T00:00:00+00:00'"]
+    versions = [
+        entry["version"]
+        for entry in MODULE.load_index(index_file)["entries"]["zeta"]
+    ]
+    assert versions == ["2.0.0", "1.5.0", "1.0.0"]
+
+
+# Longer than PyYAML's default 80-column width, which must not re-wrap them.
+LONG_DESCRIPTION = (
+    "Provision Amazon OpenSearch Service domains through the ACK controller, "
+    "with optional security bootstrap jobs"
+)
+PAGES = "https://neverendingsupport.github.io/helm-charts"
+HELM_INDEX = f"""\
+apiVersion: v1
+entries:
+  ack-opensearch-provider:
+  - apiVersion: v2
+    created: "2026-03-02T09:14:07.512094781Z"
+    description: {LONG_DESCRIPTION}
+    digest: 4b1e0f0c2d8a8f0b7c3f7e6a5d4c3b2a1f0e9d8c7b6a5f4e3d2c1b0a9f8e7d6c
+    name: ack-opensearch-provider
+    urls:
+    - {PAGES}/ack-opensearch-provider-0.3.0.tgz
+    version: 0.3.0
+  universal-chart:
+  - apiVersion: v2
+    created: "2026-04-11T16:40:55.003117Z"
+    dependencies:
+    - condition: redis.enabled
+      name: redis
+      repository: https://charts.bitnami.com/bitnami
+      version: 20.x.x
+    description: Déploiement générique — one chart for every service
+    digest: 9a8b7c6d5e4f3a2b1c0d9e8f7a6b5c4d3e2f1a0b9c8d7e6f5a4b3c2d1e0f9a8b
+    name: universal-chart
+    urls:
+    - {PAGES}/universal-chart-2.0.0.tgz
+    version: 2.0.0
+  - apiVersion: v2
+    created: "2026-01-20T08:00:00Z"
+    description: Déploiement générique — one chart for every service
+    digest: 0f1e2d3c4b5a69788796a5b4c3d2e1f00f1e2d3c4b5a69788796a5b4c3d2e1f0
+    name: universal-chart
+    urls:
+    - {PAGES}/universal-chart-1.0.0.tgz
+    version: 1.0.0
+generated: "2026-04-11T16:40:55.101462Z"
+"""
+
+
+def test_update_index_keeps_helm_index_bytes(tmp_path) -> None:
+    """Entries written by `helm repo index` stay byte-identical."""
+
+    index_file = tmp_path / "index.yaml"
+    index_file.write_text(HELM_INDEX, encoding="utf-8")
+    packages = [
+        MODULE.load_package(_archive(tmp_path, "universal-chart", "1.5.0")),
+        MODULE.load_package(_archive(tmp_path, "nes-node-web", "0.1.0")),
+    ]
+
+    MODULE.update_index(index_file, packages, MODULE.DEFAULT_URL_TEMPLATE)
+
+    merged = index_file.read_text(encoding="utf-8")
+    removed = [
+        line[2:]
+        for line in difflib.ndiff(HELM_INDEX.splitlines(), merged.splitlines())
+        if line.startswith("- ")
+    ]
+    assert removed == ['generated: "2026-04-11T16:40:55.101462Z"']
+    entries = MODULE.load_index(index_file)["entries"]
+    assert list(entries) == [
+        "ack-opensearch-provider",
+        "nes-node-web",
+        "universal-chart",
+    ]
+    assert [entry["version"] for entry in entries["universal-chart"]] == [
+        "2.0.0",
+        "1.5.0",
+        "1.0.0",
+    ]
+    assert entries["universal-chart"][1]["digest"] == packages[0].digest
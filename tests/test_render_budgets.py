@@ -0,0 +1,190 @@
+"""Render time and output size budgets for every chart fixture."""
+
+from __future__ import annotations
+
+import math
+import re
+import statistics
+import time
+from pathlib import Path
+from typing import Any
+
+import pytest
+import yaml
+
+from .chart_test_utils import FIXTURES_ROOT, ChartContext, render_chart
+
+BUDGETS_FILE = Path(__file__).with_name("render_budgets.yaml")
+
+
+def load_budgets() -> dict[str, Any]:
+    """Return the parsed render budgets file."""
+
+    return yaml.safe_load(BUDGETS_FILE.read_text()) or {}
+
+
+def discover_fixtures() -> list[Path]:
+    """Return every chart fixture values file."""
+
+    return sorted(FIXTURES_ROOT.glob("*/*-values.yaml"))
+
+
+def budget_key(values_file: Path) -> str:
+    """Return the budgets file key for a fixture values file."""
+
+    return f"{values_file.parent.name}/{values_file.name}"
+
+
+def recorded_median_ms(median_ms: float, headroom: float) -> int:
+    """Return the ``median_ms`` budget for a measured median."""
+
+    return math.ceil(median_ms * headroom / 10) * 10
+
+
+def write_median_budgets(text: str, medians_ms: dict[str, int]) -> str:
+    """Return budgets file ``text`` with new ``median_ms`` values.
+
+    Only the ``median_ms`` lines change, so comments, key order and
+    ``max_bytes`` budgets are kept as written.
+    """
+
+    for key, median_ms in medians_ms.items():
+        pattern = re.compile(
+            rf"^(  {re.escape(key)}:\n(?:    .*\n)*?    median_ms: )\d+$",
+            re.MULTILINE,
+        )
+        text, count = pattern.subn(rf"\g<1>{median_ms}", text)
+        if count != 1:
+            raise ValueError(f"{key} has no median_ms budget to record")
+    return text
+
+
+@pytest.fixture(scope="module")
+def recorded_medians(request: pytest.FixtureRequest):
+    """Collect measured medians and write them once every fixture has run."""
+
+    medians_ms: dict[str, int] = {}
+    yield medians_ms
+    if medians_ms:
+        BUDGETS_FILE.write_text(
+            write_median_budgets(BUDGETS_FILE.read_text(), medians_ms)
+        )
+
+
+def check_budget(
+    budget: dict[str, Any],
+    durations_ms: list[float],
+    output_bytes: int,
+    tolerance: float,
+) -> list[str]:
+    """Return budget violations for one fixture's measured renders."""
+
+    failures: list[str] = []
+    median = statistics.median(durations_ms)
+    allowed = budget["median_ms"] * (1 + tolerance)
+    if median > allowed:
+        spread = statistics.pstdev(durations_ms)
+        samples = ", ".join(f"{value:.0f}" for value in sorted(durations_ms))
+        failures.append(
+            f"median render time {median:.0f} ms exceeds the "
+            f"{budget['median_ms']} ms budget (+{tolerance:.0%} tolerance = "
+            f"{allowed:.0f} ms); min {min(durations_ms):.0f} ms, "
+            f"max {max(durations_ms):.0f} ms, stdev {spread:.0f} ms, "
+            f"samples [{samples}]"
+        )
+    if output_bytes > budget["max_bytes"]:
+        failures.append(
+            f"rendered output is {output_bytes} bytes, over the "
+            f"{budget['max_bytes']} byte budget"
+        )
+    return failures
+
+
+def test_every_fixture_has_a_render_budget() -> None:
+    """Budgets should cover exactly the fixtures that exist."""
+
+    budgets = load_budgets()["budgets"]
+    fixtures = {budget_key(values_file) for values_file in discover_fixtures()}
+
+    assert sorted(fixtures - set(budgets)) == [], "fixtures without a budget"
+    assert sorted(set(budgets) - fixtures) == [], "budgets without a fixture"
+
+
+def test_check_budget_reports_measured_distribution() -> None:
+    """Regressions should include enough data to judge measurement noise."""
+
+    budget = {"median_ms": 100, "max_bytes": 1000}
+
+    assert check_budget(budget, [90.0, 120.0, 200.0], 1000, 0.25) == []
+
+    failures = check_budget(budget, [130.0, 140.0, 300.0], 1001, 0.25)
+
+    assert failures == [
+        "median render time 140 ms exceeds the 100 ms budget "
+        "(+25% tolerance = 125 ms); min 130 ms, max 300 ms, stdev 78 ms, "
+        "samples [130, 140, 300]",
+        "rendered output is 1001 bytes, over the 1000 byte budget",
+    ]
+
+
+def test_recorded_budgets_only_change_median_lines() -> None:
+    """Recording keeps comments and size budgets and rounds up with headroom."""
+
+    text = (
+        "# comment\n"
+        "budgets:\n"
+        "  chart/a-values.yaml:\n"
+        "    median_ms: 750\n"
+        "    max_bytes: 4096\n"
+        "  chart/b-values.yaml:\n"
+        "    median_ms: 750\n"
+        "    max_bytes: 2048\n"
+    )
+
+    assert recorded_median_ms(101.0, 1.5) == 160
+    assert write_median_budgets(text, {"chart/b-values.yaml": 160}) == (
+        text.replace(
+            "median_ms: 750\n    max_bytes: 2048",
+            "median_ms: 160\n    max_bytes: 2048",
+        )
+    )
+    with pytest.raises(ValueError, match="chart/c-values.yaml"):
+        write_median_budgets(text, {"chart/c-values.yaml": 160})
+
+
+@pytest.mark.parametrize("values_file", discover_fixtures(), ids=budget_key)
+def test_fixture_renders_within_budget(
+    request: pytest.FixtureRequest,
+    helm_runner,
+    recorded_medians: dict[str, int],
+    values_file: Path,
+) -> None:
+    """Each fixture's median render time and output size stay in budget."""
+
+    record = request.config.getoption("--record-render-budgets")
+    if not (record or request.config.getoption("--render-budgets")):
+        pytest.skip("render budgets are only checked with --render-budgets")
+
+    config = load_budgets()
+    budget = config["budgets"][budget_key(values_file)]
+    runs = request.config.getoption("--render-budget-runs") or config["runs"]
+    chart = ChartContext(values_file.parent.name)
+
+    # Warm up once so dependency builds and disk caches are not measured.
+    render_chart(helm_runner, chart, values_files=[values_file])
+    durations_ms: list[float] = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        rendered = render_chart(helm_runner, chart, values_files=[values_file])
+        durations_ms.append((time.perf_counter() - started) * 1000)
+
+    if record:
+        recorded_medians[budget_key(values_file)] = recorded_median_ms(
+            statistics.median(durations_ms), config["headroom"]
+        )
+        return
+
+    failures = check_budget(
+        budget, durations_ms, len(rendered.encode()), config["tolerance"]
+    )
+    assert not failures, f"{budget_key(values_file)}: " + "; ".join(failures)
@@ -0,0 +1,262 @@
+"""Argo Rollouts workload kind tests for universal-chart."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from .chart_test_utils import render_chart
+from .conftest import HelmTemplateError
+from .universal_chart_metrics_block_test_utils import nginx_ingress_values
+from .universal_chart_test_utils import (
+    CHART,
+    RESOURCE_REQUESTS,
+    render_manifest,
+    render_manifests,
+)
+
+ROLLOUT_REF = {"apiVersion": "argoproj.io/v1alpha1", "kind": "Rollout"}
+HISTOGRAM = {"metric": "http_request_duration_seconds"}
+AVAILABILITY = {
+    "name": "api-availability",
+    "sli": "availability",
+    "objective": 99.9,
+    "metric": "http_requests_total",
+    "errorSelector": 'code=~"5.."',
+}
+
+
+def _rollout_values(**values: Any) -> dict[str, Any]:
+    return {
+        "workloadKind": "Rollout",
+        "preAggregate": {"enabled": True, "histograms": [HISTOGRAM]},
+        "slo": {"enabled": True, "objectives": [AVAILABILITY]},
+        **values,
+    }
+
+
+def _analysis(**analysis: Any) -> dict[str, Any]:
+    return _rollout_values(argoRollout={"analysis": analysis})
+
+
+def test_default_workload_kind_is_a_deployment(helm_runner) -> None:
+    """Existing releases keep their Deployment and render no Argo objects."""
+
+    kinds = {item["kind"] for item in render_manifests(helm_runner)}
+
+    assert "Deployment" in kinds
+    assert not kinds & {"Rollout", "AnalysisTemplate"}
+
+
+def test_rollout_renders_canary_steps_with_analysis(helm_runner) -> None:
+    """Carry rollout settings into the canary strategy."""
+
+    rollout = render_manifest(
+        helm_runner,
+        "Rollout",
+        values=_rollout_values(rollout={"profile": "safe"}),
+    )
+    canary = rollout["spec"]["strategy"]["canary"]
+
+    assert rollout["apiVersion"] == "argoproj.io/v1alpha1"
+    assert canary["maxSurge"] == "25%"
+    assert canary["maxUnavailable"] == 0
+    assert rollout["spec"]["minReadySeconds"] == 10
+    assert canary["analysis"] == {
+        "templates": [{"templateName": CHART.release}],
+        "startingStep": 1,
+    }
+    assert canary["steps"][:2] == [
+        {"setWeight": 10},
+        {"pause": {"duration": "2m"}},
+    ]
+    assert "rollingUpdate" not in rollout["spec"]["strategy"]
+
+
+def test_analysis_template_reads_the_chart_recording_rules(
+    helm_runner,
+) -> None:
+    """Query the p99 and SLO error ratio records for this release."""
+
+    template = render_manifest(
+        helm_runner, "AnalysisTemplate", values=_rollout_values()
+    )
+    metrics = {metric["name"]: metric for metric in template["spec"]["metrics"]}
+    latency = metrics["p99-latency"]
+    errors = metrics["error-rate"]
+
+    assert latency["provider"]["prometheus"]["query"] == (
+        "max(namespace_job:http_request_duration_seconds:p99_rate5m"
+        '{namespace="default", job="universal-chart"})'
+    )
+    assert latency["successCondition"] == (
+        "isNaN(result[0]) || result[0] <= 0.5"
+    )
+    assert errors["provider"]["prometheus"]["query"] == (
+        "max(slo:sli_error:ratio_rate5m"
+        '{namespace="default", slo="api-availability"})'
+    )
+    assert errors["successCondition"] == (
+        "isNaN(result[0]) || result[0] <= 0.01"
+    )
+    assert {metric["failureLimit"] for metric in metrics.values()} == {1}
+
+
+def test_analysis_can_check_latency_alone(helm_runner) -> None:
+    """Skip the error-rate metric without requiring an SLO."""
+
+    values = _analysis(errorRate={"enabled": False})
+    values["slo"] = {"enabled": False}
+    template = render_manifest(helm_runner, "AnalysisTemplate", values=values)
+
+    assert [metric["name"] for metric in template["spec"]["metrics"]] == [
+        "p99-latency"
+    ]
+
+
+def test_scalers_target_the_rollout(helm_runner) -> None:
+    """Point the HPA and VPA at the Rollout and keep the PDB selector."""
+
+    manifests = {
+        item["kind"]: item
+        for item in render_manifests(
+            helm_runner,
+            values=_rollout_values(
+                replicaCount=4,
+                resources=RESOURCE_REQUESTS,
+                autoscaling={
+                    "enabled": True,
+                    "minReplicas": 4,
+                    "targetCPUUtilizationPercentage": 70,
+                },
+                podDisruptionBudget={"enabled": True, "maxUnavailable": 1},
+                verticalAutoscaling={"enabled": True, "updateMode": "Off"},
+            ),
+        )
+    }
+    hpa_ref = manifests["HorizontalPodAutoscaler"]["spec"]["scaleTargetRef"]
+    vpa_ref = manifests["VerticalPodAutoscaler"]["spec"]["targetRef"]
+
+    assert hpa_ref == {**ROLLOUT_REF, "name": CHART.release}
+    assert vpa_ref == {**ROLLOUT_REF, "name": CHART.release}
+    assert manifests["PodDisruptionBudget"]["spec"]["selector"] == (
+        manifests["Rollout"]["spec"]["selector"]
+    )
+
+
+def test_keda_targets_the_rollout(helm_runner) -> None:
+    """KEDA scales the Rollout through its scale subresource."""
+
+    scaled_object = render_manifest(
+        helm_runner,
+        "ScaledObject",
+        values=_rollout_values(
+            resources=RESOURCE_REQUESTS,
+            autoscaling={
+                "keda": {
+                    "enabled": True,
+                    "triggers": [{"type": "cpu", "metadata": {"value": "70"}}],
+                }
+            },
+        ),
+    )
+
+    assert scaled_object["spec"]["scaleTargetRef"] == {
+        **ROLLOUT_REF,
+        "name": CHART.release,
+    }
+
+
+def test_workloads_follow_the_kind_without_analysis(helm_runner) -> None:
+    """Named workloads roll out in steps but are not judged by the API SLO."""
+
+    manifests = render_manifests(
+        helm_runner,
+        values=_rollout_values(
+            workloads={
+                "worker": {"replicaCount": 2},
+                "cron": {"workloadKind": "Deployment"},
+            }
+        ),
+    )
+    by_name = {item["metadata"]["name"]: item for item in manifests}
+    worker = by_name[f"{CHART.release}-worker"]
+
+    assert worker["kind"] == "Rollout"
+    assert "analysis" not in worker["spec"]["strategy"]["canary"]
+    assert by_name[f"{CHART.release}-cron"]["kind"] == "Deployment"
+
+
+@pytest.mark.parametrize(
+    ("values", "message"),
+    [
+        pytest.param(
+            {**_rollout_values(), "preAggregate": {"enabled": False}},
+            "enable preAggregate with a histogram",
+            id="no-latency-record",
+        ),
+        pytest.param(
+            _rollout_values(
+                preAggregate={
+                    "enabled": True,
+                    "histograms": [{**HISTOGRAM, "quantiles": ["0.9"]}],
+                }
+            ),
+            'add "0.99" to its quantiles',
+            id="no-p99-quantile",
+        ),
+        pytest.param(
+            _analysis(errorRate={"slo": "checkout"}),
+            "availability objective named checkout",
+            id="unknown-slo",
+        ),
+        pytest.param(
+            _analysis(latency={"enabled": False}, errorRate={"enabled": False}),
+            "needs latency or errorRate enabled",
+            id="no-metrics",
+        ),
+        pytest.param(
+            {
+                **nginx_ingress_values(),
+                **_rollout_values(),
+                "canary": {"enabled": True, "image": {"tag": "2.0.0"}},
+            },
+            "canary and workloadKind Rollout",
+            id="nginx-canary",
+        ),
+    ],
+)
+def test_rollout_rejects_unusable_analysis(
+    helm_runner,
+    values: dict[str, Any],
+    message: str,
+) -> None:
+    """Refuse analysis that would query records the chart never writes."""
+
+    with pytest.raises(HelmTemplateError, match=message):
+        render_chart(helm_runner, CHART, values=values)
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        pytest.param({"workloadKind": "ReplicaSet"}, id="unknown-kind"),
+        pytest.param(
+            {"argoRollout": {"steps": [{"setWeight": 10, "pause": {}}]}},
+            id="step-with-two-actions",
+        ),
+        pytest.param(
+            {"argoRollout": {"analysis": {"errorRate": {"maxRatio": 5}}}},
+            id="ratio-above-one",
+        ),
+    ],
+)
+def test_rollout_schema_rejects_invalid_values(
+    helm_runner,
+    values: dict[str, Any],
+) -> None:
+    """Reject malformed Rollout values."""
+
+    with pytest.raises(HelmTemplateError):
+        render_chart(helm_runner, CHART, values=values)
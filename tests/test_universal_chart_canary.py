@@ -0,0 +1,191 @@
+"""Canary Deployment and ingress-nginx canary tests for universal-chart."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from .chart_test_utils import render_chart
+from .conftest import HelmTemplateError
+from .universal_chart_metrics_block_test_utils import (
+    ingresses_by_name,
+    nginx_ingress_values,
+)
+from .universal_chart_test_utils import (
+    CHART,
+    manifests_by_kind_and_name,
+    render_manifests,
+)
+
+CANARY = f"{CHART.release}-canary"
+PREFIX = "nginx.ingress.kubernetes.io/"
+
+
+def _canary_values(**canary: Any) -> dict[str, Any]:
+    values = nginx_ingress_values()
+    values["canary"] = {"enabled": True, "image": {"tag": "2.0.0"}, **canary}
+    return values
+
+
+def test_canary_renders_separate_deployment_and_service(helm_runner) -> None:
+    """Run the canary image under its own selector labels."""
+
+    manifests = manifests_by_kind_and_name(
+        render_manifests(helm_runner, values=_canary_values(replicaCount=2))
+    )
+    primary = manifests[("Deployment", CHART.release)]
+    canary = manifests[("Deployment", CANARY)]
+    service = manifests[("Service", CANARY)]
+
+    assert canary["spec"]["replicas"] == 2
+    image = canary["spec"]["template"]["spec"]["containers"][0]["image"]
+    assert image.endswith(":2.0.0")
+    assert service["spec"]["selector"] == (
+        canary["spec"]["selector"]["matchLabels"]
+    )
+    assert service["spec"]["selector"]["app.kubernetes.io/component"] == (
+        "canary"
+    )
+    primary_selector = manifests[("Service", CHART.release)]["spec"]["selector"]
+    assert primary_selector == primary["spec"]["selector"]["matchLabels"]
+    assert primary_selector["app.kubernetes.io/name"] != (
+        service["spec"]["selector"]["app.kubernetes.io/name"]
+    )
+
+
+def test_canary_service_matches_primary_ports(helm_runner) -> None:
+    """Expose the extra Service ports so their traffic reaches the canary."""
+
+    values = _canary_values()
+    values["service"] = {
+        "extraPorts": [{"name": "grpc", "port": 9000, "targetPort": 9001}]
+    }
+    manifests = manifests_by_kind_and_name(
+        render_manifests(helm_runner, values=values)
+    )
+
+    assert (
+        manifests[("Service", CANARY)]["spec"]["ports"]
+        == manifests[("Service", CHART.release)]["spec"]["ports"]
+    )
+
+
+def test_canary_ingress_routes_by_weight_and_header(helm_runner) -> None:
+    """Mirror the primary hosts and paths onto the canary Service."""
+
+    ingresses = ingresses_by_name(
+        render_manifests(
+            helm_runner,
+            values=_canary_values(
+                weight=5, header="X-Canary", headerValue="yes"
+            ),
+        )
+    )
+    canary = ingresses[CANARY]
+
+    assert canary["metadata"]["annotations"] == {
+        f"{PREFIX}canary": "true",
+        f"{PREFIX}canary-weight": "5",
+        f"{PREFIX}canary-by-header": "X-Canary",
+        f"{PREFIX}canary-by-header-value": "yes",
+    }
+    assert canary["spec"]["ingressClassName"] == "nginx"
+    rule = canary["spec"]["rules"][0]
+    assert rule["host"] == "app.example.com"
+    assert [path["path"] for path in rule["http"]["paths"]] == ["/"]
+    assert rule["http"]["paths"][0]["backend"]["service"]["name"] == CANARY
+
+
+def test_canary_keeps_public_metrics_blocked(helm_runner) -> None:
+    """The metrics-block location has no canary, so it stays denied."""
+
+    ingresses = ingresses_by_name(
+        render_manifests(helm_runner, values=_canary_values(header="X-Canary"))
+    )
+    block = ingresses[f"{CHART.release}-metrics-block"]
+    canary_paths = [
+        path["path"]
+        for rule in ingresses[CANARY]["spec"]["rules"]
+        for path in rule["http"]["paths"]
+    ]
+
+    assert [rule["host"] for rule in block["spec"]["rules"]] == [
+        rule["host"] for rule in ingresses[CANARY]["spec"]["rules"]
+    ]
+    assert "/metrics" not in canary_paths
+
+
+def test_canary_metrics_are_scraped(helm_runner) -> None:
+    """Select the canary Service so its latency can be compared."""
+
+    manifests = manifests_by_kind_and_name(
+        render_manifests(helm_runner, values=_canary_values())
+    )
+    selector = manifests[("ServiceMonitor", CHART.release)]["spec"]["selector"]
+
+    assert selector["matchLabels"] == {
+        "app.kubernetes.io/instance": CHART.release
+    }
+    assert selector["matchExpressions"] == [
+        {
+            "key": "app.kubernetes.io/name",
+            "operator": "In",
+            "values": ["universal-chart", "universal-chart-canary"],
+        }
+    ]
+
+
+@pytest.mark.parametrize(
+    ("values", "message"),
+    [
+        pytest.param(
+            {**_canary_values(), "ingress": {"enabled": False}},
+            "enable ingress",
+            id="ingress-disabled",
+        ),
+        pytest.param(
+            _canary_values(image={}),
+            "must select a different image",
+            id="same-image",
+        ),
+        pytest.param(
+            _canary_values(image={"digest": f"sha256:{'a' * 64}"}),
+            "exactly one of tag or digest",
+            id="inherited-tag-with-digest",
+        ),
+        pytest.param(
+            _canary_values(headerValue="yes"),
+            "canary.headerValue requires canary.header",
+            id="header-value-without-header",
+        ),
+        pytest.param(
+            {
+                **_canary_values(),
+                "workloads": {"canary": {"replicaCount": 1}},
+            },
+            "same names",
+            id="workload-name-clash",
+        ),
+    ],
+)
+def test_canary_rejects_unsafe_configuration(
+    helm_runner,
+    values: dict[str, Any],
+    message: str,
+) -> None:
+    """Refuse canaries that could not be routed or would collide."""
+
+    with pytest.raises(HelmTemplateError, match=message):
+        render_chart(helm_runner, CHART, values=values)
+
+
+def test_canary_requires_an_nginx_ingress_class(helm_runner) -> None:
+    """Canary annotations only work on ingress-nginx."""
+
+    values = _canary_values()
+    values["ingress"]["className"] = "alb"
+    values["serviceMonitor"]["enabled"] = False
+
+    with pytest.raises(HelmTemplateError, match='ingress class "alb"'):
+        render_chart(helm_runner, CHART, values=values)
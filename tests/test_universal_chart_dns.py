@@ -0,0 +1,181 @@
+"""Pod DNS configuration tests for universal-chart."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from .chart_test_utils import render_chart
+from .conftest import HelmTemplateError
+from .universal_chart_test_utils import (
+    CHART,
+    render_manifests,
+    render_pod_spec,
+    render_pod_specs,
+)
+
+NODE_LOCAL = "169.254.20.10"
+AWS_OPTIONS = [
+    {"name": "ndots", "value": "2"},
+    {"name": "single-request-reopen"},
+    {"name": "timeout", "value": "2"},
+    {"name": "attempts", "value": "3"},
+]
+
+
+def test_default_pods_keep_the_cluster_resolver(helm_runner) -> None:
+    """Existing releases render no DNS settings."""
+
+    pod = render_pod_spec(helm_runner)
+
+    assert "dnsPolicy" not in pod
+    assert "dnsConfig" not in pod
+
+
+def test_aws_preset_lowers_ndots(helm_runner) -> None:
+    """Look up external names as given, and apply it to jobs too."""
+
+    pods = render_pod_specs(
+        helm_runner,
+        values={
+            "dns": {"preset": "aws"},
+            "jobs": {"warm": {"command": ["warm"]}},
+        },
+    )
+
+    assert "dnsPolicy" not in pods["Deployment"]
+    assert pods["Deployment"]["dnsConfig"] == {"options": AWS_OPTIONS}
+    assert pods["Job"]["dnsConfig"] == pods["Deployment"]["dnsConfig"]
+
+
+@pytest.mark.parametrize(
+    ("dns", "options"),
+    [
+        pytest.param(
+            {"preset": "aws", "ndots": 3},
+            [{"name": "ndots", "value": "3"}, *AWS_OPTIONS[1:]],
+            id="explicit-ndots",
+        ),
+        pytest.param(
+            {
+                "preset": "aws",
+                "options": [
+                    {"name": "timeout", "value": "1"},
+                    {"name": "rotate"},
+                ],
+            },
+            [
+                AWS_OPTIONS[0],
+                AWS_OPTIONS[1],
+                AWS_OPTIONS[3],
+                {"name": "timeout", "value": "1"},
+                {"name": "rotate"},
+            ],
+            id="explicit-option",
+        ),
+        pytest.param(
+            {"ndots": 1},
+            [{"name": "ndots", "value": "1"}],
+            id="without-preset",
+        ),
+    ],
+)
+def test_explicit_settings_override_the_preset(
+    helm_runner,
+    dns: dict[str, Any],
+    options: list[dict[str, str]],
+) -> None:
+    """Keep one entry per option, preferring the explicit one."""
+
+    pod = render_pod_spec(helm_runner, values={"dns": dns})
+
+    assert pod["dnsConfig"]["options"] == options
+
+
+def test_nameservers_bypass_the_cluster_resolver(helm_runner) -> None:
+    """Query a node-local cache with the cluster search domains."""
+
+    pods = {
+        item["metadata"]["name"]: item["spec"]["template"]["spec"]
+        for item in render_manifests(
+            helm_runner,
+            values={
+                "dns": {"nameservers": [NODE_LOCAL]},
+                "workloads": {"worker": {"dns": {"nameservers": []}}},
+            },
+        )
+        if item["kind"] == "Deployment"
+    }
+    pod = pods[CHART.release]
+
+    assert pod["dnsPolicy"] == "None"
+    assert pod["dnsConfig"] == {
+        "nameservers": [NODE_LOCAL],
+        "searches": [
+            "default.svc.cluster.local",
+            "svc.cluster.local",
+            "cluster.local",
+        ],
+    }
+    assert "dnsPolicy" not in pods[f"{CHART.release}-worker"]
+
+
+def test_explicit_policy_appends_nameservers(helm_runner) -> None:
+    """Keep the cluster resolver under ClusterFirst and add the nameservers."""
+
+    pod = render_pod_spec(
+        helm_runner,
+        values={"dns": {"policy": "ClusterFirst", "nameservers": [NODE_LOCAL]}},
+    )
+
+    assert pod["dnsPolicy"] == "ClusterFirst"
+    assert pod["dnsConfig"] == {"nameservers": [NODE_LOCAL]}
+
+
+@pytest.mark.parametrize(
+    ("dns", "message"),
+    [
+        pytest.param(
+            {"policy": "None"},
+            "dns.policy None leaves the pod without a resolver",
+            id="none-without-nameservers",
+        ),
+        pytest.param(
+            {"options": [{"name": "ndots", "value": "2"}]},
+            "set dns.ndots instead",
+            id="ndots-option",
+        ),
+    ],
+)
+def test_dns_rejects_invalid_settings(
+    helm_runner,
+    dns: dict[str, Any],
+    message: str,
+) -> None:
+    """Refuse a resolver configuration that cannot work as written."""
+
+    with pytest.raises(HelmTemplateError, match=message):
+        render_chart(helm_runner, CHART, values={"dns": dns})
+
+
+@pytest.mark.parametrize(
+    "dns",
+    [
+        pytest.param({"preset": "gcp"}, id="unknown-preset"),
+        pytest.param({"ndots": 16}, id="ndots-above-limit"),
+        pytest.param({"nameservers": [""]}, id="empty-nameserver"),
+        pytest.param(
+            {"options": [{"name": "timeout", "value": 2}]},
+            id="numeric-option-value",
+        ),
+    ],
+)
+def test_dns_schema_rejects_invalid_values(
+    helm_runner,
+    dns: dict[str, Any],
+) -> None:
+    """Reject malformed DNS values."""
+
+    with pytest.raises(HelmTemplateError):
+        render_chart(helm_runner, CHART, values={"dns": dns})
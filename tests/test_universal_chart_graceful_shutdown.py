@@ -0,0 +1,135 @@
+"""Graceful shutdown tests for universal-chart."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from .chart_test_utils import render_chart
+from .conftest import HelmTemplateError
+from .universal_chart_test_utils import CHART, render_pod_spec
+
+
+def test_graceful_shutdown_is_one_switch(helm_runner) -> None:
+    """Enable the preStop sleep and size the grace period from defaults."""
+
+    pod = render_pod_spec(
+        helm_runner, values={"gracefulShutdown": {"enabled": True}}
+    )
+
+    assert pod["terminationGracePeriodSeconds"] == 45
+    assert pod["containers"][0]["lifecycle"] == {
+        "preStop": {"sleep": {"seconds": 15}}
+    }
+
+
+def test_graceful_shutdown_exec_action_and_explicit_grace_period(
+    helm_runner,
+) -> None:
+    """Keep an explicit grace period that covers the shutdown sequence."""
+
+    pod = render_pod_spec(
+        helm_runner,
+        values={
+            "terminationGracePeriodSeconds": 120,
+            "gracefulShutdown": {
+                "enabled": True,
+                "preStopSeconds": 5,
+                "drainSeconds": 60,
+                "preStopAction": "exec",
+            },
+        },
+    )
+
+    assert pod["terminationGracePeriodSeconds"] == 120
+    assert pod["containers"][0]["lifecycle"] == {
+        "preStop": {"exec": {"command": ["sleep", "5"]}}
+    }
+
+
+def test_graceful_shutdown_without_pre_stop_only_sizes_grace_period(
+    helm_runner,
+) -> None:
+    """A zero preStop delay skips the hook but still reserves drain time."""
+
+    pod = render_pod_spec(
+        helm_runner,
+        values={
+            "gracefulShutdown": {
+                "enabled": True,
+                "preStopSeconds": 0,
+                "drainSeconds": 20,
+            }
+        },
+    )
+
+    assert pod["terminationGracePeriodSeconds"] == 20
+    assert "lifecycle" not in pod["containers"][0]
+
+
+def test_graceful_shutdown_disabled_renders_nothing(helm_runner) -> None:
+    """Leave the pod spec unchanged by default."""
+
+    pod = render_pod_spec(helm_runner)
+
+    assert "terminationGracePeriodSeconds" not in pod
+    assert "lifecycle" not in pod["containers"][0]
+
+
+@pytest.mark.parametrize(
+    ("values", "message"),
+    [
+        pytest.param(
+            {
+                "terminationGracePeriodSeconds": 30,
+                "gracefulShutdown": {"enabled": True},
+            },
+            "raise it to at least 45",
+            id="grace-period-too-short",
+        ),
+        pytest.param(
+            {
+                "gracefulShutdown": {
+                    "enabled": True,
+                    "preStopSeconds": 300,
+                    "drainSeconds": 700,
+                }
+            },
+            "above the 900 second",
+            id="shutdown-exceeds-grace-period-limit",
+        ),
+        pytest.param(
+            {
+                "gracefulShutdown": {"enabled": True},
+                "extraContainerProps": {
+                    "lifecycle": {"preStop": {"sleep": {"seconds": 5}}}
+                },
+            },
+            "remove lifecycle from extraContainerProps",
+            id="duplicate-lifecycle",
+        ),
+    ],
+)
+def test_graceful_shutdown_rejects_conflicting_settings(
+    helm_runner,
+    values: dict[str, Any],
+    message: str,
+) -> None:
+    """Refuse grace periods that would kill the pod mid-drain."""
+
+    with pytest.raises(HelmTemplateError, match=message):
+        render_chart(helm_runner, CHART, values=values)
+
+
+def test_graceful_shutdown_schema_rejects_unknown_action(helm_runner) -> None:
+    """Only the sleep and exec preStop actions are supported."""
+
+    with pytest.raises(HelmTemplateError):
+        render_chart(
+            helm_runner,
+            CHART,
+            values={
+                "gracefulShutdown": {"enabled": True, "preStopAction": "http"}
+            },
+        )
@@ -10,6 +10,7 @@ from .chart_test_utils import get_manifest, render_chart
 from .conftest import HelmTemplateError
 from .universal_chart_test_utils import (
     CHART,
+    RESOURCE_REQUESTS,
     render_manifest,
     render_manifests,
 )
@@ -101,6 +102,7 @@ def test_hpa_scaling_rule_supports_value_target(helm_runner) -> None:
         helm_runner,
         "HorizontalPodAutoscaler",
         values={
+            "resources": RESOURCE_REQUESTS,
             "autoscaling": {
                 "enabled": True,
                 "targetCPUUtilizationPercentage": None,
@@ -111,7 +113,7 @@ def test_hpa_scaling_rule_supports_value_target(helm_runner) -> None:
                         "target": {"type": "Value", "value": "500"},
                     }
                 ],
-            }
+            },
         },
     )
 
@@ -129,10 +131,11 @@ def test_hpa_annotations_render_when_enabled(helm_runner) -> None:
         helm_runner,
         "HorizontalPodAutoscaler",
         values={
+            "resources": RESOURCE_REQUESTS,
             "autoscaling": {
                 "enabled": True,
                 "annotations": {"argocd.argoproj.io/sync-wave": "10"},
-            }
+            },
         },
     )
 
@@ -141,6 +144,126 @@ def test_hpa_annotations_render_when_enabled(helm_runner) -> None:
     }
 
 
+def test_hpa_behavior_preset_merges_explicit_behavior(helm_runner) -> None:
+    """Expand a named preset and let explicit fields override it."""
+
+    hpa = render_manifest(
+        helm_runner,
+        "HorizontalPodAutoscaler",
+        values={
+            "resources": RESOURCE_REQUESTS,
+            "autoscaling": {
+                "enabled": True,
+                "behaviorPreset": "burst",
+                "behavior": {
+                    "scaleDown": {"stabilizationWindowSeconds": 300},
+                },
+            },
+        },
+    )
+
+    behavior = hpa["spec"]["behavior"]
+    assert behavior["scaleUp"] == {
+        "stabilizationWindowSeconds": 0,
+        "selectPolicy": "Max",
+        "policies": [
+            {"type": "Percent", "value": 100, "periodSeconds": 15},
+            {"type": "Pods", "value": 4, "periodSeconds": 15},
+        ],
+    }
+    assert behavior["scaleDown"] == {
+        "stabilizationWindowSeconds": 300,
+        "selectPolicy": "Min",
+        "policies": [{"type": "Percent", "value": 10, "periodSeconds": 60}],
+    }
+
+
+@pytest.mark.parametrize("preset", ["burst", "steady", "batch"])
+def test_hpa_behavior_presets_define_both_directions(
+    helm_runner,
+    preset: str,
+) -> None:
+    """Every preset configures both scale-up and scale-down."""
+
+    hpa = render_manifest(
+        helm_runner,
+        "HorizontalPodAutoscaler",
+        values={
+            "resources": RESOURCE_REQUESTS,
+            "autoscaling": {"enabled": True, "behaviorPreset": preset},
+        },
+    )
+
+    assert set(hpa["spec"]["behavior"]) == {"scaleUp", "scaleDown"}
+
+
+def test_hpa_container_resource_and_additional_metrics(helm_runner) -> None:
+    """Measure the application container and append custom metrics."""
+
+    pods_metric = {
+        "type": "Pods",
+        "pods": {
+            "metric": {"name": "http_requests_per_second"},
+            "target": {"type": "AverageValue", "averageValue": "50"},
+        },
+    }
+    hpa = render_manifest(
+        helm_runner,
+        "HorizontalPodAutoscaler",
+        values={
+            "resources": RESOURCE_REQUESTS,
+            "autoscaling": {
+                "enabled": True,
+                "containerResource": True,
+                "targetCPUUtilizationPercentage": 70,
+                "metrics": [pods_metric],
+            },
+        },
+    )
+
+    assert hpa["spec"]["metrics"] == [
+        {
+            "type": "ContainerResource",
+            "containerResource": {
+                "name": "cpu",
+                "container": "universal-chart",
+                "target": {"type": "Utilization", "averageUtilization": 70},
+            },
+        },
+        pods_metric,
+    ]
+
+
+def test_hpa_renders_with_only_additional_metrics(helm_runner) -> None:
+    """Object metrics alone are enough to create the HPA."""
+
+    object_metric = {
+        "type": "Object",
+        "object": {
+            "describedObject": {
+                "apiVersion": "networking.k8s.io/v1",
+                "kind": "Ingress",
+                "name": "main-route",
+            },
+            "metric": {"name": "requests_per_second"},
+            "target": {"type": "Value", "value": "2k"},
+        },
+    }
+    hpa = render_manifest(
+        helm_runner,
+        "HorizontalPodAutoscaler",
+        values={
+            "autoscaling": {
+                "enabled": True,
+                "targetCPUUtilizationPercentage": None,
+                "metrics": [object_metric],
+            }
+        },
+    )
+
+    assert hpa["spec"]["metrics"] == [object_metric]
+
+
 @pytest.mark.parametrize(
     "values",
     [
@@ -207,6 +330,19 @@ def test_hpa_annotations_render_when_enabled(helm_runner) -> None:
             },
             id="invalid-target-type",
         ),
+        pytest.param(
+            {"autoscaling": {"enabled": True, "behaviorPreset": "fast"}},
+            id="unknown-behavior-preset",
+        ),
+        pytest.param(
+            {
+                "autoscaling": {
+                    "enabled": True,
+                    "metrics": [{"type": "External", "external": {}}],
+                }
+            },
+            id="unsupported-additional-metric-type",
+        ),
     ],
 )
 def test_hpa_schema_rejects_invalid_values(
@@ -168,3 +168,39 @@ def test_image_rejects_tag_and_digest(
                 }
             },
         )
+
+
+@pytest.mark.parametrize(
+    ("image", "policy"),
+    [
+        pytest.param({"tag": "1.2.3"}, "Always", id="tag"),
+        pytest.param(
+            {"tag": None, "digest": DIGEST}, "IfNotPresent", id="digest"
+        ),
+        pytest.param(
+            {"tag": f"release-2026.07@{DIGEST}"},
+            "IfNotPresent",
+            id="legacy-tag-and-digest",
+        ),
+        pytest.param(
+            {"tag": None, "digest": DIGEST, "pullPolicy": "Always"},
+            "Always",
+            id="explicit-policy",
+        ),
+    ],
+)
+def test_image_pull_policy_follows_the_reference(
+    helm_runner,
+    image: dict[str, object],
+    policy: str,
+) -> None:
+    """Skip the registry for immutable digests unless a policy is set."""
+
+    container = get_primary_container(
+        render_manifests(
+            helm_runner,
+            values={"image": {"repository": "ghcr.io/example/app", **image}},
+        )
+    )
+
+    assert container["imagePullPolicy"] == policy
@@ -0,0 +1,174 @@
+"""Typed ingress-nginx annotation tests for universal-chart."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from .chart_test_utils import render_chart
+from .conftest import HelmTemplateError
+from .universal_chart_metrics_block_test_utils import (
+    ingresses_by_name,
+    nginx_ingress_values,
+)
+from .universal_chart_test_utils import (
+    CHART,
+    render_ingress_annotations,
+    render_manifests,
+)
+
+PREFIX = "nginx.ingress.kubernetes.io/"
+
+
+@pytest.mark.parametrize(
+    ("preset", "expected"),
+    [
+        pytest.param(
+            "streaming",
+            {
+                "proxy-buffering": "off",
+                "proxy-request-buffering": "off",
+                "proxy-http-version": "1.1",
+                "proxy-read-timeout": "3600",
+                "proxy-send-timeout": "3600",
+            },
+            id="streaming",
+        ),
+        pytest.param(
+            "api",
+            {
+                "proxy-buffering": "on",
+                "proxy-buffer-size": "16k",
+                "proxy-buffers-number": "4",
+                "proxy-body-size": "1m",
+                "proxy-connect-timeout": "5",
+                "proxy-read-timeout": "60",
+                "proxy-send-timeout": "60",
+            },
+            id="api",
+        ),
+        pytest.param(
+            "upload",
+            {
+                "proxy-body-size": "100m",
+                "proxy-request-buffering": "off",
+                "proxy-read-timeout": "300",
+                "proxy-send-timeout": "300",
+            },
+            id="upload",
+        ),
+    ],
+)
+def test_ingress_nginx_presets(
+    helm_runner,
+    preset: str,
+    expected: dict[str, str],
+) -> None:
+    """Render each preset as string-valued nginx annotations."""
+
+    annotations = render_ingress_annotations(
+        helm_runner, values=nginx_ingress_values(nginx={"preset": preset})
+    )
+
+    assert annotations == {
+        f"{PREFIX}{name}": value for name, value in expected.items()
+    }
+
+
+def test_ingress_nginx_fields_override_preset(helm_runner) -> None:
+    """Merge explicit fields over the preset and keep free-form annotations."""
+
+    annotations = render_ingress_annotations(
+        helm_runner,
+        values=nginx_ingress_values(
+            nginx={
+                "preset": "upload",
+                "proxyBodySize": "1g",
+                "upstreamHashBy": "$request_uri",
+                "limitConnections": 10,
+                "limitBurstMultiplier": 2,
+            },
+            annotations={"cert-manager.io/cluster-issuer": "letsencrypt"},
+        ),
+    )
+
+    assert annotations["cert-manager.io/cluster-issuer"] == "letsencrypt"
+    assert annotations[f"{PREFIX}proxy-body-size"] == "1g"
+    assert annotations[f"{PREFIX}proxy-read-timeout"] == "300"
+    assert annotations[f"{PREFIX}upstream-hash-by"] == "$request_uri"
+    assert annotations[f"{PREFIX}limit-connections"] == "10"
+    assert annotations[f"{PREFIX}limit-burst-multiplier"] == "2"
+
+
+def test_ingress_nginx_keeps_metrics_block_ingress(helm_runner) -> None:
+    """Typed annotations do not change the generated metrics block."""
+
+    values = nginx_ingress_values(nginx={"preset": "streaming"})
+    ingresses = ingresses_by_name(render_manifests(helm_runner, values=values))
+
+    block = ingresses[f"{CHART.release}-metrics-block"]
+    assert block["metadata"]["annotations"] == {
+        f"{PREFIX}denylist-source-range": "0.0.0.0/0,::/0"
+    }
+
+
+@pytest.mark.parametrize(
+    ("values", "message"),
+    [
+        pytest.param(
+            nginx_ingress_values(
+                annotations={f"{PREFIX}proxy-body-size": "5m"},
+                nginx={"preset": "api"},
+            ),
+            "ingress.nginx.proxyBodySize also renders",
+            id="duplicate-annotation",
+        ),
+        pytest.param(
+            nginx_ingress_values(class_name="alb", nginx={"preset": "api"}),
+            'ingress class "alb" is not listed',
+            id="non-nginx-class",
+        ),
+    ],
+)
+def test_ingress_nginx_rejects_conflicts(
+    helm_runner,
+    values: dict[str, Any],
+    message: str,
+) -> None:
+    """Refuse typed settings that would be ignored or silently overridden."""
+
+    values["serviceMonitor"]["enabled"] = False
+    with pytest.raises(HelmTemplateError, match=message):
+        render_chart(helm_runner, CHART, values=values)
+
+
+def test_ingress_nginx_burst_requires_a_limit(helm_runner) -> None:
+    """A burst multiplier without a rate or connection limit does nothing."""
+
+    values = nginx_ingress_values(nginx={"limitBurstMultiplier": 5})
+
+    with pytest.raises(HelmTemplateError, match="requires limitRps"):
+        render_chart(helm_runner, CHART, values=values)
+
+
+@pytest.mark.parametrize(
+    "nginx",
+    [
+        pytest.param({"preset": "websocket"}, id="unknown-preset"),
+        pytest.param({"proxyBufferSize": "16 KB"}, id="malformed-size"),
+        pytest.param({"proxyConnectTimeout": 120}, id="connect-over-75s"),
+        pytest.param({"proxyBuffering": "off"}, id="buffering-not-boolean"),
+        pytest.param({"proxyBufering": True}, id="misspelled-field"),
+    ],
+)
+def test_ingress_nginx_schema_rejects_invalid_values(
+    helm_runner,
+    nginx: dict[str, Any],
+) -> None:
+    """Catch the typos free-form annotations let through."""
+
+    values = nginx_ingress_values(nginx=nginx)
+
+    with pytest.raises(HelmTemplateError):
+        render_chart(helm_runner, CHART, values=values)
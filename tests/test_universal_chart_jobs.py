@@ -0,0 +1,262 @@
+"""Job and CronJob tests for universal-chart."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from .chart_test_utils import render_chart
+from .conftest import HelmTemplateError
+from .universal_chart_test_utils import CHART, render_manifest, render_manifests
+
+REINDEX = {
+    "schedule": "0 3 * * *",
+    "command": ["bin/reindex"],
+    "parallelism": 4,
+    "completions": 16,
+    "completionMode": "Indexed",
+    "backoffLimitPerIndex": 2,
+    "maxFailedIndexes": 3,
+    "ttlSecondsAfterFinished": 86400,
+}
+WARM = {"command": ["bin/warm-cache"]}
+HOOK = "argocd.argoproj.io/hook"
+
+
+def _job(helm_runner, job: dict[str, Any], **values: Any) -> dict[str, Any]:
+    return render_manifest(
+        helm_runner, "Job", values={"jobs": {"warm": job}, **values}
+    )
+
+
+def test_cronjob_fans_out_indexed_pods(helm_runner) -> None:
+    """Carry the parallelism settings into the CronJob's job template."""
+
+    manifests = {
+        item["kind"]: item
+        for item in render_manifests(
+            helm_runner,
+            values={
+                "extraEnvVars": {"APP_ENV": "production"},
+                "extraEnvSecrets": ["app-secrets"],
+                "jobs": {"reindex": REINDEX},
+            },
+        )
+    }
+    cronjob = manifests["CronJob"]
+    spec = cronjob["spec"]["jobTemplate"]["spec"]
+    pod = spec["template"]["spec"]
+    container = pod["containers"][0]
+    app = manifests["Deployment"]["spec"]["template"]["spec"]["containers"][0]
+
+    assert cronjob["metadata"]["name"] == f"{CHART.release}-reindex"
+    assert cronjob["spec"]["schedule"] == "0 3 * * *"
+    assert cronjob["spec"]["concurrencyPolicy"] == "Forbid"
+    assert {key: spec[key] for key in REINDEX if key in spec} == {
+        key: value
+        for key, value in REINDEX.items()
+        if key not in {"schedule", "command"}
+    }
+    assert pod["restartPolicy"] == "Never"
+    assert container["name"] == "reindex"
+    assert container["command"] == ["bin/reindex"]
+    assert container["image"] == app["image"]
+    assert container["env"] == app["env"]
+    assert container["envFrom"] == [{"secretRef": {"name": "app-secrets"}}]
+
+
+def test_job_pods_are_not_selected_by_the_service(helm_runner) -> None:
+    """Batch pods carry their own name so they never receive traffic."""
+
+    manifests = {
+        item["kind"]: item
+        for item in render_manifests(
+            helm_runner, values={"jobs": {"warm": WARM}}
+        )
+    }
+    labels = manifests["Job"]["spec"]["template"]["metadata"]["labels"]
+    selector = manifests["Service"]["spec"]["selector"]
+
+    assert labels["app.kubernetes.io/component"] == "warm"
+    assert not selector.items() <= labels.items()
+
+
+@pytest.mark.parametrize(
+    ("job", "annotations"),
+    [
+        pytest.param(
+            WARM,
+            {
+                HOOK: "PostSync",
+                f"{HOOK}-delete-policy": "BeforeHookCreation",
+            },
+            id="post-sync-by-default",
+        ),
+        pytest.param(
+            {
+                **WARM,
+                "hook": "PreSync",
+                "annotations": {f"{HOOK}-delete-policy": "HookSucceeded"},
+            },
+            {HOOK: "PreSync", f"{HOOK}-delete-policy": "HookSucceeded"},
+            id="explicit-hook-and-policy",
+        ),
+        pytest.param({**WARM, "hook": None}, None, id="plain-job"),
+    ],
+)
+def test_one_shot_jobs_run_as_sync_hooks(
+    helm_runner,
+    job: dict[str, Any],
+    annotations: dict[str, str] | None,
+) -> None:
+    """Replace the immutable Job on every Argo CD sync unless told not to."""
+
+    rendered = _job(helm_runner, job)
+
+    assert rendered["metadata"].get("annotations") == annotations
+
+
+def test_job_resources_default_to_the_application(helm_runner) -> None:
+    """Use the application's preset unless the job sets its own."""
+
+    inherited = _job(helm_runner, WARM, resourcesPreset="nano")
+    own = _job(
+        helm_runner,
+        {**WARM, "resources": {"requests": {"cpu": "2"}}},
+        resourcesPreset="nano",
+    )
+
+    def resources(job: dict[str, Any]) -> dict[str, Any]:
+        return job["spec"]["template"]["spec"]["containers"][0]["resources"]
+
+    assert resources(inherited)["requests"] == {
+        "cpu": "100m",
+        "memory": "128Mi",
+    }
+    assert resources(own) == {"requests": {"cpu": "2"}}
+
+
+def test_guaranteed_qos_pins_job_resources(helm_runner) -> None:
+    """Raise a job's own requests to its limits like every other container."""
+
+    job = _job(
+        helm_runner,
+        {**WARM, "resources": {"limits": {"cpu": "1", "memory": "1Gi"}}},
+        qos="guaranteed",
+        resources={"limits": {"cpu": "2", "memory": "2Gi"}},
+    )
+    resources = job["spec"]["template"]["spec"]["containers"][0]["resources"]
+
+    assert resources["limits"] == {"cpu": "1", "memory": "1Gi"}
+    assert resources["requests"] == resources["limits"]
+
+
+def test_disabled_jobs_are_skipped(helm_runner) -> None:
+    """An entry with enabled false renders nothing."""
+
+    manifests = render_manifests(
+        helm_runner, values={"jobs": {"warm": {**WARM, "enabled": False}}}
+    )
+
+    assert not {"Job", "CronJob"} & {item["kind"] for item in manifests}
+
+
+@pytest.mark.parametrize(
+    ("values", "message"),
+    [
+        pytest.param(
+            {"jobs": {"warm": {**WARM, "backoffLimitPerIndex": 1}}},
+            "backoffLimitPerIndex requires completionMode Indexed",
+            id="per-index-without-indexed",
+        ),
+        pytest.param(
+            {
+                "qos": "guaranteed",
+                "resources": {"limits": {"cpu": "2", "memory": "2Gi"}},
+                "jobs": {
+                    "warm": {
+                        **WARM,
+                        "resources": {"limits": {"cpu": "500m"}},
+                    }
+                },
+            },
+            r"memory limit or request in jobs.warm.resources",
+            id="guaranteed-job-without-memory",
+        ),
+        pytest.param(
+            {"jobs": {"reindex": {**REINDEX, "restartPolicy": "OnFailure"}}},
+            "backoffLimitPerIndex requires restartPolicy Never",
+            id="per-index-with-on-failure",
+        ),
+        pytest.param(
+            {
+                "jobs": {
+                    "reindex": {
+                        key: value
+                        for key, value in REINDEX.items()
+                        if key != "backoffLimitPerIndex"
+                    }
+                }
+            },
+            "maxFailedIndexes requires backoffLimitPerIndex",
+            id="max-failed-without-per-index",
+        ),
+        pytest.param(
+            {"jobs": {"warm": {**WARM, "completionMode": "Indexed"}}},
+            r"set jobs.warm.completions",
+            id="indexed-without-completions",
+        ),
+        pytest.param(
+            {"jobs": {"warm": {**WARM, "concurrencyPolicy": "Allow"}}},
+            "concurrencyPolicy applies to CronJobs only",
+            id="cron-setting-on-job",
+        ),
+        pytest.param(
+            {"jobs": {"reindex": {**REINDEX, "hook": "PostSync"}}},
+            "hook applies to one-shot Jobs",
+            id="hook-on-cronjob",
+        ),
+        pytest.param(
+            {
+                "jobs": {"worker": WARM},
+                "workloads": {"worker": {"replicaCount": 1}},
+            },
+            "same names",
+            id="workload-name-clash",
+        ),
+        pytest.param(
+            {"jobs": {"Warm_Cache": WARM}},
+            "must be a lowercase DNS label",
+            id="invalid-key",
+        ),
+    ],
+)
+def test_jobs_reject_invalid_combinations(
+    helm_runner,
+    values: dict[str, Any],
+    message: str,
+) -> None:
+    """Refuse settings the Job controller would reject or ignore."""
+
+    with pytest.raises(HelmTemplateError, match=message):
+        render_chart(helm_runner, CHART, values=values)
+
+
+@pytest.mark.parametrize(
+    "job",
+    [
+        pytest.param({**WARM, "concurrencyPolicy": "Never"}, id="policy"),
+        pytest.param({**WARM, "completions": 0}, id="zero-completions"),
+        pytest.param({**WARM, "replicaCount": 2}, id="unknown-field"),
+        pytest.param({**WARM, "hook": "PostDelete"}, id="unknown-hook"),
+    ],
+)
+def test_jobs_schema_rejects_invalid_values(
+    helm_runner,
+    job: dict[str, Any],
+) -> None:
+    """Reject malformed job entries."""
+
+    with pytest.raises(HelmTemplateError):
+        render_chart(helm_runner, CHART, values={"jobs": {"warm": job}})
@@ -0,0 +1,229 @@
+"""KEDA ScaledObject tests for universal-chart."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from .chart_test_utils import render_chart
+from .conftest import HelmTemplateError
+from .universal_chart_test_utils import (
+    CHART,
+    RESOURCE_REQUESTS,
+    render_manifest,
+    render_manifests,
+)
+
+SQS_TRIGGER = {
+    "type": "aws-sqs-queue",
+    "metadata": {"queueURL": "https://sqs.example/jobs", "queueLength": "5"},
+}
+
+
+def test_keda_renders_scaled_object_instead_of_hpa(helm_runner) -> None:
+    """Target the Deployment and leave its replica count to KEDA."""
+
+    manifests = render_manifests(
+        helm_runner,
+        values={
+            "autoscaling": {
+                "keda": {
+                    "enabled": True,
+                    "minReplicaCount": 0,
+                    "maxReplicaCount": 20,
+                    "idleReplicaCount": None,
+                    "pollingInterval": 15,
+                    "cooldownPeriod": 120,
+                    "fallback": {"failureThreshold": 3, "replicas": 4},
+                    "annotations": {"argocd.argoproj.io/sync-wave": "10"},
+                    "triggers": [SQS_TRIGGER],
+                }
+            }
+        },
+    )
+    kinds = [manifest["kind"] for manifest in manifests]
+    scaled_object = next(m for m in manifests if m["kind"] == "ScaledObject")
+    deployment = next(m for m in manifests if m["kind"] == "Deployment")
+
+    assert "HorizontalPodAutoscaler" not in kinds
+    assert "replicas" not in deployment["spec"]
+    assert scaled_object["apiVersion"] == "keda.sh/v1alpha1"
+    assert scaled_object["metadata"]["annotations"] == {
+        "argocd.argoproj.io/sync-wave": "10"
+    }
+    assert scaled_object["spec"] == {
+        "scaleTargetRef": {
+            "apiVersion": "apps/v1",
+            "kind": "Deployment",
+            "name": "universal-chart",
+        },
+        "pollingInterval": 15,
+        "cooldownPeriod": 120,
+        "minReplicaCount": 0,
+        "maxReplicaCount": 20,
+        "fallback": {"failureThreshold": 3, "replicas": 4},
+        "triggers": [SQS_TRIGGER],
+    }
+
+
+def test_keda_advanced_settings_configure_the_generated_hpa(
+    helm_runner,
+) -> None:
+    """Pass HPA behavior and idle replicas through to KEDA."""
+
+    scaled_object = render_manifest(
+        helm_runner,
+        "ScaledObject",
+        values={
+            "autoscaling": {
+                "keda": {
+                    "enabled": True,
+                    "minReplicaCount": 2,
+                    "idleReplicaCount": 0,
+                    "restoreToOriginalReplicaCount": True,
+                    "behavior": {
+                        "scaleDown": {"stabilizationWindowSeconds": 300}
+                    },
+                    "triggers": [SQS_TRIGGER],
+                }
+            }
+        },
+    )
+
+    assert scaled_object["spec"]["idleReplicaCount"] == 0
+    assert scaled_object["spec"]["advanced"] == {
+        "restoreToOriginalReplicaCount": True,
+        "horizontalPodAutoscalerConfig": {
+            "behavior": {"scaleDown": {"stabilizationWindowSeconds": 300}}
+        },
+    }
+
+
+def test_keda_pdb_budgets_for_one_pod_when_scaling_to_zero(
+    helm_runner,
+) -> None:
+    """A scale-to-zero Deployment still gets a usable disruption budget."""
+
+    pdb = render_manifest(
+        helm_runner,
+        "PodDisruptionBudget",
+        values={
+            "replicaCount": 5,
+            "podDisruptionBudget": {"enabled": True, "maxUnavailable": 1},
+            "autoscaling": {
+                "keda": {
+                    "enabled": True,
+                    "minReplicaCount": 0,
+                    "triggers": [SQS_TRIGGER],
+                }
+            },
+        },
+    )
+
+    assert pdb["spec"]["maxUnavailable"] == 1
+
+
+@pytest.mark.parametrize(
+    ("values", "message"),
+    [
+        pytest.param(
+            {
+                "resources": RESOURCE_REQUESTS,
+                "autoscaling": {
+                    "enabled": True,
+                    "keda": {"enabled": True, "triggers": [SQS_TRIGGER]},
+                },
+            },
+            "mutually exclusive",
+            id="hpa-and-keda",
+        ),
+        pytest.param(
+            {"autoscaling": {"keda": {"enabled": True}}},
+            "at least one trigger",
+            id="no-triggers",
+        ),
+        pytest.param(
+            {
+                "autoscaling": {
+                    "keda": {
+                        "enabled": True,
+                        "minReplicaCount": 1,
+                        "idleReplicaCount": 1,
+                        "triggers": [SQS_TRIGGER],
+                    }
+                }
+            },
+            "idleReplicaCount",
+            id="idle-not-below-min",
+        ),
+        pytest.param(
+            {
+                "autoscaling": {
+                    "keda": {
+                        "enabled": True,
+                        "minReplicaCount": 5,
+                        "maxReplicaCount": 2,
+                        "triggers": [SQS_TRIGGER],
+                    }
+                }
+            },
+            "must not exceed",
+            id="min-above-max",
+        ),
+        pytest.param(
+            {
+                "podDisruptionBudget": {"enabled": True, "minAvailable": 2},
+                "autoscaling": {
+                    "keda": {
+                        "enabled": True,
+                        "minReplicaCount": 0,
+                        "triggers": [SQS_TRIGGER],
+                    }
+                },
+            },
+            "effective replica minimum is 1",
+            id="pdb-above-keda-minimum",
+        ),
+        pytest.param(
+            {
+                "autoscaling": {
+                    "keda": {
+                        "enabled": True,
+                        "fallback": {"replicas": 4},
+                        "triggers": [SQS_TRIGGER],
+                    }
+                }
+            },
+            "failureThreshold is required",
+            id="fallback-missing-threshold",
+        ),
+    ],
+)
+def test_keda_rejects_invalid_configuration(
+    helm_runner,
+    values: dict[str, Any],
+    message: str,
+) -> None:
+    """Fail fast on ScaledObjects that KEDA would reject or misapply."""
+
+    with pytest.raises(HelmTemplateError, match=message):
+        render_chart(helm_runner, CHART, values=values)
+
+
+def test_keda_schema_rejects_trigger_without_type(helm_runner) -> None:
+    """Every trigger must name its scaler."""
+
+    with pytest.raises(HelmTemplateError):
+        render_chart(
+            helm_runner,
+            CHART,
+            values={
+                "autoscaling": {
+                    "keda": {
+                        "enabled": True,
+                        "triggers": [{"metadata": {"queueLength": "5"}}],
+                    }
+                }
+            },
+        )
@@ -0,0 +1,249 @@
+"""Connection pooler sidecar tests for universal-chart."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from .chart_test_utils import get_primary_container, render_chart
+from .conftest import HelmTemplateError
+from .universal_chart_test_utils import (
+    CHART,
+    MIGRATE,
+    env_values,
+    manifests_by_kind_and_name,
+    render_manifest,
+    render_manifests,
+    render_pod_spec,
+)
+
+UPSTREAM = {"host": "db.example.internal", "database": "app"}
+POOLER = {"enabled": True, "upstream": UPSTREAM}
+
+
+def test_pooler_runs_as_a_native_sidecar(helm_runner) -> None:
+    """Start the pooler first and point the application at localhost."""
+
+    manifests = render_manifests(
+        helm_runner,
+        values={
+            "pooler": {**POOLER, "authSecret": "pgbouncer-users"},
+            "resourcesPreset": "small",
+            "initContainers": [MIGRATE],
+        },
+    )
+    container = get_primary_container(manifests)
+    deployment = manifests_by_kind_and_name(manifests)[
+        ("Deployment", CHART.release)
+    ]
+    pod = deployment["spec"]["template"]["spec"]
+    pooler, migrate = pod["initContainers"]
+
+    assert pooler["name"] == "pooler"
+    assert pooler["restartPolicy"] == "Always"
+    assert pooler["ports"] == [
+        {"name": "pooler", "containerPort": 6432, "protocol": "TCP"}
+    ]
+    assert pooler["resources"]["requests"] == {"cpu": "50m", "memory": "32Mi"}
+    assert pooler["startupProbe"]["tcpSocket"] == {"port": "pooler"}
+    assert pooler["volumeMounts"] == [
+        {"name": "pooler-config", "mountPath": "/etc/pooler", "readOnly": True},
+        {
+            "name": "pooler-auth",
+            "mountPath": "/etc/pooler-auth",
+            "readOnly": True,
+        },
+    ]
+    assert container["resources"]["requests"]["cpu"] == "500m"
+    assert "startupProbe" not in container
+    assert {"PGHOST": "127.0.0.1", "PGPORT": "6432"}.items() <= (
+        env_values(container).items()
+    )
+    assert {"PGHOST": "db.example.internal", "PGPORT": "5432"}.items() <= (
+        env_values(migrate).items()
+    )
+    assert pod["volumes"] == [
+        {
+            "name": "pooler-config",
+            "configMap": {"name": f"{CHART.release}-pooler"},
+        },
+        {"name": "pooler-auth", "secret": {"secretName": "pgbouncer-users"}},
+    ]
+
+
+def test_init_containers_may_use_the_pooler(helm_runner) -> None:
+    """Opt init containers into the pooler instead of the upstream."""
+
+    pod = render_pod_spec(
+        helm_runner,
+        values={
+            "pooler": {**POOLER, "initContainers": True},
+            "initContainers": [MIGRATE],
+        },
+    )
+
+    migrate = pod["initContainers"][1]
+    assert env_values(migrate) == env_values(pod["containers"][0])
+
+
+def test_pooler_config_is_rendered_into_a_configmap(helm_runner) -> None:
+    """Render pgbouncer.ini and roll the pods when it changes."""
+
+    def render(**pooler: Any) -> dict[tuple[str, str], dict[str, Any]]:
+        return manifests_by_kind_and_name(
+            render_manifests(
+                helm_runner, values={"pooler": {**POOLER, **pooler}}
+            )
+        )
+
+    def checksum(manifests: dict[tuple[str, str], dict[str, Any]]) -> str:
+        deployment = manifests[("Deployment", CHART.release)]
+        annotations = deployment["spec"]["template"]["metadata"]["annotations"]
+        return annotations["checksum/pooler-config"]
+
+    default = render()
+    tuned = render(
+        poolMode="session",
+        maxDbConnections=40,
+        settings={"server_tls_sslmode": "require"},
+    )
+    config = tuned[("ConfigMap", f"{CHART.release}-pooler")]["data"][
+        "pgbouncer.ini"
+    ]
+
+    assert config.splitlines() == [
+        "[databases]",
+        "app = host=db.example.internal port=5432 dbname=app",
+        "[pgbouncer]",
+        "default_pool_size = 20",
+        "ignore_startup_parameters = extra_float_digits",
+        "listen_addr = 0.0.0.0",
+        "listen_port = 6432",
+        "max_client_conn = 1000",
+        "max_db_connections = 40",
+        "pool_mode = session",
+        "server_tls_sslmode = require",
+        "unix_socket_dir =",
+    ]
+    assert checksum(default) != checksum(tuned)
+
+
+def test_pooler_config_can_be_replaced(helm_runner) -> None:
+    """Ship a hand-written file for another pooler without an upstream."""
+
+    config = "listen 127.0.0.1:27017\n"
+    configmap = render_manifest(
+        helm_runner,
+        "ConfigMap",
+        values={
+            "pooler": {
+                "enabled": True,
+                "config": config,
+                "configFile": "pooler.conf",
+            }
+        },
+    )
+
+    assert configmap["data"] == {"pooler.conf": config}
+
+
+def test_jobs_connect_to_the_upstream_directly(helm_runner) -> None:
+    """Jobs have no sidecar, so their environment names the database."""
+
+    pod = render_pod_spec(
+        helm_runner,
+        "Job",
+        values={"pooler": POOLER, "jobs": {"warm": {"command": ["warm"]}}},
+    )
+
+    assert "initContainers" not in pod
+    assert {
+        "PGHOST": "db.example.internal",
+        "PGPORT": "5432",
+    }.items() <= env_values(pod["containers"][0]).items()
+
+
+def test_workloads_get_their_own_pooler_config(helm_runner) -> None:
+    """Each workload's pool settings land in its own ConfigMap."""
+
+    manifests = manifests_by_kind_and_name(
+        render_manifests(
+            helm_runner,
+            values={
+                "pooler": POOLER,
+                "workloads": {
+                    "worker": {"pooler": {"defaultPoolSize": 5}},
+                    "cron": {"pooler": {"enabled": False}},
+                },
+            },
+        )
+    )
+    worker = manifests[("ConfigMap", f"{CHART.release}-worker-pooler")]
+    cron = manifests[("Deployment", f"{CHART.release}-cron")]
+
+    assert "default_pool_size = 5" in worker["data"]["pgbouncer.ini"]
+    assert ("ConfigMap", f"{CHART.release}-pooler") in manifests
+    assert ("ConfigMap", f"{CHART.release}-cron-pooler") not in manifests
+    assert "initContainers" not in cron["spec"]["template"]["spec"]
+
+
+@pytest.mark.parametrize(
+    ("values", "message"),
+    [
+        pytest.param(
+            {"pooler": {"enabled": True}},
+            "pooler.upstream.host is required",
+            id="missing-upstream",
+        ),
+        pytest.param(
+            {"pooler": POOLER, "extraEnvVars": {"PGHOST": "db"}},
+            "pooler sets PGHOST",
+            id="env-clash",
+        ),
+        pytest.param(
+            {
+                "pooler": POOLER,
+                "volumes": [{"name": "pooler-config", "emptyDir": {}}],
+            },
+            'volume name "pooler-config" is reserved',
+            id="reserved-volume",
+        ),
+        pytest.param(
+            {
+                "pooler": POOLER,
+                "qos": "guaranteed",
+                "resources": {"limits": {"cpu": "1", "memory": "1Gi"}},
+            },
+            "but pooler.resources sets cpu 50m",
+            id="guaranteed-fractional-cpu",
+        ),
+    ],
+)
+def test_pooler_rejects_invalid_settings(
+    helm_runner,
+    values: dict[str, Any],
+    message: str,
+) -> None:
+    """Refuse a pooler the application could not reach."""
+
+    with pytest.raises(HelmTemplateError, match=message):
+        render_chart(helm_runner, CHART, values=values)
+
+
+@pytest.mark.parametrize(
+    "pooler",
+    [
+        pytest.param({"poolMode": "connection"}, id="unknown-pool-mode"),
+        pytest.param({"hostEnvVar": "PG-HOST"}, id="invalid-env-name"),
+        pytest.param({"upstream": {"host": "db", "user": "x"}}, id="unknown"),
+    ],
+)
+def test_pooler_schema_rejects_invalid_values(
+    helm_runner,
+    pooler: dict[str, Any],
+) -> None:
+    """Reject malformed pooler values."""
+
+    with pytest.raises(HelmTemplateError):
+        render_chart(helm_runner, CHART, values={"pooler": pooler})
@@ -0,0 +1,137 @@
+"""Image pre-pull DaemonSet tests for universal-chart."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from .chart_test_utils import render_chart
+from .conftest import HelmTemplateError
+from .universal_chart_test_utils import CHART, render_manifest, render_manifests
+
+NODE_AFFINITY = {
+    "requiredDuringSchedulingIgnoredDuringExecution": {
+        "nodeSelectorTerms": [
+            {
+                "matchExpressions": [
+                    {
+                        "key": "karpenter.sh/capacity-type",
+                        "operator": "In",
+                        "values": ["spot"],
+                    }
+                ]
+            }
+        ]
+    }
+}
+
+
+def _daemon_set(helm_runner, **values: Any) -> dict[str, Any]:
+    return render_manifest(
+        helm_runner,
+        "DaemonSet",
+        values={"prePull": {"enabled": True}, **values},
+    )
+
+
+def test_pre_pull_is_disabled_by_default(helm_runner) -> None:
+    """Render no DaemonSet unless pre-pulling is requested."""
+
+    kinds = {item["kind"] for item in render_manifests(helm_runner)}
+
+    assert "DaemonSet" not in kinds
+
+
+def test_pre_pull_pulls_application_and_init_images(helm_runner) -> None:
+    """Run each distinct image once as an exiting init container."""
+
+    daemon_set = _daemon_set(
+        helm_runner,
+        initContainers=[
+            {"image": "ghcr.io/example/migrate:1.0", "command": ["migrate"]},
+            {"image": "ghcr.io/example/migrate:1.0", "command": ["seed"]},
+        ],
+        prePull={"enabled": True, "extraImages": ["busybox:1.36"]},
+    )
+    pod = daemon_set["spec"]["template"]["spec"]
+    init_containers = pod["initContainers"]
+
+    assert [container["image"] for container in init_containers] == [
+        "ghcr.io/example/app:1.2.3",
+        "ghcr.io/example/migrate:1.0",
+        "busybox:1.36",
+    ]
+    assert {c["imagePullPolicy"] for c in init_containers} == {"IfNotPresent"}
+    assert init_containers[0]["command"] == ["sh", "-c", "exit 0"]
+    assert [container["name"] for container in pod["containers"]] == ["pause"]
+    assert pod["automountServiceAccountToken"] is False
+
+
+def test_pre_pull_schedules_onto_the_application_nodes(helm_runner) -> None:
+    """Copy node placement but not pod affinity from the Deployment."""
+
+    daemon_set = _daemon_set(
+        helm_runner,
+        nodeSelector={"kubernetes.io/os": "linux"},
+        tolerations=[{"key": "spot", "operator": "Exists"}],
+        affinity={
+            "nodeAffinity": NODE_AFFINITY,
+            "podAntiAffinity": {
+                "preferredDuringSchedulingIgnoredDuringExecution": []
+            },
+        },
+    )
+    pod = daemon_set["spec"]["template"]["spec"]
+
+    assert pod["nodeSelector"] == {"kubernetes.io/os": "linux"}
+    assert pod["tolerations"] == [{"key": "spot", "operator": "Exists"}]
+    assert pod["affinity"] == {"nodeAffinity": NODE_AFFINITY}
+
+
+def test_pre_pull_pods_are_not_selected_by_the_service(helm_runner) -> None:
+    """Give the DaemonSet its own selector labels."""
+
+    manifests = {
+        item["kind"]: item
+        for item in render_manifests(
+            helm_runner, values={"prePull": {"enabled": True}}
+        )
+    }
+    labels = manifests["DaemonSet"]["spec"]["selector"]["matchLabels"]
+    service_selector = manifests["Service"]["spec"]["selector"]
+
+    assert labels["app.kubernetes.io/component"] == "prepull"
+    assert not service_selector.items() <= labels.items()
+
+
+def test_pre_pull_rejects_workload_name_clash(helm_runner) -> None:
+    """A workloads entry named prepull would reuse the DaemonSet's name."""
+
+    with pytest.raises(HelmTemplateError, match="same names"):
+        render_chart(
+            helm_runner,
+            CHART,
+            values={
+                "prePull": {"enabled": True},
+                "workloads": {"prepull": {"replicaCount": 1}},
+            },
+        )
+
+
+@pytest.mark.parametrize(
+    "pre_pull",
+    [
+        pytest.param({"command": []}, id="empty-command"),
+        pytest.param({"maxUnavailable": "all"}, id="malformed-unavailable"),
+        pytest.param({"extraImages": [""]}, id="empty-image"),
+    ],
+)
+def test_pre_pull_schema_rejects_invalid_values(
+    helm_runner,
+    pre_pull: dict[str, Any],
+) -> None:
+    """Reject malformed pre-pull values."""
+
+    with pytest.raises(HelmTemplateError):
+        render_chart(helm_runner, CHART, values={"prePull": pre_pull})
@@ -0,0 +1,109 @@
+"""Redis connection environment tests for universal-chart."""
+
+from __future__ import annotations
+
+import pytest
+
+from .chart_test_utils import render_chart
+from .conftest import HelmTemplateError
+from .universal_chart_test_utils import CHART, render_env
+
+REDIS = f"{CHART.release}-redis"
+
+
+@pytest.fixture
+def redis_subchart(helm_network_allowed: bool) -> None:
+    """Skip when the Bitnami Redis dependency cannot be built or found."""
+
+    vendored = any((CHART.chart_dir / "charts").glob("redis-*.tgz"))
+    if not (helm_network_allowed or vendored):
+        pytest.skip("the redis subchart needs Helm network access")
+
+
+@pytest.mark.usefixtures("redis_subchart")
+def test_replication_reads_prefer_the_replicas(helm_runner) -> None:
+    """Point writes at the master and reads at the replicas Service."""
+
+    env = render_env(helm_runner, values={"redis": {"enabled": True}})
+
+    assert env["REDIS_HOST"] == f"{REDIS}-master"
+    assert env["REDIS_REPLICA_HOST"] == f"{REDIS}-replicas"
+    assert env["REDIS_REPLICA_PORT"] == "6379"
+    assert env["REDIS_READ_FROM"] == "replicaPreferred"
+    assert "REDIS_SENTINEL_HOST" not in env
+
+
+@pytest.mark.usefixtures("redis_subchart")
+def test_standalone_reads_from_the_master(helm_runner) -> None:
+    """Without replicas there is no replica host to hint at."""
+
+    env = render_env(
+        helm_runner,
+        values={"redis": {"enabled": True, "architecture": "standalone"}},
+    )
+
+    assert env["REDIS_HOST"] == f"{REDIS}-master"
+    assert "REDIS_REPLICA_HOST" not in env
+    assert env["REDIS_READ_FROM"] == "master"
+
+
+@pytest.mark.usefixtures("redis_subchart")
+@pytest.mark.parametrize(
+    ("master_service", "master_host"),
+    [
+        pytest.param(False, None, id="sentinel-only"),
+        pytest.param(True, f"{REDIS}-master", id="with-master-service"),
+    ],
+)
+def test_sentinel_exports_the_master_set(
+    helm_runner,
+    master_service: bool,
+    master_host: str | None,
+) -> None:
+    """Clients discover the master through Sentinel and read from any node."""
+
+    env = render_env(
+        helm_runner,
+        values={
+            "redis": {
+                "enabled": True,
+                "sentinel": {
+                    "enabled": True,
+                    "masterService": {"enabled": master_service},
+                },
+                "readFrom": "replica",
+            }
+        },
+    )
+
+    assert env["REDIS_SENTINEL_HOST"] == REDIS
+    assert env["REDIS_SENTINEL_PORT"] == "26379"
+    assert env["REDIS_SENTINEL_MASTER_SET"] == "mymaster"
+    assert env["REDIS_REPLICA_HOST"] == REDIS
+    assert env["REDIS_READ_FROM"] == "replica"
+    assert env.get("REDIS_HOST") == master_host
+
+
+@pytest.mark.usefixtures("redis_subchart")
+def test_replica_reads_need_replicas(helm_runner) -> None:
+    """Refuse a replica read hint that no Service can serve."""
+
+    with pytest.raises(HelmTemplateError, match="needs replicas"):
+        render_chart(
+            helm_runner,
+            CHART,
+            values={
+                "redis": {
+                    "enabled": True,
+                    "architecture": "standalone",
+                    "readFrom": "replica",
+                }
+            },
+        )
+
+
+def test_redis_schema_rejects_unknown_read_hint(helm_runner) -> None:
+    """Reject read hints that clients would not understand."""
+
+    with pytest.raises(HelmTemplateError):
+        render_chart(helm_runner, CHART, values={"redis": {"readFrom": "any"}})
@@ -0,0 +1,329 @@
+"""Resource preset and QoS tests for universal-chart."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from .chart_test_utils import get_primary_container, render_chart
+from .conftest import HelmTemplateError
+from .universal_chart_test_utils import (
+    CHART,
+    MIGRATE,
+    RESOURCE_REQUESTS,
+    render_manifest,
+    render_manifests,
+    render_pod_spec,
+)
+
+PINNED = {"cpu": "2", "memory": "4Gi"}
+
+
+def test_resources_preset_sets_requests_and_limits(helm_runner) -> None:
+    """Expand the preset and let explicit fields override it."""
+
+    container = get_primary_container(
+        render_manifests(
+            helm_runner,
+            values={
+                "resourcesPreset": "small",
+                "resources": {"limits": {"memory": "1Gi"}},
+            },
+        )
+    )
+
+    assert container["resources"] == {
+        "requests": {"cpu": "500m", "memory": "512Mi"},
+        "limits": {"cpu": "750m", "memory": "1Gi"},
+    }
+
+
+def test_preset_covers_init_containers(helm_runner) -> None:
+    """Init containers without their own resources get the preset."""
+
+    pod = render_pod_spec(
+        helm_runner,
+        values={
+            "resourcesPreset": "nano",
+            "initContainers": [
+                MIGRATE,
+                {
+                    **MIGRATE,
+                    "extraContainerProps": {
+                        "resources": {"requests": {"cpu": "50m"}},
+                        "workingDir": "/app",
+                    },
+                },
+            ],
+        },
+    )
+    first, second = pod["initContainers"]
+
+    assert first["resources"] == pod["containers"][0]["resources"]
+    assert second["resources"] == {"requests": {"cpu": "50m"}}
+    assert second["workingDir"] == "/app"
+
+
+def test_init_containers_keep_no_resources_by_default(helm_runner) -> None:
+    """Without a preset or QoS, init containers render as before."""
+
+    pod = render_pod_spec(
+        helm_runner,
+        values={"resources": RESOURCE_REQUESTS, "initContainers": [MIGRATE]},
+    )
+
+    assert "resources" not in pod["initContainers"][0]
+
+
+def test_guaranteed_qos_pins_requests_to_limits(helm_runner) -> None:
+    """Raise requests to limits in every container of the pod."""
+
+    pod = render_pod_spec(
+        helm_runner,
+        values={
+            "qos": "guaranteed",
+            "resources": {
+                "requests": {"cpu": "1", "memory": "1Gi"},
+                "limits": PINNED,
+            },
+            "initContainers": [
+                MIGRATE,
+                {
+                    **MIGRATE,
+                    "extraContainerProps": {
+                        "resources": {"limits": {"cpu": "1", "memory": "1Gi"}}
+                    },
+                },
+            ],
+        },
+    )
+    first, second = pod["initContainers"]
+
+    assert pod["containers"][0]["resources"] == {
+        "requests": PINNED,
+        "limits": PINNED,
+    }
+    assert first["resources"] == pod["containers"][0]["resources"]
+    assert second["resources"]["requests"] == {"cpu": "1", "memory": "1Gi"}
+
+
+def test_guaranteed_qos_accepts_millicore_whole_cpus(helm_runner) -> None:
+    """A request-only container is pinned at its requests."""
+
+    pod = render_pod_spec(
+        helm_runner,
+        values={
+            "qos": "guaranteed",
+            "resources": {"requests": {"cpu": "2000m", "memory": "2Gi"}},
+        },
+    )
+
+    assert pod["containers"][0]["resources"]["limits"] == {
+        "cpu": "2000m",
+        "memory": "2Gi",
+    }
+
+
+@pytest.mark.parametrize(
+    ("values", "message"),
+    [
+        pytest.param(
+            {"qos": "guaranteed", "resourcesPreset": "small"},
+            r'resources sets cpu 750m; use a whole number of cores such as "1"',
+            id="fractional-preset-cpu",
+        ),
+        pytest.param(
+            {"qos": "guaranteed", "resources": {"limits": {"cpu": "2"}}},
+            "needs a memory limit or request in resources",
+            id="missing-memory",
+        ),
+        pytest.param(
+            {
+                "qos": "guaranteed",
+                "resources": {"limits": PINNED},
+                "initContainers": [
+                    {
+                        **MIGRATE,
+                        "extraContainerProps": {
+                            "resources": {"limits": {"cpu": "500m"}}
+                        },
+                    }
+                ],
+            },
+            r"initContainers\[0\].extraContainerProps.resources",
+            id="init-container-without-memory",
+        ),
+        pytest.param(
+            {
+                "resourcesPreset": "nano",
+                "resources": {"requests": {"cpu": None}},
+                "autoscaling": {"enabled": True},
+            },
+            "measured against the cpu request",
+            id="hpa-without-request",
+        ),
+        pytest.param(
+            {
+                "resourcesPreset": "nano",
+                "autoscaling": {
+                    "enabled": True,
+                    "targetCPUUtilizationPercentage": 200,
+                },
+            },
+            "caps it at 150% of the 100m request",
+            id="target-above-limit",
+        ),
+        pytest.param(
+            {
+                "resourcesPreset": "nano",
+                "resources": {"requests": {"memory": None}},
+                "autoscaling": {
+                    "enabled": True,
+                    "targetCPUUtilizationPercentage": None,
+                    "metrics": [
+                        {
+                            "type": "ContainerResource",
+                            "containerResource": {
+                                "name": "memory",
+                                "container": CHART.chart_name,
+                                "target": {
+                                    "type": "Utilization",
+                                    "averageUtilization": 80,
+                                },
+                            },
+                        }
+                    ],
+                },
+            },
+            r"autoscaling.metrics\[0\] targets 80% memory",
+            id="metric-without-request",
+        ),
+        pytest.param(
+            {
+                "resourcesPreset": "nano",
+                "resources": {"requests": {"cpu": None}},
+                "autoscaling": {
+                    "keda": {
+                        "enabled": True,
+                        "triggers": [
+                            {"type": "cpu", "metadata": {"value": "60"}}
+                        ],
+                    }
+                },
+            },
+            r"autoscaling.keda.triggers\[0\] targets 60% cpu",
+            id="keda-trigger-without-request",
+        ),
+    ],
+)
+def test_resources_reject_unmeasurable_settings(
+    helm_runner,
+    values: dict[str, Any],
+    message: str,
+) -> None:
+    """Refuse QoS and utilization targets the cluster cannot honor."""
+
+    with pytest.raises(HelmTemplateError, match=message):
+        render_chart(helm_runner, CHART, values=values)
+
+
+@pytest.mark.parametrize(
+    ("values", "kind"),
+    [
+        pytest.param(
+            {"autoscaling": {"enabled": True}},
+            "HorizontalPodAutoscaler",
+            id="hpa",
+        ),
+        pytest.param(
+            {
+                "autoscaling": {
+                    "keda": {
+                        "enabled": True,
+                        "triggers": [
+                            {"type": "cpu", "metadata": {"value": "60"}}
+                        ],
+                    }
+                },
+            },
+            "ScaledObject",
+            id="keda",
+        ),
+    ],
+)
+def test_utilization_without_presets_is_not_checked(
+    helm_runner,
+    values: dict[str, Any],
+    kind: str,
+) -> None:
+    """Releases that predate presets keep rendering without requests."""
+
+    assert render_manifest(helm_runner, kind, values=values)["kind"] == kind
+
+
+def test_guaranteed_hpa_may_target_full_utilization(helm_runner) -> None:
+    """With requests equal to limits, 100% is the highest usable target."""
+
+    hpa = render_manifest(
+        helm_runner,
+        "HorizontalPodAutoscaler",
+        values={
+            "qos": "guaranteed",
+            "resources": {"limits": PINNED},
+            "autoscaling": {
+                "enabled": True,
+                "targetCPUUtilizationPercentage": 100,
+            },
+        },
+    )
+
+    target = hpa["spec"]["metrics"][0]["resource"]["target"]
+    assert target["averageUtilization"] == 100
+
+
+def test_sidecar_utilization_metrics_are_not_checked(helm_runner) -> None:
+    """Only the application container's requests are known to the chart."""
+
+    hpa = render_manifest(
+        helm_runner,
+        "HorizontalPodAutoscaler",
+        values={
+            "autoscaling": {
+                "enabled": True,
+                "targetCPUUtilizationPercentage": None,
+                "metrics": [
+                    {
+                        "type": "ContainerResource",
+                        "containerResource": {
+                            "name": "cpu",
+                            "container": "istio-proxy",
+                            "target": {
+                                "type": "Utilization",
+                                "averageUtilization": 80,
+                            },
+                        },
+                    }
+                ],
+            }
+        },
+    )
+
+    assert hpa["spec"]["metrics"][0]["type"] == "ContainerResource"
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        pytest.param({"resourcesPreset": "huge"}, id="unknown-preset"),
+        pytest.param({"qos": "burstable"}, id="unknown-qos"),
+    ],
+)
+def test_resources_schema_rejects_invalid_values(
+    helm_runner,
+    values: dict[str, Any],
+) -> None:
+    """Reject unknown preset and QoS names."""
+
+    with pytest.raises(HelmTemplateError):
+        render_chart(helm_runner, CHART, values=values)
@@ -0,0 +1,208 @@
+"""Deployment rollout tuning tests for universal-chart."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from .chart_test_utils import render_chart
+from .conftest import HelmTemplateError
+from .universal_chart_test_utils import (
+    CHART,
+    RESOURCE_REQUESTS,
+    render_manifest,
+)
+
+
+def test_rollout_defaults_leave_kubernetes_defaults(helm_runner) -> None:
+    """Render no strategy fields unless the rollout block is used."""
+
+    deployment = render_manifest(helm_runner, "Deployment")
+
+    for field in ("strategy", "minReadySeconds", "progressDeadlineSeconds"):
+        assert field not in deployment["spec"]
+
+
+@pytest.mark.parametrize(
+    ("profile", "expected"),
+    [
+        pytest.param(
+            "fast",
+            {
+                "strategy": {
+                    "type": "RollingUpdate",
+                    "rollingUpdate": {
+                        "maxSurge": "50%",
+                        "maxUnavailable": "25%",
+                    },
+                },
+                "minReadySeconds": 0,
+            },
+            id="fast",
+        ),
+        pytest.param(
+            "safe",
+            {
+                "strategy": {
+                    "type": "RollingUpdate",
+                    "rollingUpdate": {"maxSurge": "25%", "maxUnavailable": 0},
+                },
+                "minReadySeconds": 10,
+                "progressDeadlineSeconds": 600,
+            },
+            id="safe",
+        ),
+    ],
+)
+def test_rollout_profiles_expand_to_strategy(
+    helm_runner,
+    profile: str,
+    expected: dict[str, Any],
+) -> None:
+    """Each profile renders a complete rolling update configuration."""
+
+    deployment = render_manifest(
+        helm_runner,
+        "Deployment",
+        values={"rollout": {"profile": profile}},
+    )
+
+    rendered = {
+        field: deployment["spec"][field]
+        for field in expected
+        if field in deployment["spec"]
+    }
+    assert rendered == expected
+    if "progressDeadlineSeconds" not in expected:
+        assert "progressDeadlineSeconds" not in deployment["spec"]
+
+
+def test_rollout_fields_override_profile(helm_runner) -> None:
+    """Explicit fields win over the selected profile."""
+
+    deployment = render_manifest(
+        helm_runner,
+        "Deployment",
+        values={
+            "rollout": {
+                "profile": "safe",
+                "maxSurge": 2,
+                "progressDeadlineSeconds": 900,
+            }
+        },
+    )
+
+    assert deployment["spec"]["strategy"]["rollingUpdate"] == {
+        "maxSurge": 2,
+        "maxUnavailable": 0,
+    }
+    assert deployment["spec"]["minReadySeconds"] == 10
+    assert deployment["spec"]["progressDeadlineSeconds"] == 900
+
+
+def test_rollout_soak_renders_without_strategy(helm_runner) -> None:
+    """A readiness soak alone keeps the default surge settings."""
+
+    deployment = render_manifest(
+        helm_runner,
+        "Deployment",
+        values={"rollout": {"minReadySeconds": 30}},
+    )
+
+    assert "strategy" not in deployment["spec"]
+    assert deployment["spec"]["minReadySeconds"] == 30
+
+
+@pytest.mark.parametrize(
+    ("values", "kind"),
+    [
+        pytest.param(
+            {
+                "replicaCount": 8,
+                "podDisruptionBudget": {"enabled": True, "maxUnavailable": 2},
+                "rollout": {"maxUnavailable": "25%"},
+            },
+            "PodDisruptionBudget",
+            id="percentage-within-budget",
+        ),
+        pytest.param(
+            {
+                "replicaCount": 10,
+                "podDisruptionBudget": {"enabled": True, "minAvailable": 9},
+                "rollout": {"profile": "safe"},
+            },
+            "PodDisruptionBudget",
+            id="safe-profile-within-tight-budget",
+        ),
+    ],
+)
+def test_rollout_within_disruption_budget_renders(
+    helm_runner,
+    values: dict[str, Any],
+    kind: str,
+) -> None:
+    """Rollouts that stay inside the budget render normally."""
+
+    assert render_manifest(helm_runner, kind, values=values)
+
+
+@pytest.mark.parametrize(
+    ("values", "message"),
+    [
+        pytest.param(
+            {
+                "replicaCount": 10,
+                "podDisruptionBudget": {"enabled": True, "minAvailable": 9},
+                "rollout": {"profile": "fast"},
+            },
+            "takes 2 pods out of service",
+            id="fast-profile-exceeds-min-available",
+        ),
+        pytest.param(
+            {
+                "resources": RESOURCE_REQUESTS,
+                "autoscaling": {"enabled": True, "minReplicas": 4},
+                "podDisruptionBudget": {
+                    "enabled": True,
+                    "maxUnavailable": "25%",
+                },
+                "rollout": {"maxUnavailable": 2},
+            },
+            "allows only 1 unavailable",
+            id="exceeds-max-unavailable-at-hpa-floor",
+        ),
+        pytest.param(
+            {"rollout": {"maxSurge": 0, "maxUnavailable": "0%"}},
+            "cannot both be zero",
+            id="no-surge-and-no-unavailable",
+        ),
+    ],
+)
+def test_rollout_rejects_unsafe_settings(
+    helm_runner,
+    values: dict[str, Any],
+    message: str,
+) -> None:
+    """Refuse rollouts that cannot progress or that cut capacity."""
+
+    with pytest.raises(HelmTemplateError, match=message):
+        render_chart(helm_runner, CHART, values=values)
+
+
+@pytest.mark.parametrize(
+    "rollout",
+    [
+        pytest.param({"profile": "yolo"}, id="unknown-profile"),
+        pytest.param({"maxSurge": "50"}, id="percentage-without-sign"),
+        pytest.param({"progressDeadlineSeconds": 0}, id="zero-deadline"),
+    ],
+)
+def test_rollout_schema_rejects_invalid_values(
+    helm_runner,
+    rollout: dict[str, Any],
+) -> None:
+    """Reject malformed rollout settings."""
+
+    with pytest.raises(HelmTemplateError):
+        render_chart(helm_runner, CHART, values={"rollout": rollout})
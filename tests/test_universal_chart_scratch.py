@@ -0,0 +1,211 @@
+"""Scratch volume tests for universal-chart."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from .chart_test_utils import render_chart
+from .conftest import HelmTemplateError
+from .universal_chart_test_utils import (
+    CHART,
+    MIGRATE,
+    render_pod_spec,
+    render_pod_specs,
+)
+
+TMP = {"name": "tmp", "mountPath": "/tmp", "sizeLimit": "1Gi"}
+CACHE = {
+    "name": "cache",
+    "mountPath": "/var/cache/app",
+    "medium": "Memory",
+    "sizeLimit": "256Mi",
+}
+MOUNTS = [
+    {"name": "tmp", "mountPath": "/tmp"},
+    {"name": "cache", "mountPath": "/var/cache/app"},
+]
+
+
+def test_scratch_volumes_are_mounted_everywhere(helm_runner) -> None:
+    """Mount each emptyDir in the application, init and job containers."""
+
+    pods = render_pod_specs(
+        helm_runner,
+        values={
+            "scratch": [TMP, CACHE],
+            "initContainers": [MIGRATE],
+            "jobs": {"warm": {"command": ["warm"]}},
+        },
+    )
+    deployment = pods["Deployment"]
+    job = pods["Job"]
+
+    assert deployment["volumes"] == [
+        {"name": "tmp", "emptyDir": {"sizeLimit": "1Gi"}},
+        {
+            "name": "cache",
+            "emptyDir": {"medium": "Memory", "sizeLimit": "256Mi"},
+        },
+    ]
+    assert deployment["containers"][0]["volumeMounts"] == MOUNTS
+    assert deployment["initContainers"][0]["volumeMounts"] == MOUNTS
+    assert job["volumes"] == deployment["volumes"]
+    assert job["containers"][0]["volumeMounts"] == MOUNTS
+
+
+@pytest.mark.parametrize(
+    ("resources", "expected"),
+    [
+        pytest.param(
+            {},
+            {"requests": {"ephemeral-storage": "1024Mi"}},
+            id="scratch-only",
+        ),
+        pytest.param(
+            {"requests": {"ephemeral-storage": "256Mi"}},
+            {"requests": {"ephemeral-storage": "1280Mi"}},
+            id="no-limit-without-one-set",
+        ),
+        pytest.param(
+            {
+                "requests": {"ephemeral-storage": "256Mi"},
+                "limits": {"ephemeral-storage": "2Gi"},
+            },
+            {
+                "requests": {"ephemeral-storage": "1280Mi"},
+                "limits": {"ephemeral-storage": "3072Mi"},
+            },
+            id="own-request-and-limit",
+        ),
+    ],
+)
+def test_disk_scratch_is_added_to_ephemeral_storage(
+    helm_runner,
+    resources: dict[str, Any],
+    expected: dict[str, Any],
+) -> None:
+    """Reserve disk-backed scratch on top of the container's own writes."""
+
+    pod = render_pod_spec(
+        helm_runner, values={"scratch": [TMP, CACHE], "resources": resources}
+    )
+
+    assert pod["containers"][0]["resources"] == expected
+
+
+def test_guaranteed_qos_pins_ephemeral_storage(helm_runner) -> None:
+    """Pinned pods keep the scratch reservation in requests and limits."""
+
+    pod = render_pod_spec(
+        helm_runner,
+        values={
+            "qos": "guaranteed",
+            "scratch": [TMP, CACHE],
+            "resources": {"limits": {"cpu": "1", "memory": "1Gi"}},
+        },
+    )
+    resources = pod["containers"][0]["resources"]
+
+    assert (
+        resources["requests"]
+        == resources["limits"]
+        == {
+            "cpu": "1",
+            "memory": "1Gi",
+            "ephemeral-storage": "1024Mi",
+        }
+    )
+
+
+def test_scratch_is_optional(helm_runner) -> None:
+    """Without scratch volumes the pod renders as before."""
+
+    pod = render_pod_spec(helm_runner)
+
+    assert "volumes" not in pod
+    assert "resources" not in pod["containers"][0]
+
+
+@pytest.mark.parametrize(
+    ("values", "message"),
+    [
+        pytest.param(
+            {
+                "scratch": [{**CACHE, "sizeLimit": "1Gi"}],
+                "resources": {"limits": {"memory": "1Gi"}},
+            },
+            "scratch volumes hold up to 1024Mi, which fills the 1Gi memory",
+            id="tmpfs-fills-memory-limit",
+        ),
+        pytest.param(
+            {
+                "scratch": [CACHE],
+                "qos": "guaranteed",
+                "resources": {"requests": {"cpu": "1", "memory": "256Mi"}},
+            },
+            "fills the 256Mi memory limit",
+            id="tmpfs-fills-pinned-request",
+        ),
+        pytest.param(
+            {
+                "scratch": [TMP],
+                "volumes": [{"name": "tmp", "emptyDir": {}}],
+            },
+            r'scratch\[0\].name "tmp" is also the name of a pod volume',
+            id="volume-name-clash",
+        ),
+        pytest.param(
+            {
+                "scratch": [TMP],
+                "volumes": [{"name": "data", "emptyDir": {}}],
+                "volumeMounts": [{"name": "data", "mountPath": "/tmp"}],
+            },
+            r"scratch\[0\].mountPath /tmp is already mounted",
+            id="mount-path-clash",
+        ),
+        pytest.param(
+            {
+                "workloadKind": "StatefulSet",
+                "scratch": [TMP],
+                "statefulSet": {
+                    "volumeClaimTemplates": [
+                        {"name": "tmp", "mountPath": "/data", "size": "1Gi"}
+                    ]
+                },
+            },
+            r'volumeClaimTemplates\[0\].name "tmp" is also the name',
+            id="claim-name-clash",
+        ),
+    ],
+)
+def test_scratch_rejects_invalid_settings(
+    helm_runner,
+    values: dict[str, Any],
+    message: str,
+) -> None:
+    """Refuse scratch volumes that would collide or exhaust memory."""
+
+    with pytest.raises(HelmTemplateError, match=message):
+        render_chart(helm_runner, CHART, values=values)
+
+
+@pytest.mark.parametrize(
+    "volume",
+    [
+        pytest.param({**TMP, "medium": "HugePages"}, id="unknown-medium"),
+        pytest.param({**TMP, "sizeLimit": "1 GB"}, id="malformed-size"),
+        pytest.param(
+            {"name": "tmp", "mountPath": "/tmp"}, id="missing-size-limit"
+        ),
+    ],
+)
+def test_scratch_schema_rejects_invalid_values(
+    helm_runner,
+    volume: dict[str, Any],
+) -> None:
+    """Reject malformed scratch entries."""
+
+    with pytest.raises(HelmTemplateError):
+        render_chart(helm_runner, CHART, values={"scratch": [volume]})
@@ -133,6 +133,123 @@ def test_service_monitor_uses_alternate_metrics_service(helm_runner) -> None:
     assert endpoint["path"] == "/metrics"
 
 
+def test_service_monitor_caps_scrape_cost(helm_runner) -> None:
+    """Render scrape limits and drop listed metrics before ingestion."""
+
+    service_monitor = render_manifest(
+        helm_runner,
+        "ServiceMonitor",
+        values={
+            "serviceMonitor": {
+                "enabled": True,
+                "interval": 30,
+                "scrapeTimeout": 10,
+                "sampleLimit": 5000,
+                "labelLimit": 30,
+                "honorLabels": True,
+                "dropMetrics": ["go_gc_.*", "http_.*_bucket"],
+                "metricRelabelings": [
+                    {"action": "labeldrop", "regex": "pod_template_hash"}
+                ],
+            }
+        },
+    )
+
+    assert service_monitor["spec"]["sampleLimit"] == 5000
+    assert service_monitor["spec"]["labelLimit"] == 30
+    assert service_monitor["spec"]["endpoints"] == [
+        {
+            "port": "http",
+            "path": "/metrics",
+            "interval": "30s",
+            "scrapeTimeout": "10s",
+            "honorLabels": True,
+            "metricRelabelings": [
+                {
+                    "sourceLabels": ["__name__"],
+                    "regex": "go_gc_.*|http_.*_bucket",
+                    "action": "drop",
+                },
+                {"action": "labeldrop", "regex": "pod_template_hash"},
+            ],
+        }
+    ]
+
+
+def test_service_monitor_scrapes_additional_endpoints(helm_runner) -> None:
+    """Extra endpoints inherit top-level settings and extend the drop list."""
+
+    service_monitor = render_manifest(
+        helm_runner,
+        "ServiceMonitor",
+        values={
+            "service": {"extraPorts": [{"name": "grpc", "port": 9000}]},
+            "serviceMonitor": {
+                "enabled": True,
+                "alternatePort": 9090,
+                "interval": 30,
+                "endpoints": [
+                    {
+                        "port": "http",
+                        "path": "/app/metrics",
+                        "dropMetrics": ["debug_.*"],
+                    },
+                    {"port": "grpc", "interval": 60, "path": None},
+                ],
+            },
+        },
+    )
+
+    assert service_monitor["spec"]["endpoints"] == [
+        {"port": "metrics", "path": "/metrics", "interval": "30s"},
+        {
+            "port": "http",
+            "path": "/app/metrics",
+            "interval": "30s",
+            "metricRelabelings": [
+                {
+                    "sourceLabels": ["__name__"],
+                    "regex": "debug_.*",
+                    "action": "drop",
+                }
+            ],
+        },
+        {"port": "grpc", "interval": "60s"},
+    ]
+
+
+@pytest.mark.parametrize(
+    ("values", "message"),
+    [
+        pytest.param(
+            {"interval": 10, "scrapeTimeout": 15},
+            "must not exceed the 10s interval for port http",
+            id="timeout-exceeds-interval",
+        ),
+        pytest.param(
+            {"endpoints": [{"port": "metrics"}]},
+            r'endpoints\[0\].port "metrics" is not a Service port',
+            id="metrics-port-without-alternate-port",
+        ),
+        pytest.param(
+            {"endpoints": [{"port": "http"}]},
+            "scrapes port http path /metrics more than once",
+            id="duplicate-endpoint",
+        ),
+    ],
+)
+def test_service_monitor_rejects_invalid_endpoints(
+    helm_runner,
+    values: dict[str, Any],
+    message: str,
+) -> None:
+    """Refuse endpoints that cannot scrape or would double sample cost."""
+
+    values["enabled"] = True
+    with pytest.raises(HelmTemplateError, match=message):
+        render_chart(helm_runner, CHART, values={"serviceMonitor": values})
+
+
 @pytest.mark.parametrize(
     "values",
     [
@@ -149,6 +266,14 @@ def test_service_monitor_uses_alternate_metrics_service(helm_runner) -> None:
             {"enabled": True, "interval": 0},
             id="zero-interval",
         ),
+        pytest.param(
+            {"enabled": True, "sampleLimit": 0},
+            id="zero-sample-limit",
+        ),
+        pytest.param(
+            {"enabled": True, "endpoints": [{"path": "/metrics"}]},
+            id="endpoint-without-port",
+        ),
     ],
 )
 def test_service_monitor_schema_rejects_invalid_values(
@@ -0,0 +1,159 @@
+"""Service traffic routing tests for universal-chart."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from .chart_test_utils import render_chart
+from .conftest import HelmTemplateError
+from .universal_chart_test_utils import (
+    CHART,
+    RESOURCE_REQUESTS,
+    render_manifest,
+)
+
+
+def _service(helm_runner, values: dict[str, Any]) -> dict[str, Any]:
+    return render_manifest(helm_runner, "Service", values=values)
+
+
+def test_service_defaults_leave_routing_to_kubernetes(helm_runner) -> None:
+    """Render no routing fields unless they are requested."""
+
+    service = _service(helm_runner, {})
+
+    assert "annotations" not in service["metadata"]
+    for field in (
+        "trafficDistribution",
+        "internalTrafficPolicy",
+        "sessionAffinity",
+        "sessionAffinityConfig",
+    ):
+        assert field not in service["spec"]
+
+
+def test_service_prefers_close_endpoints(helm_runner) -> None:
+    """Render trafficDistribution when every zone gets a replica."""
+
+    service = _service(
+        helm_runner,
+        {
+            "replicaCount": 3,
+            "service": {
+                "trafficDistribution": "PreferClose",
+                "internalTrafficPolicy": "Cluster",
+            },
+        },
+    )
+
+    assert service["spec"]["trafficDistribution"] == "PreferClose"
+    assert service["spec"]["internalTrafficPolicy"] == "Cluster"
+
+
+def test_service_topology_hints_keep_custom_annotations(helm_runner) -> None:
+    """Add the topology-mode annotation alongside user annotations."""
+
+    service = _service(
+        helm_runner,
+        {
+            "resources": RESOURCE_REQUESTS,
+            "autoscaling": {"enabled": True, "minReplicas": 2},
+            "availability": {"enabled": True},
+            "topologySpreadConstraints": [],
+            "service": {
+                "topologyAwareHints": True,
+                "topologyZones": 2,
+                "annotations": {"example.com/owner": "team"},
+            },
+        },
+    )
+
+    assert service["metadata"]["annotations"] == {
+        "example.com/owner": "team",
+        "service.kubernetes.io/topology-mode": "Auto",
+    }
+
+
+def test_service_client_ip_session_affinity(helm_runner) -> None:
+    """Pin clients to a pod for the configured timeout."""
+
+    service = _service(
+        helm_runner,
+        {
+            "service": {
+                "sessionAffinity": "ClientIP",
+                "sessionAffinityTimeoutSeconds": 600,
+            }
+        },
+    )
+
+    assert service["spec"]["sessionAffinity"] == "ClientIP"
+    assert service["spec"]["sessionAffinityConfig"] == {
+        "clientIP": {"timeoutSeconds": 600}
+    }
+
+
+@pytest.mark.parametrize(
+    ("values", "message"),
+    [
+        pytest.param(
+            {
+                "replicaCount": 3,
+                "service": {
+                    "trafficDistribution": "PreferClose",
+                    "topologyAwareHints": True,
+                },
+            },
+            "mutually exclusive",
+            id="both-routing-mechanisms",
+        ),
+        pytest.param(
+            {"service": {"trafficDistribution": "PreferClose"}},
+            "only 1 replicas can serve 3 zones",
+            id="fewer-replicas-than-zones",
+        ),
+        pytest.param(
+            {
+                "resources": RESOURCE_REQUESTS,
+                "autoscaling": {
+                    "enabled": True,
+                    "minReplicas": 2,
+                    "maxReplicas": 6,
+                },
+                "service": {"topologyAwareHints": True},
+            },
+            "only 2 replicas can serve 3 zones",
+            id="autoscaling-minimum-below-zones",
+        ),
+        pytest.param(
+            {
+                "replicaCount": 3,
+                "topologySpreadConstraints": [],
+                "service": {"trafficDistribution": "PreferClose"},
+            },
+            "pods must be spread across zones",
+            id="no-zone-spread",
+        ),
+        pytest.param(
+            {"service": {"internalTrafficPolicy": "Local"}},
+            "a Deployment cannot guarantee",
+            id="local-traffic-policy",
+        ),
+        pytest.param(
+            {"service": {"sessionAffinityTimeoutSeconds": 600}},
+            "requires service.sessionAffinity ClientIP",
+            id="timeout-without-client-ip",
+        ),
+    ],
+)
+def test_service_routing_rejects_zone_starvation(
+    helm_runner,
+    values: dict[str, Any],
+    message: str,
+) -> None:
+    """Refuse routing settings that could leave a zone without endpoints."""
+
+    with pytest.raises(HelmTemplateError, match=message):
+        render_chart(helm_runner, CHART, values=values)
@@ -0,0 +1,243 @@
+"""SLO and pre-aggregation recording rule tests for universal-chart."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from .chart_test_utils import render_chart
+from .conftest import HelmTemplateError
+from .universal_chart_test_utils import CHART, render_manifest, render_manifests
+
+SELECTOR = 'namespace="default", job="universal-chart"'
+AVAILABILITY = {
+    "name": "api-availability",
+    "sli": "availability",
+    "objective": 99.9,
+    "metric": "http_requests_total",
+    "errorSelector": 'code=~"5.."',
+}
+LATENCY = {
+    "name": "api-latency",
+    "sli": "latency",
+    "objective": 99,
+    "metric": "http_request_duration_seconds",
+    "threshold": "0.3",
+}
+
+
+def _groups(helm_runner, values: dict[str, Any]) -> dict[str, Any]:
+    prom_rule = render_manifest(helm_runner, "PrometheusRule", values=values)
+    return {group["name"]: group for group in prom_rule["spec"]["groups"]}
+
+
+def test_slo_records_error_ratios_for_every_window(helm_runner) -> None:
+    """Record the availability error ratio once per burn-rate window."""
+
+    groups = _groups(
+        helm_runner, {"slo": {"enabled": True, "objectives": [AVAILABILITY]}}
+    )
+    rules = groups["universal-chart.slo"]["rules"]
+    records = [rule for rule in rules if "record" in rule]
+
+    assert [rule["record"] for rule in records] == [
+        f"slo:sli_error:ratio_rate{window}"
+        for window in ("5m", "30m", "1h", "2h", "6h", "1d", "3d")
+    ]
+    assert records[0]["labels"] == {"slo": "api-availability"}
+    assert records[0]["expr"] == (
+        "sum by (namespace) (rate(http_requests_total"
+        f'{{{SELECTOR}, code=~"5.."}}[5m]))\n/\n'
+        f"sum by (namespace) (rate(http_requests_total{{{SELECTOR}}}[5m]))"
+    )
+
+
+def test_slo_alerts_on_multi_window_burn_rates(helm_runner) -> None:
+    """Page on fast burns, ticket on slow burns, with default rule labels."""
+
+    groups = _groups(
+        helm_runner,
+        {
+            "prometheusRule": {"defaultRuleLabels": {"team": "example"}},
+            "slo": {"enabled": True, "objectives": [AVAILABILITY]},
+        },
+    )
+    alerts = [
+        rule
+        for rule in groups["universal-chart.slo"]["rules"]
+        if "alert" in rule
+    ]
+
+    assert [
+        (
+            alert["labels"]["long"],
+            alert["labels"]["short"],
+            alert["labels"]["severity"],
+        )
+        for alert in alerts
+    ] == [
+        ("1h", "5m", "critical"),
+        ("6h", "30m", "critical"),
+        ("1d", "2h", "warning"),
+        ("3d", "6h", "warning"),
+    ]
+    assert {alert["alert"] for alert in alerts} == {"ErrorBudgetBurn"}
+    assert alerts[0]["labels"]["team"] == "example"
+    series = '{namespace="default", slo="api-availability"}'
+    assert alerts[0]["expr"] == (
+        f"slo:sli_error:ratio_rate1h{series} > (14.4 * (1 - 99.9 / 100))\n"
+        f"and\n"
+        f"slo:sli_error:ratio_rate5m{series} > (14.4 * (1 - 99.9 / 100))"
+    )
+
+
+def test_slo_latency_counts_requests_above_threshold(helm_runner) -> None:
+    """Use the histogram bucket at the threshold and skip disabled alerts."""
+
+    groups = _groups(
+        helm_runner,
+        {
+            "serviceMonitor": {"alternatePort": 9090},
+            "slo": {
+                "enabled": True,
+                "alerting": {"enabled": False},
+                "objectives": [LATENCY],
+            },
+        },
+    )
+    rules = groups["universal-chart.slo"]["rules"]
+
+    assert all("record" in rule for rule in rules)
+    selector = 'namespace="default", job="universal-chart-metrics"'
+    assert rules[0]["expr"] == (
+        "1 - (\n"
+        "  sum by (namespace) (rate(http_request_duration_seconds_bucket"
+        f'{{{selector}, le="0.3"}}[5m]))\n'
+        "  /\n"
+        "  sum by (namespace) (rate(http_request_duration_seconds_count"
+        f"{{{selector}}}[5m]))\n"
+        ")"
+    )
+
+
+def test_pre_aggregate_records_rates_and_quantiles(helm_runner) -> None:
+    """Record summed rates and derive quantiles from one bucket series."""
+
+    groups = _groups(
+        helm_runner,
+        {
+            "preAggregate": {
+                "enabled": True,
+                "interval": "1m",
+                "rates": [
+                    {"metric": "http_requests_total", "by": ["job", "code"]}
+                ],
+                "histograms": [
+                    {
+                        "metric": "http_request_duration_seconds",
+                        "quantiles": ["0.5", "0.999"],
+                    }
+                ],
+            }
+        },
+    )
+    group = groups["universal-chart.pre-aggregate"]
+    buckets = "namespace_job:http_request_duration_seconds_bucket:rate5m"
+
+    assert group["interval"] == "1m"
+    assert group["rules"] == [
+        {
+            "record": "job_code:http_requests_total:rate5m",
+            "expr": "sum by (job, code) "
+            f"(rate(http_requests_total{{{SELECTOR}}}[5m]))",
+        },
+        {
+            "record": buckets,
+            "expr": "sum by (namespace, job, le) (rate("
+            f"http_request_duration_seconds_bucket{{{SELECTOR}}}[5m]))",
+        },
+        {
+            "record": "namespace_job:http_request_duration_seconds:p50_rate5m",
+            "expr": f"histogram_quantile(0.5, {buckets})",
+        },
+        {
+            "record": (
+                "namespace_job:http_request_duration_seconds:p999_rate5m"
+            ),
+            "expr": f"histogram_quantile(0.999, {buckets})",
+        },
+    ]
+
+
+def test_slo_without_objectives_renders_no_rules(helm_runner) -> None:
+    """Enabling the blocks alone adds no PrometheusRule."""
+
+    manifests = render_manifests(
+        helm_runner,
+        values={"slo": {"enabled": True}, "preAggregate": {"enabled": True}},
+    )
+
+    assert all(item.get("kind") != "PrometheusRule" for item in manifests)
+
+
+@pytest.mark.parametrize(
+    ("objectives", "message"),
+    [
+        pytest.param(
+            [{**AVAILABILITY, "errorSelector": None}],
+            "errorSelector is required for availability SLIs",
+            id="availability-without-error-selector",
+        ),
+        pytest.param(
+            [{**LATENCY, "threshold": None}],
+            "threshold is required for latency SLIs",
+            id="latency-without-threshold",
+        ),
+        pytest.param(
+            [AVAILABILITY, {**LATENCY, "name": "api-availability"}],
+            'objectives\\[1\\].name "api-availability" is already used',
+            id="duplicate-name",
+        ),
+    ],
+)
+def test_slo_rejects_incomplete_objectives(
+    helm_runner,
+    objectives: list[dict[str, Any]],
+    message: str,
+) -> None:
+    """Refuse objectives that cannot produce a meaningful error ratio."""
+
+    with pytest.raises(HelmTemplateError, match=message):
+        render_chart(
+            helm_runner,
+            CHART,
+            values={"slo": {"enabled": True, "objectives": objectives}},
+        )
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        pytest.param(
+            {"slo": {"objectives": [{**AVAILABILITY, "objective": 100}]}},
+            id="objective-leaves-no-budget",
+        ),
+        pytest.param(
+            {"slo": {"objectives": [{**LATENCY, "sli": "throughput"}]}},
+            id="unknown-sli",
+        ),
+        pytest.param(
+            {"preAggregate": {"quantiles": ["99"]}},
+            id="quantile-is-not-a-fraction",
+        ),
+    ],
+)
+def test_slo_schema_rejects_invalid_values(
+    helm_runner,
+    values: dict[str, Any],
+) -> None:
+    """Reject malformed SLO and pre-aggregation values."""
+
+    with pytest.raises(HelmTemplateError):
+        render_chart(helm_runner, CHART, values=values)
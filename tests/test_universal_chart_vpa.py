@@ -0,0 +1,220 @@
+"""VerticalPodAutoscaler tests for universal-chart."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from .chart_test_utils import render_chart
+from .conftest import HelmTemplateError
+from .universal_chart_test_utils import (
+    CHART,
+    RESOURCE_REQUESTS,
+    render_manifest,
+)
+
+
+def test_vpa_defaults_to_recommendation_only(helm_runner) -> None:
+    """Publish recommendations for the application container by default."""
+
+    vpa = render_manifest(
+        helm_runner,
+        "VerticalPodAutoscaler",
+        values={
+            "resources": RESOURCE_REQUESTS,
+            "autoscaling": {
+                "enabled": True,
+                "targetCPUUtilizationPercentage": 80,
+            },
+            "verticalAutoscaling": {"enabled": True},
+        },
+    )
+
+    assert vpa["apiVersion"] == "autoscaling.k8s.io/v1"
+    assert vpa["spec"]["targetRef"] == {
+        "apiVersion": "apps/v1",
+        "kind": "Deployment",
+        "name": "universal-chart",
+    }
+    assert vpa["spec"]["updatePolicy"] == {"updateMode": "Off"}
+    assert vpa["spec"]["resourcePolicy"]["containerPolicies"] == [
+        {
+            "containerName": "universal-chart",
+            "controlledResources": ["cpu", "memory"],
+            "controlledValues": "RequestsAndLimits",
+        }
+    ]
+
+
+def test_vpa_renders_bounds_and_extra_container_policies(
+    helm_runner,
+) -> None:
+    """Bound the application container and pass other policies through."""
+
+    vpa = render_manifest(
+        helm_runner,
+        "VerticalPodAutoscaler",
+        values={
+            "verticalAutoscaling": {
+                "enabled": True,
+                "updateMode": "Auto",
+                "minAllowed": {"cpu": "50m", "memory": "64Mi"},
+                "maxAllowed": {"cpu": "2", "memory": "2Gi"},
+                "containerPolicies": [
+                    {"containerName": "istio-proxy", "mode": "Off"}
+                ],
+                "annotations": {"argocd.argoproj.io/sync-wave": "10"},
+            }
+        },
+    )
+
+    assert vpa["metadata"]["annotations"] == {
+        "argocd.argoproj.io/sync-wave": "10"
+    }
+    assert vpa["spec"]["updatePolicy"] == {"updateMode": "Auto"}
+    policies = vpa["spec"]["resourcePolicy"]["containerPolicies"]
+    assert policies[0]["minAllowed"] == {"cpu": "50m", "memory": "64Mi"}
+    assert policies[0]["maxAllowed"] == {"cpu": "2", "memory": "2Gi"}
+    assert policies[1] == {"containerName": "istio-proxy", "mode": "Off"}
+
+
+def test_vpa_may_control_resources_the_hpa_does_not_target(
+    helm_runner,
+) -> None:
+    """Memory sizing can be automatic while the HPA scales on CPU."""
+
+    vpa = render_manifest(
+        helm_runner,
+        "VerticalPodAutoscaler",
+        values={
+            "resources": RESOURCE_REQUESTS,
+            "autoscaling": {
+                "enabled": True,
+                "targetCPUUtilizationPercentage": 80,
+            },
+            "verticalAutoscaling": {
+                "enabled": True,
+                "updateMode": "Auto",
+                "controlledResources": ["memory"],
+            },
+        },
+    )
+
+    policy = vpa["spec"]["resourcePolicy"]["containerPolicies"][0]
+    assert policy["controlledResources"] == ["memory"]
+
+
+@pytest.mark.parametrize(
+    ("values", "message"),
+    [
+        pytest.param(
+            {
+                "resources": RESOURCE_REQUESTS,
+                "autoscaling": {
+                    "enabled": True,
+                    "targetCPUUtilizationPercentage": 80,
+                },
+                "verticalAutoscaling": {"enabled": True, "updateMode": "Auto"},
+            },
+            "resize cpu",
+            id="hpa-cpu",
+        ),
+        pytest.param(
+            {
+                "resources": RESOURCE_REQUESTS,
+                "autoscaling": {
+                    "enabled": True,
+                    "targetCPUUtilizationPercentage": None,
+                    "targetMemoryUtilizationPercentage": 70,
+                },
+                "verticalAutoscaling": {
+                    "enabled": True,
+                    "updateMode": "Initial",
+                    "controlledResources": ["memory"],
+                },
+            },
+            "resize memory",
+            id="hpa-memory",
+        ),
+        pytest.param(
+            {
+                "resources": RESOURCE_REQUESTS,
+                "autoscaling": {
+                    "keda": {
+                        "enabled": True,
+                        "triggers": [
+                            {"type": "cpu", "metadata": {"value": "60"}}
+                        ],
+                    }
+                },
+                "verticalAutoscaling": {"enabled": True, "updateMode": "Auto"},
+            },
+            "resize cpu",
+            id="keda-cpu-trigger",
+        ),
+        pytest.param(
+            {
+                "resources": RESOURCE_REQUESTS,
+                "autoscaling": {
+                    "enabled": True,
+                    "targetCPUUtilizationPercentage": None,
+                    "metrics": [
+                        {
+                            "type": "ContainerResource",
+                            "containerResource": {
+                                "name": "memory",
+                                "container": "universal-chart",
+                                "target": {
+                                    "type": "Utilization",
+                                    "averageUtilization": 70,
+                                },
+                            },
+                        }
+                    ],
+                },
+                "verticalAutoscaling": {"enabled": True, "updateMode": "Auto"},
+            },
+            "resize memory",
+            id="hpa-container-resource-metric",
+        ),
+    ],
+)
+def test_vpa_rejects_fighting_the_horizontal_autoscaler(
+    helm_runner,
+    values: dict[str, Any],
+    message: str,
+) -> None:
+    """Refuse VPA updates on a metric the HPA scales on."""
+
+    with pytest.raises(HelmTemplateError, match=message):
+        render_chart(helm_runner, CHART, values=values)
+
+
+@pytest.mark.parametrize(
+    "vertical_autoscaling",
+    [
+        pytest.param({"updateMode": "Recreate"}, id="unknown-update-mode"),
+        pytest.param(
+            {"controlledResources": ["ephemeral-storage"]},
+            id="unsupported-resource",
+        ),
+    ],
+)
+def test_vpa_schema_rejects_invalid_values(
+    helm_runner,
+    vertical_autoscaling: dict[str, Any],
+) -> None:
+    """Reject update modes and resources the chart does not support."""
+
+    with pytest.raises(HelmTemplateError):
+        render_chart(
+            helm_runner,
+            CHART,
+            values={
+                "verticalAutoscaling": {
+                    "enabled": True,
+                    **vertical_autoscaling,
+                }
+            },
+        )
@@ -0,0 +1,272 @@
+"""StatefulSet and DaemonSet workload kind tests for universal-chart."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from .chart_test_utils import render_chart
+from .conftest import HelmTemplateError
+from .universal_chart_metrics_block_test_utils import nginx_ingress_values
+from .universal_chart_test_utils import (
+    CHART,
+    MIGRATE,
+    RESOURCE_REQUESTS,
+    VOLUME_CLAIM,
+    manifests_by_kind_and_name,
+    render_manifest,
+    render_manifests,
+    statefulset_values,
+)
+
+HEADLESS = f"{CHART.release}-headless"
+
+
+def test_statefulset_claims_a_volume_per_pod(helm_runner) -> None:
+    """Render claim templates and mount them in every container."""
+
+    statefulset = render_manifest(
+        helm_runner,
+        "StatefulSet",
+        values=statefulset_values(replicaCount=3, initContainers=[MIGRATE]),
+    )
+    spec = statefulset["spec"]
+    pod = spec["template"]["spec"]
+    mount = {"name": "data", "mountPath": "/var/lib/cache"}
+
+    assert statefulset["apiVersion"] == "apps/v1"
+    assert spec["replicas"] == 3
+    assert spec["serviceName"] == HEADLESS
+    assert spec["podManagementPolicy"] == "Parallel"
+    assert spec["volumeClaimTemplates"] == [
+        {
+            "metadata": {"name": "data"},
+            "spec": {
+                "accessModes": ["ReadWriteOnce"],
+                "resources": {"requests": {"storage": "20Gi"}},
+            },
+        }
+    ]
+    assert pod["containers"][0]["volumeMounts"] == [mount]
+    assert pod["initContainers"][0]["volumeMounts"] == [mount]
+
+
+def test_statefulset_headless_service_is_not_scraped(helm_runner) -> None:
+    """Publish pod DNS names without doubling the ServiceMonitor targets."""
+
+    manifests = manifests_by_kind_and_name(
+        render_manifests(
+            helm_runner,
+            values=statefulset_values(serviceMonitor={"enabled": True}),
+        )
+    )
+    headless = manifests[("Service", HEADLESS)]
+    statefulset = manifests[("StatefulSet", CHART.release)]
+    selector = manifests[("ServiceMonitor", CHART.release)]["spec"]["selector"]
+
+    assert headless["spec"]["clusterIP"] == "None"
+    assert headless["spec"]["publishNotReadyAddresses"] is True
+    assert headless["spec"]["selector"] == (
+        statefulset["spec"]["selector"]["matchLabels"]
+    )
+    assert headless["metadata"]["labels"]["service.kubernetes.io/headless"] == (
+        ""
+    )
+    assert "service.kubernetes.io/headless" not in (
+        manifests[("Service", CHART.release)]["metadata"]["labels"]
+    )
+    assert selector["matchExpressions"] == [
+        {"key": "service.kubernetes.io/headless", "operator": "DoesNotExist"}
+    ]
+
+
+def test_scalers_and_budget_target_the_statefulset(helm_runner) -> None:
+    """Point the HPA and VPA at the StatefulSet and keep the PDB selector."""
+
+    manifests = {
+        item["kind"]: item
+        for item in render_manifests(
+            helm_runner,
+            values=statefulset_values(
+                replicaCount=3,
+                resources=RESOURCE_REQUESTS,
+                autoscaling={
+                    "enabled": True,
+                    "minReplicas": 3,
+                    "targetCPUUtilizationPercentage": 70,
+                },
+                podDisruptionBudget={"enabled": True, "maxUnavailable": 1},
+                verticalAutoscaling={"enabled": True, "updateMode": "Off"},
+            ),
+        )
+    }
+    target = {"apiVersion": "apps/v1", "kind": "StatefulSet"}
+    hpa = manifests["HorizontalPodAutoscaler"]["spec"]
+    vpa = manifests["VerticalPodAutoscaler"]["spec"]
+
+    assert hpa["scaleTargetRef"] == {**target, "name": CHART.release}
+    assert vpa["targetRef"] == {**target, "name": CHART.release}
+    assert "replicas" not in manifests["StatefulSet"]["spec"]
+    assert manifests["PodDisruptionBudget"]["spec"]["selector"] == (
+        manifests["StatefulSet"]["spec"]["selector"]
+    )
+
+
+def test_daemonset_runs_one_pod_per_node(helm_runner) -> None:
+    """Drop replicas and generated spread rules; keep the update settings."""
+
+    manifests = {
+        item["kind"]: item
+        for item in render_manifests(
+            helm_runner,
+            values={
+                "workloadKind": "DaemonSet",
+                "availability": {"enabled": True},
+                "spread_azs": True,
+                "rollout": {"profile": "safe"},
+                "podDisruptionBudget": {
+                    "enabled": True,
+                    "maxUnavailable": "10%",
+                },
+                "service": {"internalTrafficPolicy": "Local"},
+            },
+        )
+    }
+    daemonset = manifests["DaemonSet"]["spec"]
+
+    assert "replicas" not in daemonset
+    assert daemonset["updateStrategy"] == {
+        "type": "RollingUpdate",
+        "rollingUpdate": {"maxSurge": "25%", "maxUnavailable": 0},
+    }
+    assert daemonset["minReadySeconds"] == 10
+    assert "progressDeadlineSeconds" not in daemonset
+    assert [
+        (constraint["topologyKey"], constraint["whenUnsatisfiable"])
+        for constraint in daemonset["template"]["spec"][
+            "topologySpreadConstraints"
+        ]
+    ] == [("topology.kubernetes.io/zone", "ScheduleAnyway")]
+    assert manifests["PodDisruptionBudget"]["spec"]["maxUnavailable"] == "10%"
+    assert manifests["Service"]["spec"]["internalTrafficPolicy"] == "Local"
+
+
+def test_workloads_choose_their_own_kind(helm_runner) -> None:
+    """A StatefulSet workload gets its own headless Service."""
+
+    manifests = manifests_by_kind_and_name(
+        render_manifests(
+            helm_runner,
+            values={
+                "workloads": {
+                    "cache": statefulset_values(),
+                    "agent": {"workloadKind": "DaemonSet"},
+                }
+            },
+        )
+    )
+    cache = manifests[("StatefulSet", f"{CHART.release}-cache")]
+    headless = manifests[("Service", f"{CHART.release}-cache-headless")]
+
+    assert cache["spec"]["serviceName"] == f"{CHART.release}-cache-headless"
+    assert headless["spec"]["selector"] == (
+        cache["spec"]["selector"]["matchLabels"]
+    )
+    assert ("DaemonSet", f"{CHART.release}-agent") in manifests
+    assert ("Deployment", CHART.release) in manifests
+    assert ("Service", HEADLESS) not in manifests
+
+
+@pytest.mark.parametrize(
+    ("values", "message"),
+    [
+        pytest.param(
+            statefulset_values(rollout={"profile": "safe"}),
+            "replaces its pods one at a time",
+            id="statefulset-surge",
+        ),
+        pytest.param(
+            statefulset_values(
+                volumes=[{"name": "data", "emptyDir": {}}],
+            ),
+            r'volumeClaimTemplates\[0\].name "data" is also the name',
+            id="claim-shadows-volume",
+        ),
+        pytest.param(
+            {
+                "workloadKind": "DaemonSet",
+                "resources": RESOURCE_REQUESTS,
+                "autoscaling": {"enabled": True},
+            },
+            "cannot scale it",
+            id="daemonset-hpa",
+        ),
+        pytest.param(
+            {
+                "workloadKind": "DaemonSet",
+                "autoscaling": {
+                    "keda": {
+                        "enabled": True,
+                        "triggers": [
+                            {"type": "cron", "metadata": {"start": "0 * * * *"}}
+                        ],
+                    }
+                },
+            },
+            "cannot scale it",
+            id="daemonset-keda",
+        ),
+        pytest.param(
+            {
+                **nginx_ingress_values(),
+                **statefulset_values(),
+                "canary": {"enabled": True, "image": {"tag": "2.0.0"}},
+            },
+            "needs workloadKind Deployment, not StatefulSet",
+            id="statefulset-canary",
+        ),
+        pytest.param(
+            statefulset_values(service={"internalTrafficPolicy": "Local"}),
+            "a StatefulSet cannot guarantee",
+            id="statefulset-local-traffic",
+        ),
+    ],
+)
+def test_workload_kinds_reject_unsupported_settings(
+    helm_runner,
+    values: dict[str, Any],
+    message: str,
+) -> None:
+    """Refuse settings the selected controller would ignore or reject."""
+
+    with pytest.raises(HelmTemplateError, match=message):
+        render_chart(helm_runner, CHART, values=values)
+
+
+@pytest.mark.parametrize(
+    "stateful_set",
+    [
+        pytest.param(
+            {"volumeClaimTemplates": [{**VOLUME_CLAIM, "size": "20 GB"}]},
+            id="malformed-size",
+        ),
+        pytest.param(
+            {"volumeClaimTemplates": [{"name": "data", "size": "1Gi"}]},
+            id="missing-mount-path",
+        ),
+        pytest.param({"podManagementPolicy": "Random"}, id="unknown-policy"),
+    ],
+)
+def test_statefulset_schema_rejects_invalid_values(
+    helm_runner,
+    stateful_set: dict[str, Any],
+) -> None:
+    """Reject malformed StatefulSet values."""
+
+    with pytest.raises(HelmTemplateError):
+        render_chart(
+            helm_runner,
+            CHART,
+            values={"workloadKind": "StatefulSet", "statefulSet": stateful_set},
+        )
@@ -0,0 +1,225 @@
+"""Multiple workload tests for universal-chart."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from .chart_test_utils import render_chart
+from .conftest import HelmTemplateError
+from .universal_chart_test_utils import (
+    CHART,
+    RESOURCE_REQUESTS,
+    manifests_by_kind_and_name,
+    render_manifests,
+)
+
+WORKER = "universal-chart-worker"
+SQS_TRIGGER = {"type": "aws-sqs-queue", "metadata": {"queueLength": "5"}}
+
+
+def test_workload_renders_deployment_sharing_release_environment(
+    helm_runner,
+) -> None:
+    """Workers reuse the image and env wiring but get their own selector."""
+
+    manifests = manifests_by_kind_and_name(
+        render_manifests(
+            helm_runner,
+            values={
+                "extraEnvVars": {"APP_ENV": "production"},
+                "extraEnvSecrets": ["app-secrets"],
+                "workloads": {
+                    "worker": {
+                        "command": ["bundle", "exec", "sidekiq"],
+                        "replicaCount": 3,
+                        "livenessProbe": None,
+                        "resources": {"requests": {"cpu": "250m"}},
+                    }
+                },
+            },
+        )
+    )
+    web = manifests[("Deployment", "universal-chart")]
+    worker = manifests[("Deployment", WORKER)]
+    service = manifests[("Service", "universal-chart")]
+    web_container = web["spec"]["template"]["spec"]["containers"][0]
+    container = worker["spec"]["template"]["spec"]["containers"][0]
+
+    assert worker["spec"]["replicas"] == 3
+    assert worker["spec"]["selector"]["matchLabels"] == {
+        "app.kubernetes.io/name": WORKER,
+        "app.kubernetes.io/component": "worker",
+        "app.kubernetes.io/instance": "universal-chart",
+    }
+    assert not set(service["spec"]["selector"].items()) <= set(
+        worker["spec"]["template"]["metadata"]["labels"].items()
+    )
+    assert container["image"] == web_container["image"]
+    assert container["env"] == web_container["env"]
+    assert container["envFrom"] == [{"secretRef": {"name": "app-secrets"}}]
+    assert container["command"] == ["bundle", "exec", "sidekiq"]
+    assert container["resources"] == {"requests": {"cpu": "250m"}}
+    assert "livenessProbe" not in container
+    assert "command" not in web_container
+    constraint = worker["spec"]["template"]["spec"][
+        "topologySpreadConstraints"
+    ][0]
+    assert constraint["labelSelector"]["matchLabels"] == (
+        worker["spec"]["selector"]["matchLabels"]
+    )
+
+
+def test_workloads_scale_independently(helm_runner) -> None:
+    """Each workload gets its own autoscaler and disruption budget."""
+
+    manifests = manifests_by_kind_and_name(
+        render_manifests(
+            helm_runner,
+            values={
+                "replicaCount": 4,
+                "resources": RESOURCE_REQUESTS,
+                "autoscaling": {"enabled": True, "minReplicas": 3},
+                "podDisruptionBudget": {"enabled": True, "minAvailable": 2},
+                "workloads": {
+                    "worker": {
+                        "autoscaling": {
+                            "enabled": False,
+                            "keda": {
+                                "enabled": True,
+                                "minReplicaCount": 0,
+                                "triggers": [SQS_TRIGGER],
+                            },
+                        },
+                        "podDisruptionBudget": {
+                            "minAvailable": None,
+                            "maxUnavailable": 1,
+                        },
+                    },
+                    "scheduler": {
+                        "autoscaling": {"enabled": False},
+                        "podDisruptionBudget": {"enabled": False},
+                        "replicaCount": 1,
+                    },
+                },
+            },
+        )
+    )
+
+    assert set(manifests) >= {
+        ("HorizontalPodAutoscaler", "universal-chart"),
+        ("ScaledObject", WORKER),
+        ("PodDisruptionBudget", "universal-chart"),
+        ("PodDisruptionBudget", WORKER),
+        ("Deployment", "universal-chart-scheduler"),
+    }
+    assert ("HorizontalPodAutoscaler", WORKER) not in manifests
+    assert ("PodDisruptionBudget", "universal-chart-scheduler") not in (
+        manifests
+    )
+    scaled_object = manifests[("ScaledObject", WORKER)]
+    assert scaled_object["spec"]["scaleTargetRef"]["name"] == WORKER
+    assert "replicas" not in manifests[("Deployment", WORKER)]["spec"]
+    assert (
+        manifests[("Deployment", "universal-chart-scheduler")]["spec"][
+            "replicas"
+        ]
+        == 1
+    )
+    assert manifests[("PodDisruptionBudget", WORKER)]["spec"] == {
+        "maxUnavailable": 1,
+        "selector": {
+            "matchLabels": {
+                "app.kubernetes.io/name": WORKER,
+                "app.kubernetes.io/component": "worker",
+                "app.kubernetes.io/instance": "universal-chart",
+            }
+        },
+    }
+
+
+def test_workload_scaling_rules_get_recording_rules(helm_runner) -> None:
+    """Workload-only HPA scaling rules are recorded with the release's."""
+
+    manifests = render_manifests(
+        helm_runner,
+        values={
+            "workloads": {
+                "worker": {
+                    "autoscaling": {
+                        "enabled": True,
+                        "targetCPUUtilizationPercentage": None,
+                        "hpaScalingRules": [
+                            {
+                                "name": "worker_queue_depth",
+                                "expr": "sum(worker_queue_depth)",
+                                "target": {"averageValue": "100"},
+                            }
+                        ],
+                    }
+                }
+            }
+        },
+    )
+    rule = next(m for m in manifests if m["kind"] == "PrometheusRule")
+
+    records = [r["record"] for r in rule["spec"]["groups"][0]["rules"]]
+    assert records == ["worker_queue_depth"]
+
+
+def test_disabled_workload_is_skipped(helm_runner) -> None:
+    """An entry with enabled: false renders nothing."""
+
+    manifests = render_manifests(
+        helm_runner,
+        values={"workloads": {"worker": {"enabled": False}}},
+    )
+
+    names = {manifest["metadata"]["name"] for manifest in manifests}
+    assert WORKER not in names
+
+
+@pytest.mark.parametrize(
+    ("workloads", "message"),
+    [
+        pytest.param(
+            {"Worker_1": {}},
+            "lowercase DNS label",
+            id="invalid-key",
+        ),
+        pytest.param(
+            {
+                "worker": {
+                    "resources": RESOURCE_REQUESTS,
+                    "autoscaling": {
+                        "enabled": True,
+                        "keda": {"enabled": True, "triggers": [SQS_TRIGGER]},
+                    },
+                }
+            },
+            "mutually exclusive",
+            id="hpa-and-keda",
+        ),
+    ],
+)
+def test_workloads_reject_invalid_entries(
+    helm_runner,
+    workloads: dict[str, Any],
+    message: str,
+) -> None:
+    """Validate workload keys and per-workload autoscaling."""
+
+    with pytest.raises(HelmTemplateError, match=message):
+        render_chart(helm_runner, CHART, values={"workloads": workloads})
+
+
+def test_workloads_schema_rejects_unsupported_fields(helm_runner) -> None:
+    """Only per-workload settings may be overridden."""
+
+    with pytest.raises(HelmTemplateError):
+        render_chart(
+            helm_runner,
+            CHART,
+            values={"workloads": {"worker": {"image": {"tag": "2.0.0"}}}},
+        )
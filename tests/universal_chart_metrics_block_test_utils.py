@@ -22,6 +22,7 @@ def nginx_ingress_values(
     paths: list[dict[str, str]] | None = None,
     annotations: dict[str, str] | None = None,
     class_name: str | None = "nginx",
+    nginx: dict[str, Any] | None = None,
 ) -> dict[str, Any]:
     """Build nginx Ingress values with metrics scraping enabled."""
 
@@ -38,6 +39,8 @@ def nginx_ingress_values(
         ingress["className"] = class_name
     if annotations is not None:
         ingress["annotations"] = annotations
+    if nginx is not None:
+        ingress["nginx"] = nginx
 
     return {
         "ingress": ingress,
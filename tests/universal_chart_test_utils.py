@@ -7,14 +7,48 @@ from typing import TYPE_CHECKING, Any, Mapping
 from .chart_test_utils import (
     ChartContext,
     get_manifest,
+    get_primary_container,
     load_manifests,
     render_chart,
 )
+from .universal_chart_metrics_block_test_utils import ingresses_by_name
 
 if TYPE_CHECKING:
     from pytest_helm_charts.giantswarm.helm import HelmRunner
 
 CHART = ChartContext("universal-chart")
+# Requests that let CPU and memory utilization targets be measured.
+RESOURCE_REQUESTS = {"requests": {"cpu": "250m", "memory": "256Mi"}}
+MIGRATE = {"image": "ghcr.io/example/migrate:1.0", "command": ["migrate"]}
+VOLUME_CLAIM = {"name": "data", "mountPath": "/var/lib/cache", "size": "20Gi"}
+
+
+def statefulset_values(**values: Any) -> dict[str, Any]:
+    """Build StatefulSet workload values with one volume claim template."""
+
+    return {
+        "workloadKind": "StatefulSet",
+        "statefulSet": {"volumeClaimTemplates": [VOLUME_CLAIM]},
+        **values,
+    }
+
+
+def manifests_by_kind_and_name(
+    manifests: list[dict[str, Any]],
+) -> dict[tuple[str, str], dict[str, Any]]:
+    """Return manifests keyed by kind and name."""
+
+    return {
+        (item["kind"], item["metadata"]["name"]): item for item in manifests
+    }
+
+
+def env_values(container: Mapping[str, Any]) -> dict[str, str]:
+    """Return a container's literal env values keyed by name."""
+
+    return {
+        item["name"]: item.get("value", "") for item in container.get("env", [])
+    }
 
 
 def render_manifests(
@@ -42,4 +76,67 @@ def render_manifest(
     )
 
 
-__all__ = ["CHART", "render_manifest", "render_manifests"]
+def render_pod_spec(
+    helm_runner: HelmRunner,
+    kind: str = "Deployment",
+    *,
+    values: Mapping[str, Any] | None = None,
+) -> dict[str, Any]:
+    """Render the chart and return the pod spec of one workload kind."""
+
+    workload = render_manifest(helm_runner, kind, values=values)
+    return workload["spec"]["template"]["spec"]
+
+
+def render_pod_specs(
+    helm_runner: HelmRunner,
+    *,
+    values: Mapping[str, Any] | None = None,
+) -> dict[str, dict[str, Any]]:
+    """Render the chart and return pod specs keyed by workload kind."""
+
+    return {
+        item["kind"]: item["spec"]["template"]["spec"]
+        for item in render_manifests(helm_runner, values=values)
+        if "template" in item.get("spec", {})
+    }
+
+
+def render_env(
+    helm_runner: HelmRunner,
+    *,
+    values: Mapping[str, Any] | None = None,
+) -> dict[str, str]:
+    """Render the chart and return the primary container's env values."""
+
+    return env_values(
+        get_primary_container(render_manifests(helm_runner, values=values))
+    )
+
+
+def render_ingress_annotations(
+    helm_runner: HelmRunner,
+    *,
+    values: Mapping[str, Any] | None = None,
+) -> dict[str, str]:
+    """Render the chart and return the release Ingress annotations."""
+
+    ingresses = ingresses_by_name(render_manifests(helm_runner, values=values))
+    return ingresses[CHART.release]["metadata"].get("annotations", {})
+
+
+__all__ = [
+    "CHART",
+    "MIGRATE",
+    "RESOURCE_REQUESTS",
+    "VOLUME_CLAIM",
+    "env_values",
+    "manifests_by_kind_and_name",
+    "render_env",
+    "render_ingress_annotations",
+    "render_manifest",
+    "render_manifests",
+    "render_pod_spec",
+    "render_pod_specs",
+    "statefulset_values",
+]